@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Compare the per-cell DataFrame conversion with the columnar engine.
+
+Both paths build what legacy table mode needs for a dataset: the table rows
+plus ``data``/``table_row`` for one card per row. Datasets mimic
+``sample_data.csv`` as loaded by the component (all values strings).
+
+Usage:
+    python benchmarks/bench_conversion.py [--rows 10000 100000 1000000] [--repeat 3]
+"""
+import argparse
+import time
+
+import pandas as pd
+
+from streamlit_swipecards.conversion import to_columnar
+from synthetic import make_frame
+
+
+def per_cell_path(df: pd.DataFrame):
+    """The original conversion: per-cell ``.item()`` checks in three comprehensions."""
+    rows = [[x.item() if hasattr(x, 'item') else x for x in row] for row in df.values.tolist()]
+    cards = []
+    for i, row in enumerate(df.values):
+        cards.append({
+            'row_index': int(i),
+            'data': {k: v.item() if hasattr(v, 'item') else v for k, v in dict(zip(df.columns, row)).items()},
+            'table_row': [x.item() if hasattr(x, 'item') else x for x in row.tolist()],
+        })
+    return rows, cards
+
+
+def columnar_path(df: pd.DataFrame):
+    """The columnar engine: bulk conversion, then rows and cards by index."""
+    return derive_payload(to_columnar(df))
+
+
+def derive_payload(table):
+    """Rows and cards from an already converted (memoized) table."""
+    rows = table.rows()
+    cards = [
+        {'row_index': i, 'data': dict(zip(table.columns, row)), 'table_row': row}
+        for i, row in enumerate(table.rows())
+    ]
+    return rows, cards
+
+
+def best_of(func, df: pd.DataFrame, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(df)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'per-cell (s)':>14} {'columnar (s)':>14} {'speedup':>9} {'memoized (s)':>14}")
+    for n_rows in args.rows:
+        df = make_frame(n_rows)
+        # Sanity check: both paths must produce the same payload
+        if n_rows <= 10_000:
+            assert per_cell_path(df) == columnar_path(df)
+        legacy = best_of(per_cell_path, df, args.repeat)
+        columnar = best_of(columnar_path, df, args.repeat)
+        # Reruns hit the conversion cache and only derive rows and cards
+        memoized = best_of(derive_payload, to_columnar(df), args.repeat)
+        print(f"{n_rows:>10} {legacy:>14.3f} {columnar:>14.3f} {legacy / columnar:>8.1f}x {memoized:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
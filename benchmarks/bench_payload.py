@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Time card preparation in ``streamlit_swipecards()`` and measure the payload.
+
+Every grid point builds a deck of table cards over a synthetic CSV (and, for
+small datasets, Excel) file shaped like ``sample_data.csv`` and calls the
+component with the frontend call captured instead of rendered. Reported per
+point:
+
+- ``cold_ms``: first call after clearing the dataset cache (load and convert)
+- ``warm_ms``: best rerun with the dataset cached
+- ``payload_bytes``: compact JSON size of all component arguments, and
+  ``field_bytes`` for the largest ones
+
+``highlight_density`` is the share of a card's row cells that are
+highlighted. Results are printed (or written with ``--output``) as JSON.
+
+Usage:
+    python benchmarks/bench_payload.py [--cards 10 100] [--rows 1000 10000]
+        [--columns 11 40] [--density 0 0.5] [--output results.json]
+"""
+import argparse
+import itertools
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+import streamlit_swipecards as sc
+from synthetic import column_names, write_dataset
+
+# Arguments reported individually in ``field_bytes``
+_FIELDS = ("cards", "table_data", "datasets", "highlight_cells", "blobs")
+
+
+class CapturedCall:
+    """Stands in for the frontend: records the arguments of the last render."""
+
+    def __init__(self):
+        self.args = {}
+
+    def __call__(self, **kwargs):
+        self.args = kwargs
+        return kwargs.get("default")
+
+
+def make_cards(path: str, n_cards: int, n_rows: int, n_columns: int, density: float) -> list:
+    """Table cards over one dataset, one row each, with ``density`` of the row highlighted."""
+    columns = column_names(n_columns)
+    per_card = round(density * n_columns)
+    cards = []
+    for i in range(n_cards):
+        row = (i * 7919) % n_rows  # Spread the cards over the dataset
+        cards.append({
+            "dataset_path": path,
+            "row_index": row,
+            "name": f"Card {i + 1}",
+            "highlight_cells": [
+                {"row": row, "column": columns[(i + j) % n_columns], "color": "#FFD700"}
+                for j in range(per_card)
+            ],
+            "highlight_rows": [{"row": row}] if per_card else [],
+        })
+    return cards
+
+
+def json_bytes(value) -> int:
+    return len(json.dumps(value, separators=(",", ":"), default=str).encode("utf-8"))
+
+
+def run_point(capture: CapturedCall, cards: list, repeat: int, **options) -> dict:
+    sc.clear_dataset_cache()
+    start = time.perf_counter()
+    sc.streamlit_swipecards(cards=cards, display_mode="table", **options)
+    cold = time.perf_counter() - start
+
+    warm = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        sc.streamlit_swipecards(cards=cards, display_mode="table", **options)
+        warm.append(time.perf_counter() - start)
+
+    args = {k: v for k, v in capture.args.items() if k != "default"}
+    return {
+        "cold_ms": round(cold * 1000, 3),
+        "warm_ms": round(min(warm) * 1000, 3),
+        "payload_bytes": json_bytes(args),
+        "field_bytes": {k: json_bytes(args[k]) for k in _FIELDS if args.get(k) is not None},
+    }
+
+
+def environment() -> dict:
+    try:
+        import pyarrow
+        pyarrow_version = pyarrow.__version__
+    except ImportError:
+        pyarrow_version = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "pandas": pd.__version__,
+        "pyarrow": pyarrow_version,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cards", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--columns", type=int, nargs="+", default=[11, 40])
+    parser.add_argument("--density", type=float, nargs="+", default=[0.0, 0.25, 1.0])
+    parser.add_argument("--transport", nargs="+", default=["rows", "columnar"], choices=["rows", "columnar"])
+    parser.add_argument("--formats", nargs="+", default=["csv", "xlsx"], choices=["csv", "xlsx"])
+    parser.add_argument("--xlsx-max-rows", type=int, default=10_000,
+                        help="Skip Excel datasets larger than this (writing them is slow)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--data-dir", default=os.path.join(tempfile.gettempdir(), "swipecards-bench"),
+                        help="Where synthetic datasets are written (reused across runs)")
+    parser.add_argument("--output", help="Write the JSON results to this file instead of stdout")
+    args = parser.parse_args()
+
+    # Streamlit warns about the missing script run context on every call
+    logging.disable(logging.WARNING)
+    capture = CapturedCall()
+    sc._component_func = capture
+
+    results = []
+    grid = itertools.product(args.formats, args.rows, args.columns)
+    for fmt, n_rows, n_columns in grid:
+        if fmt == "xlsx" and n_rows > args.xlsx_max_rows:
+            continue
+        path = write_dataset(args.data_dir, n_rows, n_columns, fmt)
+        for n_cards, density, transport in itertools.product(args.cards, args.density, args.transport):
+            cards = make_cards(path, n_cards, n_rows, n_columns, density)
+            point = {
+                "format": fmt,
+                "rows": n_rows,
+                "columns": n_columns,
+                "cards": n_cards,
+                "highlight_density": density,
+                "transport": transport,
+            }
+            point.update(run_point(capture, cards, args.repeat, table_transport=transport))
+            results.append(point)
+            print(
+                f"{fmt:>5} {n_rows:>8} rows {n_columns:>4} cols {n_cards:>6} cards "
+                f"density {density:<5} {transport:>8}: cold {point['cold_ms']:>9.1f} ms, "
+                f"warm {point['warm_ms']:>8.1f} ms, {point['payload_bytes']:>11} bytes",
+                file=sys.stderr,
+            )
+
+    report = {"benchmark": "payload", "environment": environment(), "results": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+#!/usr/bin/env node
+/**
+ * Render and swipe cost of the SwipeCards frontend in a headless DOM (jsdom).
+ *
+ * main.js is evaluated in a fresh jsdom window per grid point, with Streamlit
+ * stubbed and timers on a virtual clock, so swipe animations complete without
+ * waiting. Arguments mirror what `streamlit_swipecards()` sends for image
+ * decks and table decks (row transport). Reported per point:
+ *
+ * - render_ms: first render (new SwipeCards instance)
+ * - rerun_ms: render with unchanged arguments (Streamlit rerun)
+ * - swipe_ms: mean and p95 of a swipe, animation timers included
+ * - dom_nodes: elements in the document after the first render
+ *
+ * Without a loadable AG-Grid build, table cards use the plain fallback
+ * tables; `npm install` provides the pinned build from package.json.
+ *
+ * Usage:
+ *   cd benchmarks/frontend && npm install
+ *   node bench_render.js [--cards 10,100,1000] [--rows 1000,10000] [--columns 11,40]
+ *       [--density 0,0.5] [--swipes 20] [--output results.json]
+ */
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+const { performance } = require('perf_hooks');
+const { JSDOM } = require('jsdom');
+
+const FRONTEND_DIR = path.resolve(__dirname, '../../src/streamlit_swipecards/frontend');
+// 1x1 transparent GIF, so image decks do not depend on the network
+const PIXEL = 'data:image/gif;base64,R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7';
+const DEPARTMENTS = ['Engineering', 'Sales', 'Marketing', 'HR', 'Finance'];
+const LOCATIONS = ['New York', 'California', 'Texas', 'Florida', 'Seattle'];
+const BASE_COLUMNS = ['Row', 'Name', 'Age', 'Department', 'Salary', 'Experience', 'Location',
+  'Skills', 'Status', 'Rating', 'Projects'];
+
+function parseArgs(argv) {
+  const options = {
+    cards: [10, 100, 1000],
+    rows: [1000, 10000],
+    columns: [11, 40],
+    density: [0, 0.5],
+    modes: ['cards', 'table'],
+    swipes: 20,
+    output: null,
+  };
+  for (let i = 0; i < argv.length; i += 2) {
+    const name = argv[i].replace(/^--/, '');
+    const value = argv[i + 1];
+    if (!(name in options) || value === undefined) {
+      throw new Error(`Unknown or incomplete option: ${argv[i]}`);
+    }
+    if (Array.isArray(options[name])) {
+      options[name] = value.split(',').map(v => (name === 'modes' ? v : Number(v)));
+    } else {
+      options[name] = name === 'output' ? value : Number(value);
+    }
+  }
+  return options;
+}
+
+// Timers and animation frames run on a virtual clock, advanced explicitly
+class VirtualTimers {
+  constructor() {
+    this.now = 0;
+    this.nextId = 1;
+    this.pending = new Map();
+  }
+
+  install(window) {
+    window.setTimeout = (fn, delay = 0, ...args) => this.schedule(() => fn(...args), delay);
+    window.clearTimeout = (id) => this.pending.delete(id);
+    window.requestAnimationFrame = (fn) => this.schedule(() => fn(this.now), 16);
+    window.cancelAnimationFrame = (id) => this.pending.delete(id);
+  }
+
+  schedule(fn, delay) {
+    const id = this.nextId++;
+    this.pending.set(id, { fn, due: this.now + Math.max(0, Number(delay) || 0) });
+    return id;
+  }
+
+  // Run every timer due within `ms`, including timers scheduled meanwhile
+  advance(ms) {
+    const until = this.now + ms;
+    for (;;) {
+      let next = null;
+      for (const [id, timer] of this.pending) {
+        if (timer.due <= until && (!next || timer.due < next[1].due)) next = [id, timer];
+      }
+      if (!next) break;
+      this.pending.delete(next[0]);
+      this.now = next[1].due;
+      next[1].fn();
+    }
+    this.now = until;
+  }
+}
+
+const flushMicrotasks = () => new Promise(resolve => setImmediate(resolve));
+
+function createEnvironment(agGridSource) {
+  const html = fs.readFileSync(path.join(FRONTEND_DIR, 'index.html'), 'utf8')
+    .replace(/<script[^>]*><\/script>/g, '');
+  const dom = new JSDOM(html, { runScripts: 'outside-only', pretendToBeVisual: true, url: 'http://localhost/' });
+  const { window } = dom;
+  const timers = new VirtualTimers();
+  timers.install(window);
+
+  let renderHandler = null;
+  const sent = [];
+  window.Streamlit = {
+    RENDER_EVENT: 'streamlit:render',
+    events: { addEventListener: (type, handler) => { renderHandler = handler; } },
+    setComponentReady() {},
+    setFrameHeight() {},
+    setComponentValue: (value) => sent.push(value),
+  };
+  window.ResizeObserver = class { observe() {} unobserve() {} disconnect() {} };
+  window.matchMedia = () => ({ matches: false, addListener() {}, removeListener() {}, addEventListener() {}, removeEventListener() {} });
+  window.HTMLImageElement.prototype.decode = () => Promise.resolve();
+  window.console = { log() {}, info() {}, debug() {}, warn() {}, error: console.error };
+  if (agGridSource) window.eval(agGridSource);
+  window.eval(fs.readFileSync(path.join(FRONTEND_DIR, 'main.js'), 'utf8'));
+
+  return {
+    window,
+    timers,
+    sent,
+    render: (args) => renderHandler({ detail: { args, theme: null } }),
+    instance: () => window.eval('swipeCards'),
+  };
+}
+
+function loadAgGridSource() {
+  try {
+    return fs.readFileSync(require.resolve('ag-grid-community/dist/ag-grid-community.min.js'), 'utf8');
+  } catch (e) {
+    return null;
+  }
+}
+
+function columnNames(nColumns) {
+  const names = BASE_COLUMNS.slice(0, Math.max(1, nColumns));
+  for (let i = BASE_COLUMNS.length; i < nColumns; i++) names.push(`Metric ${i - BASE_COLUMNS.length + 1}`);
+  return names;
+}
+
+// Same shape as benchmarks/synthetic.py (values as strings)
+function makeRows(nRows, nColumns) {
+  const rows = new Array(nRows);
+  for (let r = 0; r < nRows; r++) {
+    const row = [String(r + 1), `Person ${r}`, String(21 + (r * 7) % 44), DEPARTMENTS[r % 5],
+      String(40000 + (r * 7919) % 110000), String(r % 30), LOCATIONS[(r * 3) % 5], 'Python SQL',
+      r % 2 ? 'Inactive' : 'Active', ((r % 40) / 10 + 1).toFixed(1), String(r % 40)].slice(0, nColumns);
+    for (let c = BASE_COLUMNS.length; c < nColumns; c++) row.push(((r * 31 + c * 17) % 100000 / 100).toFixed(2));
+    rows[r] = row;
+  }
+  return rows;
+}
+
+function imageArgs(nCards) {
+  const cards = [];
+  for (let i = 0; i < nCards; i++) {
+    cards.push({ name: `Card ${i + 1}`, description: `Description of card ${i + 1}`, image: PIXEL, pills: ['One', 'Two'] });
+  }
+  return { cards, display_mode: 'cards' };
+}
+
+function tableArgs(nCards, nRows, nColumns, density) {
+  const columns = columnNames(nColumns);
+  const rows = makeRows(nRows, nColumns);
+  const datasetId = 'bench';
+  const perCard = Math.round(density * nColumns);
+  const cards = [];
+  for (let i = 0; i < nCards; i++) {
+    const row = (i * 7919) % nRows;
+    const data = {};
+    columns.forEach((name, c) => { data[name] = rows[row][c]; });
+    cards.push({
+      row_index: row,
+      data,
+      table_row: rows[row],
+      dataset_path: 'synthetic.csv',
+      dataset_id: datasetId,
+      highlight_cells: Array.from({ length: perCard }, (_, j) => ({ row, column: (i + j) % nColumns, color: '#FFD700' })),
+      highlight_rows: perCard ? [{ row }] : [],
+      highlight_columns: [],
+      center_table_row: row,
+      center_table_column: null,
+      name: `Card ${i + 1}`,
+      description: `Data from row ${row + 1}`,
+      pills: [],
+    });
+  }
+  const datasets = {
+    [datasetId]: { dataset_id: datasetId, columns, total_rows: nRows, total_columns: nColumns, rows },
+  };
+  return { cards, datasets, display_mode: 'table' };
+}
+
+function stats(samples) {
+  if (samples.length === 0) return { mean: null, p95: null };
+  const sorted = [...samples].sort((a, b) => a - b);
+  const mean = samples.reduce((sum, v) => sum + v, 0) / samples.length;
+  const p95 = sorted[Math.min(sorted.length - 1, Math.ceil(sorted.length * 0.95) - 1)];
+  return { mean: round(mean), p95: round(p95) };
+}
+
+const round = (ms) => Math.round(ms * 1000) / 1000;
+
+async function timed(fn) {
+  const start = performance.now();
+  fn();
+  await flushMicrotasks();
+  return performance.now() - start;
+}
+
+async function runPoint(args, swipes, agGridSource) {
+  const env = createEnvironment(agGridSource);
+  // Snapshot the arguments like the Streamlit transport does
+  const payload = JSON.stringify(args);
+  const renderMs = await timed(() => {
+    env.render(JSON.parse(payload));
+    env.timers.advance(0);
+  });
+  const domNodes = env.window.document.getElementsByTagName('*').length;
+  env.timers.advance(1000); // Let deferred grid and layout work finish
+  await flushMicrotasks();
+
+  const rerunMs = await timed(() => {
+    env.render(JSON.parse(payload));
+    env.timers.advance(0);
+  });
+
+  const swipeSamples = [];
+  const instance = env.instance();
+  for (let i = 0; i < Math.min(swipes, args.cards.length); i++) {
+    swipeSamples.push(await timed(() => {
+      if (i % 2) instance.swipeLeft(); else instance.swipeRight();
+      env.timers.advance(350); // Swipe animation
+    }));
+  }
+  env.window.close();
+  return {
+    payload_bytes: Buffer.byteLength(payload),
+    render_ms: round(renderMs),
+    rerun_ms: round(rerunMs),
+    swipe_ms: stats(swipeSamples),
+    swipes: swipeSamples.length,
+    values_sent: env.sent.length,
+    dom_nodes: domNodes,
+  };
+}
+
+async function main() {
+  const options = parseArgs(process.argv.slice(2));
+  const agGridSource = loadAgGridSource();
+  const points = [];
+  if (options.modes.includes('cards')) {
+    options.cards.forEach(cards => points.push({ mode: 'cards', cards }));
+  }
+  if (options.modes.includes('table')) {
+    for (const rows of options.rows) {
+      for (const columns of options.columns) {
+        for (const cards of options.cards) {
+          for (const density of options.density) points.push({ mode: 'table', cards, rows, columns, highlight_density: density });
+        }
+      }
+    }
+  }
+
+  const results = [];
+  for (const point of points) {
+    const args = point.mode === 'cards'
+      ? imageArgs(point.cards)
+      : tableArgs(point.cards, point.rows, point.columns, point.highlight_density);
+    const result = { ...point, ...(await runPoint(args, options.swipes, agGridSource)) };
+    results.push(result);
+    process.stderr.write(
+      `${JSON.stringify(point)}: render ${result.render_ms} ms, rerun ${result.rerun_ms} ms, ` +
+      `swipe ${result.swipe_ms.mean} ms (p95 ${result.swipe_ms.p95})\n`
+    );
+  }
+
+  const report = {
+    benchmark: 'render',
+    environment: {
+      node: process.version,
+      platform: `${os.platform()}-${os.arch()}`,
+      cpu_count: os.cpus().length,
+      jsdom: require('jsdom/package.json').version,
+      ag_grid: Boolean(agGridSource),
+    },
+    results,
+  };
+  const json = JSON.stringify(report, null, 2);
+  if (options.output) fs.writeFileSync(options.output, json + '\n');
+  else process.stdout.write(json + '\n');
+}
+
+main().catch(error => {
+  console.error(error);
+  process.exit(1);
+});
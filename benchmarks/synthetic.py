@@ -0,0 +1,69 @@
+"""
+Synthetic datasets shaped like ``sample_data.csv`` for the benchmarks.
+
+Frames have the sample's eleven columns; wider frames append numeric
+``Metric N`` columns. All values are strings, as the component loads them.
+"""
+import os
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+BASE_COLUMNS = 11
+
+
+def make_frame(n_rows: int, n_columns: int = BASE_COLUMNS, seed: int = 0) -> pd.DataFrame:
+    """Build a string-typed frame shaped like ``sample_data.csv``."""
+    rng = np.random.default_rng(seed)
+    departments = np.array(["Engineering", "Sales", "Marketing", "HR", "Finance"])
+    locations = np.array(["New York", "California", "Texas", "Florida", "Seattle"])
+    statuses = np.array(["Active", "Inactive"])
+    df = pd.DataFrame({
+        "Row": np.arange(1, n_rows + 1),
+        "Name": np.char.add("Person ", np.arange(n_rows).astype(str)),
+        "Age": rng.integers(21, 65, n_rows),
+        "Department": departments[rng.integers(0, len(departments), n_rows)],
+        "Salary": rng.integers(40_000, 150_000, n_rows),
+        "Experience": rng.integers(0, 30, n_rows),
+        "Location": locations[rng.integers(0, len(locations), n_rows)],
+        "Skills": "Python SQL",
+        "Status": statuses[rng.integers(0, len(statuses), n_rows)],
+        "Rating": rng.uniform(1, 5, n_rows).round(1),
+        "Projects": rng.integers(0, 40, n_rows),
+    })
+    df = df.iloc[:, :max(1, n_columns)]
+    for i in range(BASE_COLUMNS, n_columns):
+        df[f"Metric {i - BASE_COLUMNS + 1}"] = rng.uniform(0, 1000, n_rows).round(2)
+    return df.astype(str)
+
+
+def write_dataset(directory: str, n_rows: int, n_columns: int = BASE_COLUMNS, fmt: str = "csv") -> str:
+    """
+    Write a synthetic dataset once and return its path.
+
+    Args:
+        directory: Output directory (files are reused across runs)
+        n_rows: Number of rows
+        n_columns: Number of columns
+        fmt: ``"csv"`` or ``"xlsx"``
+
+    Returns:
+        str: Path of the dataset file
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"synthetic_{n_rows}x{n_columns}.{fmt}")
+    if not os.path.exists(path):
+        df = make_frame(n_rows, n_columns)
+        tmp_path = f"{path}.tmp.{fmt}"
+        if fmt == "xlsx":
+            df.to_excel(tmp_path, index=False)
+        else:
+            df.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, path)
+    return path
+
+
+def column_names(n_columns: int) -> List[str]:
+    """Column names of a synthetic frame with ``n_columns`` columns."""
+    return make_frame(1, n_columns).columns.tolist()
@@ -1,11 +1,27 @@
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, List, Union
+from typing import Iterable, Optional, List, Union, Dict, Set, Tuple
+import numpy as np
 import pandas as pd
+import hashlib
+import json
 import os
+import time
 
 import streamlit as st
 import streamlit.components.v1 as components
 
+from .blobs import BlobCollector, blob_digest, sync_blobs
+from .cache import DatasetCache
+from .conversion import ArrowTable, ColumnarTable, TypedTable, compact_frame, encode_columns, to_columnar
+from .disk_cache import load_arrow_with_disk_cache, load_with_disk_cache, resolve_cache_dir
+from .images import prepare_card_images
+from .metrics import Timings, timed
+from .paging import CardPager, is_card_stream, source_kind
+from .results import fold_swipe_deltas
+from .sources import DataSource, is_data_source, open_source, source_file
+from .sources import register_source  # noqa: F401 - public extension point
+
 # Tell streamlit that there is a component called streamlit_swipecards,
 # and that the code to display that component is in the "frontend" folder
 frontend_dir = (Path(__file__).parent / "frontend").absolute()
@@ -13,47 +29,681 @@ _component_func = components.declare_component(
 	"streamlit_swipecards", path=str(frontend_dir)
 )
 
-@st.cache_data
-def _load_dataset_cached(file_path: str, file_mtime: float) -> pd.DataFrame:
+# Whether the AG-Grid assets are packaged in frontend/vendor; without them the
+# frontend goes straight to the CDN instead of probing for the local copy
+_AG_GRID_PACKAGED = (
+    frontend_dir / "vendor" / "ag-grid-community" / "dist" / "ag-grid-community.min.js"
+).is_file()
+
+# Number of cards (starting at the current one) whose table rows are sent
+# up front in windowed table mode. Covers the 5-card stack plus some slack.
+_WINDOW_LOOKAHEAD_CARDS = 10
+
+# Rows per block sent for data sources (see ``sources``) without table_window_size;
+# they are never sent whole
+_DEFAULT_SOURCE_WINDOW = 200
+
+# Paged card sources: cards sent per window by default, and how many cards
+# before the current one each window starts (so "back" needs no round trip)
+_DEFAULT_CARD_WINDOW = 50
+_CARD_WINDOW_BEHIND = 5
+
+# Supported encodings for table rows sent to the frontend
+_TABLE_TRANSPORTS = ("rows", "columnar")
+
+# When swipe results are sent back to Python (each send triggers a rerun)
+_REPORT_MODES = ("immediate", "batch", "idle", "complete", "manual")
+
+# Shape of the returned value: whole history or only new actions
+_RESULT_ENCODINGS = ("full", "delta")
+
+# Upper bound for threads loading distinct dataset files in parallel
+_MAX_LOAD_WORKERS = 8
+
+# Default limits of the in-memory dataset cache (see configure_dataset_cache)
+_DEFAULT_CACHE_MAX_ENTRIES = 32
+
+# Converted tables of all sessions in this process
+_dataset_cache = DatasetCache(max_entries=_DEFAULT_CACHE_MAX_ENTRIES)
+
+def configure_dataset_cache(
+    max_entries: Optional[int] = _DEFAULT_CACHE_MAX_ENTRIES,
+    max_bytes: Optional[int] = None,
+    ttl: Optional[float] = None,
+) -> None:
     """
-    Load a dataset with caching based on file path and modification time.
+    Set the limits of the in-memory dataset cache.
+    
+    The cache holds the converted form of loaded datasets, shared by all
+    sessions of the server process. Least recently used entries are evicted
+    first; older versions of a file are dropped as soon as a new version is
+    loaded.
+    
+    Args:
+        max_entries: Maximum number of cached entries (None for no limit)
+        max_bytes: Memory budget in bytes for all entries, measured once per entry like
+            ``DataFrame.memory_usage(deep=True)`` (None for no limit)
+        ttl: Seconds after which an entry is reloaded (None for no expiry)
+    """
+    _dataset_cache.configure(max_entries=max_entries, max_bytes=max_bytes, ttl=ttl)
+
+def dataset_cache_stats() -> dict:
+    """
+    Return counters of the in-memory dataset cache.
+    
+    Returns:
+        dict: ``hits``, ``misses``, ``evictions``, ``entries``, ``bytes_resident``,
+        ``load_time_total``/``load_time_last`` in seconds and the active limits
+    """
+    return _dataset_cache.stats()
+
+def clear_dataset_cache() -> None:
+    """Drop all datasets from the in-memory cache."""
+    _dataset_cache.clear()
+
+def _read_dataset(file_path: str, usecols: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Parse a CSV or Excel dataset with every value as string.
     
     Args:
         file_path: Path to the dataset file
-        file_mtime: File modification time (used as cache key)
+        usecols: Only parse these columns (all if None)
     
     Returns:
         pd.DataFrame: Loaded dataset
     """
     if file_path.endswith('.csv'):
-        return pd.read_csv(file_path, dtype=str).fillna("")
+        return pd.read_csv(file_path, dtype=str, usecols=usecols).fillna("")
     elif file_path.endswith(('.xlsx', '.xls')):
-        return pd.read_excel(file_path, dtype=str).fillna("")
+        return pd.read_excel(file_path, dtype=str, usecols=usecols).fillna("")
     else:
         raise ValueError("Unsupported file format. Use CSV or Excel files.")
 
-def _load_dataset_with_cache(file_path: str) -> pd.DataFrame:
+def _dataset_columns(file_path: str) -> List[str]:
+    """Column names of a CSV or Excel dataset, read from its header only."""
+    if file_path.endswith('.csv'):
+        return pd.read_csv(file_path, dtype=str, nrows=0).columns.tolist()
+    elif file_path.endswith(('.xlsx', '.xls')):
+        return pd.read_excel(file_path, dtype=str, nrows=0).columns.tolist()
+    else:
+        raise ValueError("Unsupported file format. Use CSV or Excel files.")
+
+def _read_dataset_version(
+    file_path: str, cache_dir: Optional[str] = None, usecols: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """Read a dataset, through its Feather sidecar if a cache directory is set."""
+    if cache_dir and file_path.endswith(('.csv', '.xlsx', '.xls')):
+        return load_with_disk_cache(file_path, _read_dataset, cache_dir, usecols)
+    return _read_dataset(file_path, usecols)
+
+def _dataset_file(file_path: str) -> str:
+    """File whose modification time versions a dataset (the database file of a data source)."""
+    return source_file(file_path) if is_data_source(file_path) else file_path
+
+def _uses_data_sources(cards, dataset_path: Optional[str]) -> bool:
+    """Whether the legacy dataset or any card of a card list refers to a data source."""
+    if is_data_source(dataset_path):
+        return True
+    return isinstance(cards, list) and any(
+        isinstance(card, dict) and is_data_source(card.get('dataset_path')) for card in cards
+    )
+
+def _table_kind(
+    file_path: str, shared: bool = False, typed: bool = False, projection: Optional[tuple] = None
+) -> tuple:
+    """Converted form of a dataset, part of its cache key and group."""
+    if is_data_source(file_path):
+        return ("source",)
+    if shared:
+        return ("arrow",)
+    if typed:
+        return ("typed", projection)
+    return ("table",)
+
+def _table_cache_key(
+    file_path: str,
+    file_mtime: float,
+    cache_dir: Optional[str],
+    shared: bool = False,
+    typed: bool = False,
+    projection: Optional[tuple] = None,
+) -> tuple:
+    """Dataset cache key of the converted form of a file version."""
+    return _table_kind(file_path, shared, typed, projection) + (file_path, file_mtime, cache_dir)
+
+def _project_columns(source_columns: List[str], max_columns: int, references: Iterable) -> List[str]:
+    """
+    Columns to load for a trimmed table: the first ``max_columns`` plus every referenced one.
+    
+    Args:
+        source_columns: Column names of the file
+        max_columns: Number of leading columns that are displayed
+        references: Highlighted and centered columns (names or indices)
+    
+    Returns:
+        list: Column names in file order
+    """
+    references = set(references)
+    return [
+        name for i, name in enumerate(source_columns)
+        if i < max_columns or name in references or i in references
+    ]
+
+def _table_projection(table_max_columns: Optional[int], cards: list, *entries) -> Optional[tuple]:
     """
-    Load a dataset using caching if the file exists, with cache invalidation based on file modification time.
+    Column projection of typed datasets: ``(max_columns, referenced columns)``.
+    
+    Referenced columns are collected from the highlight entries and centered
+    columns of all cards and of the call itself, so one projection serves the
+    whole deck. Returns None (load every column) without ``table_max_columns``.
+    
+    Args:
+        table_max_columns: Number of displayed columns
+        cards: Cards of the deck
+        *entries: Call-level highlight lists and the center column
+    
+    Returns:
+        tuple or None: Hashable projection, part of the dataset cache key
+    """
+    if not table_max_columns or table_max_columns <= 0:
+        return None
+    references = set()
+    
+    def collect(value):
+        if isinstance(value, list):
+            references.update(
+                entry['column'] for entry in value if isinstance(entry, dict) and entry.get('column') is not None
+            )
+        elif value is not None and not isinstance(value, bool):
+            references.add(int(value) if isinstance(value, np.integer) else value)
+    
+    for card in cards:
+        if isinstance(card, dict):
+            for field in ('highlight_cells', 'highlight_columns', 'center_table_column'):
+                collect(card.get(field))
+    for value in entries:
+        collect(value)
+    return int(table_max_columns), tuple(sorted(references, key=repr))
+
+def _read_shared_table(file_path: str, cache_dir: Optional[str] = None) -> ColumnarTable:
+    """
+    Read a dataset into an immutable Arrow-backed table.
+    
+    With a cache directory the table is memory-mapped from the Feather sidecar,
+    so every session and worker process shares the same pages. Falls back to a
+    ``ColumnarTable`` if pyarrow is not installed.
+    """
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return to_columnar(_read_dataset_version(file_path, cache_dir))
+    sidecar_dir = cache_dir if file_path.endswith(('.csv', '.xlsx', '.xls')) else None
+    table, mapped = load_arrow_with_disk_cache(file_path, _read_dataset, sidecar_dir)
+    return ArrowTable(table, mapped=mapped)
+
+def _convert_dataset_cached(
+    file_path: str,
+    file_mtime: float,
+    cache_dir: Optional[str] = None,
+    shared: bool = False,
+    timings: Optional[Timings] = None,
+    typed: bool = False,
+    projection: Optional[tuple] = None,
+) -> ColumnarTable:
+    """
+    Convert a dataset to JSON-ready columns once per file version.
+    
+    The result is shared between reruns and sessions and must be treated as
+    read-only.
     
     Args:
         file_path: Path to the dataset file
+        file_mtime: File modification time (used as cache key)
+        cache_dir: Directory for persistent Feather sidecars
+        shared: Keep the dataset as an Arrow table (memory-mapped when possible)
+            instead of Python lists
+        timings: Collector for the ``read`` and ``convert`` stages (metrics mode)
+        typed: Keep the dataset as a frame with compact dtypes (see ``compact_frame``)
+        projection: Only load some columns of a typed dataset (see ``_table_projection``)
     
     Returns:
-        pd.DataFrame: Loaded dataset
+        ColumnarTable: Converted dataset
+    """
+    def load():
+        if is_data_source(file_path):
+            # Rows are read on demand; opening only reads the schema and row count
+            with timed(timings, "read"):
+                return open_source(file_path)
+        if shared:
+            with timed(timings, "read"):
+                return _read_shared_table(file_path, cache_dir)
+        if typed:
+            with timed(timings, "read"):
+                source_columns = usecols = None
+                if projection is not None:
+                    source_columns = _dataset_columns(file_path)
+                    usecols = _project_columns(source_columns, *projection)
+                frame = _read_dataset_version(file_path, cache_dir, usecols)
+            with timed(timings, "convert"):
+                return TypedTable(compact_frame(frame), source_columns)
+        # The parsed frame is not kept: only the converted form is used
+        with timed(timings, "read"):
+            frame = _read_dataset_version(file_path, cache_dir)
+        with timed(timings, "convert"):
+            return to_columnar(frame)
+    
+    return _dataset_cache.get_or_load(
+        _table_cache_key(file_path, file_mtime, cache_dir, shared, typed, projection),
+        load,
+        sizer=lambda table: table.nbytes(),
+        group=_table_kind(file_path, shared, typed, projection) + (file_path, cache_dir),
+    )
+
+def _load_table_with_cache(
+    file_path: str,
+    cache_dir: Optional[str] = None,
+    shared: bool = False,
+    timings: Optional[Timings] = None,
+    typed: bool = False,
+    projection: Optional[tuple] = None,
+) -> ColumnarTable:
+    """
+    Load a dataset in converted, columnar form with caching.
+    
+    Args:
+        file_path: Path to the dataset file
+        cache_dir: Directory for persistent Feather sidecars (see ``disk_cache``)
+        shared: Keep the dataset as a shared Arrow table (see ``_read_shared_table``)
+        timings: Collector for load stages (metrics mode)
+        typed: Keep the dataset with compact dtypes (see ``compact_frame``)
+        projection: Only load some columns of a typed dataset (see ``_table_projection``)
+    
+    Returns:
+        ColumnarTable: Converted dataset
     
     Raises:
         FileNotFoundError: If the file doesn't exist
         ValueError: If the file format is not supported
     """
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"Dataset file not found: {file_path}")
+    version_file = _dataset_file(file_path)
+    if not os.path.exists(version_file):
+        raise FileNotFoundError(f"Dataset file not found: {version_file}")
+    
+    return _convert_dataset_cached(
+        file_path, os.path.getmtime(version_file), cache_dir, shared, timings, typed, projection
+    )
+
+def _load_tables(
+    paths: Iterable[str],
+    cache_dir: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    shared: bool = False,
+    timings: Optional[Timings] = None,
+    typed: bool = False,
+    projection: Optional[tuple] = None,
+) -> Dict[str, Union[Tuple[ColumnarTable, str], Exception]]:
+    """
+    Load every distinct dataset of a deck once.
+    
+    Each file is stat'ed once; versions already in the dataset cache are used
+    directly and the remaining files are loaded concurrently in a thread pool.
+    Errors are returned instead of raised, so they can be reported per card.
+    
+    Args:
+        paths: Dataset paths of all cards (duplicates are loaded once)
+        cache_dir: Directory for persistent Feather sidecars (see ``disk_cache``)
+        max_workers: Thread pool size (defaults to the CPU count, at most 8)
+        shared: Keep datasets as shared Arrow tables (see ``_read_shared_table``)
+        timings: Collector for load stages and the ``datasets_cold`` count (metrics mode)
+        typed: Keep datasets with compact dtypes (see ``compact_frame``)
+        projection: Only load some columns of typed datasets (see ``_table_projection``)
+    
+    Returns:
+        dict: Path -> ``(table, dataset_id)``, or the exception raised while loading it
+    """
+    loaded = {}
+    cold = {}
+    for path in dict.fromkeys(paths):
+        try:
+            file_mtime = os.stat(_dataset_file(path)).st_mtime
+        except FileNotFoundError:
+            loaded[path] = FileNotFoundError(f"Dataset file not found: {_dataset_file(path)}")
+            continue
+        except (OSError, TypeError, ValueError) as e:
+            loaded[path] = e
+            continue
+        table = _dataset_cache.get(_table_cache_key(path, file_mtime, cache_dir, shared, typed, projection))
+        if table is not None:
+            loaded[path] = (table, _dataset_id(path, file_mtime, _projected(table)))
+        else:
+            cold[path] = file_mtime
+    
+    def load(path: str):
+        try:
+            table = _convert_dataset_cached(path, cold[path], cache_dir, shared, timings, typed, projection)
+            return table, _dataset_id(path, cold[path], _projected(table))
+        except Exception as e:
+            return e
+    
+    if timings is not None:
+        timings.add("datasets_cold", len(cold))
+    workers = max_workers or min(_MAX_LOAD_WORKERS, os.cpu_count() or 1, len(cold))
+    if workers > 1 and len(cold) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            loaded.update(zip(cold, executor.map(load, cold)))
+    else:
+        loaded.update((path, load(path)) for path in cold)
+    return loaded
+
+def _projected(table: ColumnarTable) -> Optional[List[str]]:
+    """Loaded columns of a table holding only some columns of its file, else None."""
+    return table.columns if table.source_columns is not table.columns else None
+
+def _dataset_id(file_path: str, file_mtime: Optional[float] = None, columns: Optional[List[str]] = None) -> str:
+    """
+    Build a short, stable identifier for a dataset version.
+    
+    The identifier is derived from the file path and its modification time, so
+    every card pointing at the same unchanged file shares one id and an edited
+    file gets a fresh one.
     
-    # Get file modification time for cache invalidation
-    file_mtime = os.path.getmtime(file_path)
+    Args:
+        file_path: Path to the dataset file
+        file_mtime: Modification time if already known (otherwise the file is stat'ed)
+        columns: Loaded columns if only some were loaded (see ``_projected``)
     
-    # Use cached loading function
-    return _load_dataset_cached(file_path, file_mtime)
+    Returns:
+        str: Identifier used as key in the shared ``datasets`` payload
+    """
+    if file_mtime is None:
+        file_mtime = os.path.getmtime(_dataset_file(file_path))
+    key = f"{file_path}:{file_mtime}"
+    if columns is not None:
+        key += ":" + json.dumps(columns, default=str)
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+def _table_payload(
+    table: ColumnarTable,
+    dataset_id: Optional[str] = None,
+    max_rows: Optional[int] = None,
+    block_size: Optional[int] = None,
+    blocks: Optional[Set[int]] = None,
+    transport: str = "rows",
+    blobs: Optional[BlobCollector] = None,
+) -> dict:
+    """
+    Convert a DataFrame to the table data format understood by the frontend.
+    
+    Without ``block_size`` all displayable rows are sent in ``rows``. With a
+    ``block_size`` only the requested row blocks are sent in ``blocks`` (keyed
+    by block number); the frontend asks for further blocks when needed.
+    With the ``columnar`` transport, every row list is replaced by typed
+    column vectors (``{"length", "column_data"}``, see ``encode_columns``).
+    With ``blobs``, the whole payload (or each row block in windowed mode) is
+    registered as a blob and only referenced; it is encoded only if sent.
+    
+    Args:
+        table: Converted dataset to serialize
+        dataset_id: Identifier the frontend uses when requesting more rows
+        max_rows: Rows beyond this limit are never displayed and not sent
+        block_size: Number of rows per block in windowed mode
+        blocks: Block numbers to include in windowed mode
+        transport: ``"rows"`` for row lists or ``"columnar"`` for column vectors
+        blobs: Collector for the client-side cache (None to inline all data)
+    
+    Returns:
+        dict: Columns, rows (or row blocks) and size information
+    """
+    if blobs is not None and not block_size:
+        return blobs.ref(
+            blob_digest("table", dataset_id, max_rows, transport),
+            lambda: _table_payload(table, dataset_id, max_rows, transport=transport),
+        )
+    total_rows = table.n_rows
+    visible_rows = min(total_rows, max_rows) if max_rows else total_rows
+    payload = {
+        'dataset_id': dataset_id,
+        'columns': list(table.columns),
+        'total_rows': total_rows,
+        'total_columns': len(table.columns)
+    }
+    encode = encode_columns if transport == "columnar" else type(table).rows
+    if block_size:
+        def encode_block(block: int):
+            return encode(table, block * block_size, min((block + 1) * block_size, visible_rows))
+        
+        payload['block_size'] = int(block_size)
+        payload['blocks'] = {
+            str(block): (
+                blobs.ref(
+                    blob_digest("block", dataset_id, max_rows, transport, block_size, block),
+                    lambda block=block: encode_block(block),
+                )
+                if blobs is not None else encode_block(block)
+            )
+            for block in sorted(blocks or ())
+            if 0 <= block * block_size < visible_rows
+        }
+    elif transport == "columnar":
+        payload.update(encode(table, 0, visible_rows))
+    else:
+        payload['rows'] = encode(table, 0, visible_rows)
+    return payload
+
+def _blocks_around(row: Optional[int], block_size: int, total_rows: int) -> Set[int]:
+    """
+    Return the row blocks needed to show ``row`` centered in the table.
+    
+    The neighbouring block is included when the row sits in the outer quarter
+    of its block, so centering does not immediately trigger a request.
+    
+    Args:
+        row: Row to center on (clamped to the dataset)
+        block_size: Number of rows per block
+        total_rows: Number of rows in the dataset
+    
+    Returns:
+        set: Block numbers
+    """
+    try:
+        row = int(row or 0)
+    except (TypeError, ValueError):
+        row = 0
+    row = min(max(row, 0), max(total_rows - 1, 0))
+    block = row // block_size
+    blocks = {block}
+    offset = row - block * block_size
+    margin = block_size // 4
+    if offset < margin and block > 0:
+        blocks.add(block - 1)
+    if offset >= block_size - margin and (block + 1) * block_size < total_rows:
+        blocks.add(block + 1)
+    return blocks
+
+def _payload_nbytes(args: dict) -> int:
+    """Size of the component arguments as compact JSON, as sent to the frontend."""
+    return len(json.dumps(args, separators=(",", ":"), default=str).encode("utf-8"))
+
+def _previous_value(key: Optional[str]) -> Optional[dict]:
+    """
+    Return the value the component reported on the previous run, if any.
+    
+    Args:
+        key: Component key (the value is only retrievable for keyed components)
+    
+    Returns:
+        dict or None: Last component value
+    """
+    if key is None:
+        return None
+    try:
+        value = st.session_state.get(key)
+    except Exception:
+        return None
+    return value if isinstance(value, dict) else None
+
+def _resolve_highlights(
+    highlights: Optional[List[dict]],
+    column_indexes: Dict[object, int],
+    unknown_columns: Set[object],
+    source_columns: Optional[List[str]] = None,
+) -> List[dict]:
+    """
+    Validate highlight entries and resolve their columns to dataset indices.
+    
+    Each entry with a ``column`` (name or index) gets a ``column_index``, so the
+    frontend can look styles up by position without matching names. Entries
+    referring to columns the dataset does not have are dropped and collected
+    in ``unknown_columns``.
+    
+    Args:
+        highlights: Cell, row or column highlight dicts
+        column_indexes: Column name -> index of the dataset
+        unknown_columns: Receives columns that could not be resolved
+        source_columns: Column names of the file if only some columns were
+            loaded; integer columns then refer to these
+    
+    Returns:
+        list: Normalized highlight dicts
+    """
+    resolved = []
+    for highlight in highlights or ():
+        if not isinstance(highlight, dict):
+            continue
+        entry = dict(highlight)
+        if entry.get('row') is not None:
+            entry['row'] = int(entry['row'])
+        if 'column' in entry:
+            column = entry['column']
+            if isinstance(column, (int, np.integer)) and not isinstance(column, bool):
+                if source_columns is not None:
+                    name = source_columns[column] if 0 <= column < len(source_columns) else None
+                    index = column_indexes.get(name)
+                else:
+                    index = int(column) if 0 <= column < len(column_indexes) else None
+            else:
+                index = column_indexes.get(column)
+            if index is None:
+                unknown_columns.add(column)
+                continue
+            entry['column_index'] = index
+        resolved.append(entry)
+    return resolved
+
+def _center_column(column: Optional[Union[str, int]], source_columns: List[str]) -> Optional[Union[str, int]]:
+    """Name of an integer center column of a table holding only some columns of its file."""
+    if isinstance(column, (int, np.integer)) and not isinstance(column, bool) and 0 <= column < len(source_columns):
+        return source_columns[column]
+    return column
+
+def _swipe_log_key(key: str) -> str:
+    """Session state key of the folded swipe log for a component key."""
+    return f"_swipecards_log_{key}"
+
+def _card_pager(key: str, source, identity=None) -> CardPager:
+    """
+    Return the session's pager for a component, starting a new one when the
+    kind of source or its identity changed.
+    
+    Args:
+        key: Component key
+        source: Card sequence, iterator or page callback of this run
+        identity: Optional value identifying the deck (e.g. a dataset id)
+    
+    Returns:
+        CardPager: Pager serving the cards of this run
+    """
+    state_key = f"_swipecards_pager_{key}"
+    pager = st.session_state.get(state_key)
+    if pager is None or pager.kind != source_kind(source) or getattr(pager, 'identity', None) != identity:
+        pager = CardPager(source)
+        pager.identity = identity
+        st.session_state[state_key] = pager
+    else:
+        pager.set_source(source)
+    return pager
+
+def _blob_state_key(key: str) -> str:
+    """Session state key of the client cache bookkeeping for a component key."""
+    return f"_swipecards_blobs_{key}"
+
+def _reference_card_images(cards: list, blobs: BlobCollector) -> list:
+    """
+    Replace inline images (data URIs) of image cards by blob references.
+    
+    Args:
+        cards: Image cards
+        blobs: Collector for the client-side cache
+    
+    Returns:
+        list: Cards with long data URI fields referenced
+    """
+    referenced = []
+    for card in cards:
+        if isinstance(card, dict):
+            card = {
+                name: blobs.ref_text(value) if isinstance(value, str) and value.startswith("data:") else value
+                for name, value in card.items()
+            }
+        referenced.append(card)
+    return referenced
+
+def _requested_table_blocks(value: Optional[dict]) -> Dict[str, Set[int]]:
+    """
+    Collect the row blocks the frontend asked for, grouped by dataset id.
+    
+    Args:
+        value: Last component value
+    
+    Returns:
+        dict: Dataset id -> set of block numbers
+    """
+    requested = {}
+    for request in (value or {}).get('tableRequests') or []:
+        try:
+            requested.setdefault(str(request['dataset_id']), set()).add(int(request['block']))
+        except (KeyError, TypeError, ValueError):
+            continue
+    return requested
+
+def _card_position(value: Optional[dict], total_cards: int) -> int:
+    """
+    Return the index of the current card according to the last component value.
+    
+    Args:
+        value: Last component value
+        total_cards: Number of cards in the deck (used with ``remainingCards``)
+    
+    Returns:
+        int: Global index of the current card
+    """
+    value = value or {}
+    try:
+        if 'cardPosition' in value:
+            return max(0, int(value['cardPosition']))
+        return max(0, total_cards - int(value.get('remainingCards', total_cards)))
+    except (TypeError, ValueError):
+        return 0
+
+def _active_card_range(value: Optional[dict], total_cards: int, key: Optional[str]) -> Tuple[int, int]:
+    """
+    Return the range of card indices whose table rows are sent up front.
+    
+    Unkeyed components cannot ask for more rows, so every card is covered.
+    
+    Args:
+        value: Last component value
+        total_cards: Number of cards in the deck
+        key: Component key
+    
+    Returns:
+        tuple: (start, end) card indices
+    """
+    if key is None:
+        return 0, total_cards
+    current = _card_position(value, total_cards)
+    # Keep the previous card so "back" does not need a round trip
+    return max(0, current - 1), current + _WINDOW_LOOKAHEAD_CARDS
 
 # Create the python function that will be called
 def streamlit_swipecards(
@@ -72,6 +722,21 @@ def streamlit_swipecards(
     table_font_size: Optional[int] = 14,
     table_max_rows: Optional[int] = None,
     table_max_columns: Optional[int] = None,
+    table_window_size: Optional[int] = None,
+    table_transport: str = "rows",
+    dataset_cache_dir: Optional[str] = None,
+    report_mode: str = "immediate",
+    report_batch_size: int = 10,
+    report_idle_ms: int = 1500,
+    result_encoding: str = "full",
+    image_prefetch: int = 5,
+    image_prefetch_concurrency: int = 3,
+    optimize_images: bool = False,
+    client_cache: bool = False,
+    card_window: Optional[int] = None,
+    shared_datasets: bool = False,
+    typed_datasets: bool = False,
+    metrics: bool = False,
     # Deprecated: theme flags are ignored; component always follows Streamlit theme
     use_theme_highlight: Optional[bool] = None,
     use_theme_buttons: Optional[bool] = None,
@@ -83,8 +748,10 @@ def streamlit_swipecards(
     
     Parameters:
     -----------
-    cards : list, optional
-        List of dictionaries containing card data. 
+    cards : list, iterator or callable, optional
+        List of dictionaries containing card data. For decks too large to materialize, an
+        iterator (e.g. a generator) or a page callback ``page(start, count) -> list`` may be
+        passed instead; see ``card_window``.
         For image cards mode, each dict should have:
         - name: str (required)
         - description: str (required) 
@@ -92,7 +759,8 @@ def streamlit_swipecards(
         - pills: list (optional - list of strings to display as pills)
         
         For table cards mode, each dict should have:
-        - dataset_path: str (required - path to CSV/Excel file)
+        - dataset_path: str (required - path to CSV/Excel file or data source URI)
+        - row_key: any (optional - primary key of the card's row, for data sources with a key column)
         - highlight_cells: list (optional - cells to highlight)
         - highlight_rows: list (optional - rows to highlight)  
         - highlight_columns: list (optional - columns to highlight)
@@ -102,7 +770,13 @@ def streamlit_swipecards(
         - description: str (optional - card description)
         - pills: list (optional - list of strings to display as pills)
     dataset_path : str, optional
-        Path to a CSV/Excel dataset to display as table cards (legacy mode)
+        Path to a CSV/Excel dataset to display as table cards (legacy mode). Card and legacy dataset
+        paths may also name a data source read row by row instead of loaded whole: a Parquet file,
+        ``parquet:///file.parquet?key=id`` or ``sqlite:///reviews.db?table=t&key=id`` (``key`` is
+        optional and enables card ``row_key`` lookups). Further schemes can be added with
+        ``register_source``. Data sources are always sent in row blocks (``table_window_size``,
+        default 200 rows), and the legacy table mode pages its cards (see ``card_window``), so
+        they need a ``key`` to scroll and swipe through the whole table.
     highlight_cells : list, optional
         List of dictionaries specifying cells to highlight. Each dict should have:
         - row: int (row index)
@@ -146,6 +820,97 @@ def streamlit_swipecards(
         Maximum number of rows to render per table card (visual trimming only). If None, show all rows.
     table_max_columns : int, optional
         Maximum number of columns to render per table card (visual trimming only). If None, show all columns.
+    table_window_size : int, optional
+        Enable windowed row delivery in table mode. Instead of the whole dataset, only blocks of
+        this many rows around each upcoming card's centered row are sent, together with the total
+        row count. Further blocks are requested by the frontend while scrolling in inspect mode;
+        this requires a ``key``. While rows are pending the returned value contains a
+        ``tableRequests`` list. If None (default), all rows are sent.
+    table_transport : str
+        Encoding of table rows sent to the frontend: "rows" (default) sends nested lists of values,
+        "columnar" sends one typed vector per column (numbers as binary Int32/Float64 arrays,
+        repetitive text dictionary encoded). The columnar form is smaller and cheaper to produce and
+        parse for wide, numeric-heavy datasets.
+    dataset_cache_dir : str, optional
+        Directory for a persistent dataset cache. The first load of a CSV/Excel file stores a Feather
+        sidecar there; later loads (also after restarts and in other worker processes) read it
+        instead of parsing the source again. This saves parsing time; each process still holds its
+        own copy of the table unless ``shared_datasets`` is set. Sidecars are invalidated by file size, modification time
+        and content hash. Resized card images (see ``optimize_images``) are stored there as well.
+        Defaults to the ``STREAMLIT_SWIPECARDS_CACHE_DIR`` environment variable; disabled if
+        neither is set.
+    report_mode : str
+        When swipe results are sent back to Python. Every send triggers a script rerun, so
+        deferring it reduces server load for fast reviewers:
+        - "immediate" (default): after every swipe or back action
+        - "batch": after every ``report_batch_size`` actions
+        - "idle": once no action happened for ``report_idle_ms`` milliseconds
+        - "complete": only when the last card has been swiped
+        - "manual": only when the user presses the "Submit" button below the cards
+        Pending actions are coalesced into one value; "batch" and "idle" also send when the last
+        card is swiped. The returned ``swipedCards`` always holds the complete history.
+    report_batch_size : int
+        Number of actions per send in "batch" mode. Defaults to 10.
+    report_idle_ms : int
+        Idle time in milliseconds before sending in "idle" mode. Defaults to 1500.
+    result_encoding : str
+        "full" (default): the component sends the complete swipe history with every update.
+        "delta": it only sends the actions since the last rerun, tagged with increasing sequence
+        numbers; they are folded into a log kept in ``st.session_state`` (see
+        ``fold_swipe_deltas``), so each update costs O(new actions) instead of O(history).
+        The returned dict has the same fields as in "full" mode plus ``stream`` and ``seq``.
+        Requires a ``key``.
+    image_prefetch : int
+        Image cards mode: number of upcoming cards (beyond the rendered stack) whose images are
+        downloaded and decoded in the background, so fast swipers do not see blank cards.
+        Prefetches for cards that were swiped past are cancelled. 0 disables prefetching.
+        Defaults to 5.
+    image_prefetch_concurrency : int
+        Maximum number of images prefetched in parallel. Defaults to 3.
+    optimize_images : bool
+        Image cards mode: card images given as local file paths, bytes or large base64 data URIs
+        are resized into a display variant, a ``thumbnail`` for the ``srcset`` and a blurred
+        ``placeholder`` (requires Pillow; without it images are sent unchanged). Only still raster
+        images are processed; JPEGs stay JPEG and other formats are re-encoded losslessly as PNG.
+        SVG, animated and undecodable images and remote URLs are left untouched. Variants are
+        built in a thread pool and cached by content hash in memory and in the cache directory.
+        Defaults to False.
+    client_cache : bool
+        Send heavy data (table payloads, row blocks, inline images) only once per session. Reruns
+        pass content hashes instead; the frontend keeps the data in memory and IndexedDB and asks
+        for the hashes it is missing, e.g. after the component was remounted. Requires a ``key``.
+        Defaults to False.
+    card_window : int, optional
+        Send only a sliding window of this many cards, starting just before the current one. The
+        frontend asks for the next window (with a ``cardRequest`` in the value) when it runs low;
+        indices in the results stay global and the value carries the current ``cardPosition``.
+        Used for iterator and page callback sources (default 50 cards), for lists when set, and
+        for the legacy ``dataset_path`` table mode when set, which then builds only the cards of
+        the window. A page callback ends the deck by returning fewer than ``count`` cards; an
+        iterator is consumed once, so going back is limited to one window. Requires a ``key``.
+    shared_datasets : bool
+        Keep table datasets as immutable Arrow tables that all sessions share, instead of
+        converting them to Python lists. With a cache directory (see ``dataset_cache_dir``) the
+        table is memory-mapped from its Feather sidecar, so also worker processes share a single
+        copy of each dataset version; rows are converted to Python values only when sent.
+        Defaults to False.
+    typed_datasets : bool
+        Keep table datasets with compact dtypes instead of one Python string per value: integer
+        and float columns are stored as numbers (only when formatting them reproduces the file's
+        text), repetitive text as categoricals and other text as Arrow-backed strings. Values are
+        formatted back to strings only for the rows sent, so the table looks the same. With
+        ``table_max_columns`` only the displayed columns plus highlighted and centered ones are
+        loaded, and card ``data`` holds just those columns. Ignored with ``shared_datasets``.
+        Defaults to False.
+    metrics : bool
+        Record performance timings. The returned dict then has a ``metrics`` entry with
+        ``python`` timings of this call (dataset ``read_ms`` and ``convert_ms`` for cold files,
+        ``load_ms``, ``payload_ms``, ``images_ms``, total ``prepare_ms`` and the JSON
+        ``payload_bytes`` sent to the frontend) and ``frontend`` timings collected in the browser
+        with ``performance.mark`` (``onRender``, ``render``, ``grid_init``, ``image_decode``,
+        ``swipe_to_paint``; count, mean, max and last in milliseconds). Frontend timings are
+        reported with the next swipe result. Also enables debug logging in the browser console.
+        Defaults to False.
     use_theme_highlight : bool, optional
         Deprecated. The component now always uses the active Streamlit theme when no explicit highlight color is provided.
         This parameter is ignored and kept for backward compatibility.
@@ -162,97 +927,276 @@ def streamlit_swipecards(
         Dictionary containing swiped card data and action ('left', 'right', 'back')
         or None if no action has been taken
     """
+    call_start = time.perf_counter()
+    timings = Timings() if metrics else None
     if cards is None:
         cards = []
     
+    if table_transport not in _TABLE_TRANSPORTS:
+        raise ValueError(f"Unsupported table_transport: {table_transport!r}. Use one of {_TABLE_TRANSPORTS}.")
+    if report_mode not in _REPORT_MODES:
+        raise ValueError(f"Unsupported report_mode: {report_mode!r}. Use one of {_REPORT_MODES}.")
+    if result_encoding not in _RESULT_ENCODINGS:
+        raise ValueError(f"Unsupported result_encoding: {result_encoding!r}. Use one of {_RESULT_ENCODINGS}.")
+    if result_encoding == "delta" and key is None:
+        raise ValueError("result_encoding='delta' requires a key.")
+    if client_cache and key is None:
+        raise ValueError("client_cache=True requires a key.")
+    # A data source is never turned into one card per row at once
+    legacy_paging = (
+        (bool(card_window) or is_data_source(dataset_path)) and bool(dataset_path) and display_mode == "table"
+    )
+    card_paging = is_card_stream(cards) or (bool(card_window) and not legacy_paging)
+    if (card_paging or legacy_paging) and key is None:
+        raise ValueError(
+            "Paged card sources (iterators, page callbacks, card_window or data sources in table mode) require a key."
+        )
+    cache_dir = resolve_cache_dir(dataset_cache_dir)
+    typed = typed_datasets and not shared_datasets
+    
+    # Table payloads shared by all cards, keyed by dataset id (path + mtime).
+    # Cards only carry a reference so each distinct dataset is sent once.
+    datasets = {}
+    
+    # Windowed mode: send row blocks around upcoming cards plus requested ones
+    window_size = table_window_size if table_window_size and table_window_size > 0 else None
+    if window_size is None and _uses_data_sources(cards, dataset_path):
+        window_size = _DEFAULT_SOURCE_WINDOW
+    paging = card_paging or legacy_paging
+    previous_value = _previous_value(key) if window_size or client_cache or paging else None
+    requested_blocks = _requested_table_blocks(previous_value)
+    
+    # Paged sources: only the cards of the current window are processed and sent
+    card_window_size = max(1, int(card_window or _DEFAULT_CARD_WINDOW))
+    card_position = _card_position(previous_value, 0) if paging else 0
+    window_start = max(0, card_position - _CARD_WINDOW_BEHIND)
+    card_offset = 0
+    pager = None
+    if card_paging:
+        pager = _card_pager(key, cards)
+        card_offset, cards = pager.window(window_start, card_window_size)
+        if window_size is None and _uses_data_sources(cards, None):
+            window_size = _DEFAULT_SOURCE_WINDOW
+    
+    # Client cache: heavy data is referenced by hash and only sent when needed
+    blob_collector = BlobCollector() if client_cache else None
+    
     # Process cards for table mode - each card can have its own dataset and configuration
     if display_mode == "table" and cards:
         processed_cards = []
+        tables = {}
+        column_indexes = {}
+        unknown_columns = set()
+        needed_blocks = {}
+        active_start, active_end = _active_card_range(previous_value, len(cards), key)
+        projection = _table_projection(table_max_columns, cards, center_table_column) if typed else None
+        # Load each distinct file once, cold ones in parallel
+        with timed(timings, "load"):
+            loaded_tables = _load_tables(
+                (card['dataset_path'] for card in cards if isinstance(card, dict) and 'dataset_path' in card),
+                cache_dir,
+                shared=shared_datasets,
+                timings=timings,
+                typed=typed,
+                projection=projection,
+            )
         for card_index, card in enumerate(cards):
             if isinstance(card, dict) and 'dataset_path' in card:
                 # This is a table card with individual configuration
                 try:
                     card_dataset_path = card['dataset_path']
-                    df = _load_dataset_with_cache(card_dataset_path)
+                    loaded = loaded_tables[card_dataset_path]
+                    if isinstance(loaded, Exception):
+                        raise loaded.with_traceback(None)
+                    table, dataset_id = loaded
                     
                     # Get the specific row for this card (default to first row if not specified)
-                    row_index = card.get('row_index', 0)
-                    if row_index >= len(df):
+                    if 'row_key' in card:
+                        if not isinstance(table, DataSource):
+                            raise ValueError("row_key needs a data source with a key column as dataset_path")
+                        row_index = table.locate(card['row_key'])
+                        if row_index is None:
+                            raise ValueError(f"No row with key {card['row_key']!r}")
+                    else:
+                        row_index = card.get('row_index', 0)
+                    if row_index >= table.n_rows:
                         row_index = 0
                     
-                    row = df.iloc[row_index]
+                    if dataset_id not in column_indexes:
+                        column_indexes[dataset_id] = {name: i for i, name in enumerate(table.columns)}
+                    source_columns = table.source_columns if _projected(table) is not None else None
+                    center_column = card.get('center_table_column', None)
+                    if source_columns is not None:
+                        # Column indices refer to the file, not to the loaded columns
+                        if center_column is None:
+                            center_column = center_table_column
+                        center_column = _center_column(center_column, source_columns)
                     
                     # Create card data with individual configuration
                     card_data = {
                         'row_index': int(row_index),  # Convert to Python int
-                        'data': {k: v.item() if hasattr(v, 'item') else v for k, v in dict(zip(df.columns, row)).items()},  # Convert numpy types
-                        'table_row': [x.item() if hasattr(x, 'item') else x for x in row.tolist()],  # Convert numpy types
+                        'data': table.record(row_index),
+                        'table_row': table.row(row_index),
                         'dataset_path': card_dataset_path,
-                        'highlight_cells': card.get('highlight_cells', []),
-                        'highlight_rows': card.get('highlight_rows', []),
-                        'highlight_columns': card.get('highlight_columns', []),
+                        'highlight_cells': _resolve_highlights(
+                            card.get('highlight_cells', []), column_indexes[dataset_id], unknown_columns, source_columns
+                        ),
+                        'highlight_rows': _resolve_highlights(
+                            card.get('highlight_rows', []), column_indexes[dataset_id], unknown_columns, source_columns
+                        ),
+                        'highlight_columns': _resolve_highlights(
+                            card.get('highlight_columns', []), column_indexes[dataset_id], unknown_columns, source_columns
+                        ),
                         'center_table_row': card.get('center_table_row', int(row_index)),
-                        'center_table_column': card.get('center_table_column', None),
+                        'center_table_column': center_column,
                         'name': card.get('name', f"Row {int(row_index) + 1}"),
                         'description': card.get('description', f"Data from row {int(row_index) + 1}"),
                         'pills': card.get('pills', [])  # Add pills support
                     }
                     
-                    # Store table data for this specific card (convert numpy types)
-                    card_data['table_data'] = {
-                        'columns': df.columns.tolist(),
-                        'rows': [[x.item() if hasattr(x, 'item') else x for x in row] for row in df.values.tolist()],
-                        'total_rows': int(len(df)),
-                        'total_columns': int(len(df.columns))
-                    }
+                    # Reference the shared table data, serializing each dataset only once
+                    if dataset_id not in tables:
+                        tables[dataset_id] = table
+                        needed_blocks[dataset_id] = set(requested_blocks.get(dataset_id, ()))
+                    if window_size and active_start <= card_offset + len(processed_cards) < active_end:
+                        center_row = card_data['center_table_row']
+                        if center_row is None:
+                            center_row = center_table_row if center_table_row is not None else row_index
+                        needed_blocks[dataset_id].update(_blocks_around(center_row, window_size, table.n_rows))
+                    card_data['dataset_id'] = dataset_id
                     
                     processed_cards.append(card_data)
                     
                 except Exception as e:
-                    st.error(f"Error loading dataset for card {card_index}: {str(e)}")
+                    st.error(f"Error loading dataset for card {card_offset + card_index}: {str(e)}")
+                    if pager is not None:
+                        processed_cards.append(card)  # Keep global indices stable
                     continue
             else:
                 # Keep non-table cards as-is
                 processed_cards.append(card)
         
+        if unknown_columns:
+            st.warning(f"Ignoring highlights for unknown columns: {sorted(map(str, unknown_columns))}")
+        
+        with timed(timings, "payload"):
+            for dataset_id, table in tables.items():
+                datasets[dataset_id] = _table_payload(
+                    table, dataset_id, table_max_rows, window_size, needed_blocks[dataset_id], table_transport,
+                    blob_collector,
+                )
+        
         cards = processed_cards
     
+    # Image cards: send resized variants instead of full-size local images
+    if optimize_images and display_mode != "table" and cards:
+        with timed(timings, "images"):
+            cards, image_errors = prepare_card_images(cards, cache_dir)
+        if image_errors:
+            st.warning(f"Could not process images for cards: {[index for index, _ in image_errors]}")
+    
     # Legacy: Load single dataset if path is provided (for backward compatibility)
     table_data = None
     if dataset_path:
         try:
-            df = _load_dataset_with_cache(dataset_path)
+            projection = None
+            if typed:
+                projection = _table_projection(
+                    table_max_columns, [], highlight_cells, highlight_columns, center_table_column
+                )
+            with timed(timings, "load"):
+                table = _load_table_with_cache(
+                    dataset_path, cache_dir, shared_datasets, timings, typed, projection
+                )
+            legacy_id = _dataset_id(dataset_path, columns=_projected(table))
             
-            # Convert DataFrame to table data format (convert numpy types)
-            table_data = {
-                'columns': df.columns.tolist(),
-                'rows': [[x.item() if hasattr(x, 'item') else x for x in row] for row in df.values.tolist()],
-                'total_rows': int(len(df)),
-                'total_columns': int(len(df.columns))
-            }
+            # In windowed mode only send the blocks around upcoming rows
+            blocks = set(requested_blocks.get(legacy_id, ()))
+            if window_size:
+                total_cards = table.n_rows if display_mode == "table" else 1
+                start, end = _active_card_range(previous_value, total_cards, key)
+                for i in range(start, min(end, total_cards)):
+                    center_row = center_table_row if center_table_row is not None else i
+                    blocks.update(_blocks_around(center_row, window_size, table.n_rows))
+            
+            # Resolve highlight columns against the dataset
+            legacy_columns = {name: i for i, name in enumerate(table.columns)}
+            source_columns = table.source_columns if _projected(table) is not None else None
+            unknown_columns = set()
+            highlight_cells = _resolve_highlights(highlight_cells, legacy_columns, unknown_columns, source_columns)
+            highlight_rows = _resolve_highlights(highlight_rows, legacy_columns, unknown_columns, source_columns)
+            highlight_columns = _resolve_highlights(
+                highlight_columns, legacy_columns, unknown_columns, source_columns
+            )
+            if source_columns is not None:
+                center_table_column = _center_column(center_table_column, source_columns)
+            if unknown_columns:
+                st.warning(f"Ignoring highlights for unknown columns: {sorted(map(str, unknown_columns))}")
+            
+            # Convert to table data format
+            with timed(timings, "payload"):
+                table_data = _table_payload(
+                    table, legacy_id, table_max_rows, window_size, blocks, table_transport, blob_collector
+                )
             
             # If display_mode is table, convert table data to cards format
             if display_mode == "table":
-                cards = []
-                for i, row in enumerate(df.values):
-                    card_data = {
-                        'row_index': int(i),
-                        'data': {k: v.item() if hasattr(v, 'item') else v for k, v in dict(zip(df.columns, row)).items()},
-                        'table_row': [x.item() if hasattr(x, 'item') else x for x in row.tolist()]
-                    }
-                    cards.append(card_data)
+                def legacy_cards(start: int = 0, count: Optional[int] = None):
+                    end = table.n_rows if count is None else min(table.n_rows, start + count)
+                    return [
+                        {
+                            'row_index': start + i,
+                            'data': dict(zip(table.columns, row)),
+                            'table_row': row
+                        }
+                        for i, row in enumerate(table.rows(start, end))
+                    ]
+                
+                if legacy_paging:
+                    # Only the rows of the current window become cards
+                    pager = _card_pager(key, legacy_cards, identity=legacy_id)
+                    card_offset, cards = pager.window(window_start, card_window_size)
+                    pager.total = table.n_rows
+                elif blob_collector is not None:
+                    cards = blob_collector.ref(blob_digest("cards", legacy_id), legacy_cards)
+                else:
+                    cards = legacy_cards()
                     
         except Exception as e:
             st.error(f"Error loading dataset: {str(e)}")
             table_data = None
     
-    component_value = _component_func(
+    # Delta results: fold what arrived since the last run and acknowledge it,
+    # so the frontend stops resending those actions
+    swipe_log = None
+    result_ack = None
+    if result_encoding == "delta":
+        swipe_log = fold_swipe_deltas(st.session_state.get(_swipe_log_key(key)), _previous_value(key))
+        if swipe_log is not None:
+            result_ack = {'stream': swipe_log['stream'], 'seq': swipe_log['seq']}
+    
+    # Client cache: send only the blobs this session has not received yet
+    blobs = None
+    blob_refs = None
+    blob_state = None
+    if blob_collector is not None:
+        if display_mode != "table" and isinstance(cards, list):
+            cards = _reference_card_images(cards, blob_collector)
+        blob_request = (previous_value or {}).get('needBlobs')
+        blobs, blob_state = sync_blobs(
+            blob_collector, st.session_state.get(_blob_state_key(key)), blob_request
+        )
+        blob_refs = blob_collector.digests
+    
+    component_args = dict(
         cards=cards,
         table_data=table_data,
+        datasets=datasets,
         highlight_cells=highlight_cells or [],
         highlight_rows=highlight_rows or [],
         highlight_columns=highlight_columns or [],
         display_mode=display_mode,
+        ag_grid_packaged=_AG_GRID_PACKAGED,
         centerTableRow=center_table_row,
         centerTableColumn=center_table_column,
         view=view,
@@ -262,11 +1206,54 @@ def streamlit_swipecards(
         table_max_rows=table_max_rows,
         table_max_columns=table_max_columns,
         last_card_message=last_card_message,
-        key=key,
-        default=None
+        report_mode=report_mode,
+        report_batch_size=max(1, int(report_batch_size)),
+        report_idle_ms=max(0, int(report_idle_ms)),
+        card_window=(
+            {
+                'stream': pager.stream,
+                'offset': card_offset,
+                'position': max(card_position, card_offset),
+                'total': pager.total,
+                'size': card_window_size,
+            }
+            if pager is not None else None
+        ),
+        result_encoding=result_encoding,
+        result_ack=result_ack,
+        image_prefetch=max(0, int(image_prefetch)),
+        image_prefetch_concurrency=max(1, int(image_prefetch_concurrency)),
+        blobs=blobs,
+        blob_refs=blob_refs,
     )
+    # Metrics mode: Python time spent so far and the size of what is sent
+    if timings is not None:
+        timings.set("prepare_ms", (time.perf_counter() - call_start) * 1000)
+        timings.set("payload_bytes", _payload_nbytes(component_args))
+        component_args['metrics'] = True
+    
+    component_value = _component_func(**component_args, key=key, default=None)
+    
+    if blob_state is not None:
+        # A value that only asks for blobs carries no results; keep the last real one
+        if isinstance(component_value, dict) and 'needBlobs' in component_value:
+            component_value = {k: v for k, v in component_value.items() if k != 'needBlobs'}
+            if 'lastAction' not in component_value:
+                component_value = blob_state.get('value')
+        blob_state['value'] = component_value
+        st.session_state[_blob_state_key(key)] = blob_state
+    
+    result = component_value
+    if result_encoding == "delta":
+        swipe_log = fold_swipe_deltas(swipe_log, component_value)
+        if swipe_log is not None:
+            st.session_state[_swipe_log_key(key)] = swipe_log
+        result = swipe_log
     
-    return component_value
+    if timings is not None and isinstance(result, dict):
+        frontend_metrics = component_value.get('metrics') if isinstance(component_value, dict) else None
+        result = dict(result, metrics={'python': timings.as_dict(), 'frontend': frontend_metrics})
+    return result
 
 
 def main():
@@ -0,0 +1,157 @@
+"""
+Content-addressed blobs for the client-side cache.
+
+With ``client_cache`` enabled, heavy parts of the component arguments (table
+payloads, windowed row blocks, legacy table cards and inline images) are
+replaced by ``{"$blob": <hash>}`` references. The frontend keeps blob contents
+in memory and IndexedDB, so each blob is sent once per session and again only
+when the frontend reports it missing (``needBlobs`` in the component value).
+
+Blobs built from datasets are addressed by the dataset version and encoding
+options, so they are only serialized when they actually have to be sent.
+"""
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple, Union
+
+BLOB_REF_KEY = "$blob"
+# Inline strings shorter than this are not worth a reference
+_MIN_BLOB_CHARS = 2048
+# Hashes remembered as delivered per component
+_MAX_DELIVERED = 4096
+# Bump when the encoding of dataset blobs changes
+_BLOB_VERSION = 1
+
+# Digests of recently seen strings, by identity. Image variants are served from
+# a cache, so reruns pass the very same string objects and skip rehashing. The
+# memo keeps the strings alive, so it is capped by their total size as well.
+_text_digests = OrderedDict()
+_text_digests_lock = threading.Lock()
+_text_digests_bytes = 0
+_MAX_TEXT_DIGESTS = 2048
+_MAX_TEXT_DIGEST_BYTES = 32 * 1024 * 1024
+
+
+def blob_digest(*parts) -> str:
+    """
+    Build a blob hash from the values identifying its content.
+
+    Args:
+        *parts: Hashable description of the content (kind, dataset id, options)
+
+    Returns:
+        str: Hex digest used as blob reference
+    """
+    key = repr((_BLOB_VERSION,) + parts).encode("utf-8")
+    return hashlib.blake2b(key, digest_size=16).hexdigest()
+
+
+def text_digest(text: str) -> str:
+    """
+    Return the content hash of a string, memoized by object identity.
+
+    Strings too large for the memo are hashed on every call.
+
+    Args:
+        text: String to hash (e.g. a data URI)
+
+    Returns:
+        str: Hex digest of the UTF-8 encoded text
+    """
+    with _text_digests_lock:
+        entry = _text_digests.get(id(text))
+        if entry is not None and entry[0] is text:
+            _text_digests.move_to_end(id(text))
+            return entry[1]
+    digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+    size = sys.getsizeof(text)
+    if size > _MAX_TEXT_DIGEST_BYTES:
+        return digest
+    global _text_digests_bytes
+    with _text_digests_lock:
+        previous = _text_digests.pop(id(text), None)
+        if previous is not None:
+            _text_digests_bytes -= sys.getsizeof(previous[0])
+        _text_digests[id(text)] = (text, digest)
+        _text_digests_bytes += size
+        while (len(_text_digests) > _MAX_TEXT_DIGESTS
+               or _text_digests_bytes > _MAX_TEXT_DIGEST_BYTES):
+            _, (evicted, _) = _text_digests.popitem(last=False)
+            _text_digests_bytes -= sys.getsizeof(evicted)
+    return digest
+
+
+class BlobCollector:
+    """Blobs referenced by one render, built only when they are sent."""
+
+    def __init__(self):
+        self._blobs: Dict[str, Union[Callable[[], object], object]] = {}
+
+    def ref(self, digest: str, content) -> dict:
+        """
+        Register a blob and return its reference.
+
+        Args:
+            digest: Blob hash (see ``blob_digest``)
+            content: Blob value, or a callable building it on demand
+
+        Returns:
+            dict: ``{"$blob": digest}``
+        """
+        self._blobs.setdefault(digest, content)
+        return {BLOB_REF_KEY: digest}
+
+    def ref_text(self, text):
+        """Reference a long string by its content hash; other values are returned as they are."""
+        if not isinstance(text, str) or len(text) < _MIN_BLOB_CHARS:
+            return text
+        return self.ref(text_digest(text), text)
+
+    @property
+    def digests(self):
+        return list(self._blobs)
+
+    def build(self, digest: str):
+        content = self._blobs[digest]
+        return content() if callable(content) else content
+
+
+def sync_blobs(
+    collector: BlobCollector,
+    state: Optional[dict],
+    request: Optional[dict],
+) -> Tuple[Dict[str, object], dict]:
+    """
+    Select the blobs to send with this render.
+
+    Blobs already delivered to the session are left out, unless the frontend
+    asked for them again (e.g. after the component was remounted and the blob
+    had been evicted from IndexedDB). Each request is served once.
+
+    Args:
+        collector: Blobs referenced by this render
+        state: Session state from the previous run (None on the first run)
+        request: ``needBlobs`` entry of the last component value (``{"id", "hashes"}``)
+
+    Returns:
+        tuple: Blob contents by hash, and the new session state
+    """
+    state = state or {}
+    delivered = OrderedDict(state.get("delivered") or ())
+    served = state.get("served")
+    if isinstance(request, dict) and request.get("id") != served:
+        for digest in request.get("hashes") or ():
+            delivered.pop(digest, None)
+        served = request.get("id")
+
+    blobs = {}
+    for digest in collector.digests:
+        if digest not in delivered:
+            blobs[digest] = collector.build(digest)
+        delivered[digest] = True
+        delivered.move_to_end(digest)
+    while len(delivered) > _MAX_DELIVERED:
+        delivered.popitem(last=False)
+    return blobs, {"delivered": delivered, "served": served, "value": state.get("value")}
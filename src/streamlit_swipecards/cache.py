@@ -0,0 +1,212 @@
+"""
+Bounded, instrumented in-process cache for loaded datasets.
+
+Entries are evicted least-recently-used once the entry count or the total
+measured size exceeds the configured limits, and expire after an optional
+TTL. Loading a new version of a file (same group, new key) drops the older
+versions right away, so frequently refreshed files do not pile up.
+"""
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class _Entry:
+    __slots__ = ("value", "size", "created", "group")
+
+    def __init__(self, value: Any, size: int, created: float, group: Optional[Hashable]):
+        self.value = value
+        self.size = size
+        self.created = created
+        self.group = group
+
+
+class DatasetCache:
+    """
+    Thread-safe LRU cache with entry, byte and TTL limits.
+
+    Concurrent requests for the same missing key load it only once; other
+    keys load in parallel.
+
+    Args:
+        max_entries: Maximum number of entries (None for no limit)
+        max_bytes: Maximum total size in bytes as reported by the sizer (None for no limit).
+            The most recent entry is always kept, even if it alone exceeds the limit.
+        ttl: Seconds after which an entry expires (None for no expiry)
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None, ttl: Optional[float] = None):
+        self._lock = threading.Lock()
+        self._key_locks: Dict[Hashable, threading.Lock] = {}
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._load_time = 0.0
+        self._last_load_time = 0.0
+
+    def configure(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None, ttl: Optional[float] = None) -> None:
+        """Change the limits and evict entries that no longer fit."""
+        with self._lock:
+            self.max_entries = max_entries
+            self.max_bytes = max_bytes
+            self.ttl = ttl
+            self._purge_expired(time.monotonic())
+            self._enforce_limits()
+
+    def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Any],
+        sizer: Optional[Callable[[Any], int]] = None,
+        group: Optional[Hashable] = None,
+    ) -> Any:
+        """
+        Return the cached value for ``key``, loading it on a miss.
+
+        Args:
+            key: Cache key
+            loader: Called without arguments to produce the value on a miss
+            sizer: Returns the size of a value in bytes (counted against ``max_bytes``)
+            group: Entries of the same group with a different key are evicted
+                when this key is stored (e.g. older versions of the same file)
+
+        Returns:
+            The cached or freshly loaded value
+        """
+        with self._lock:
+            value = self._lookup(key)
+            if value is not _MISSING:
+                return value
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                # Another thread may have loaded it while we waited
+                value = self._lookup(key)
+                if value is not _MISSING:
+                    return value
+                self._misses += 1
+
+            start = time.perf_counter()
+            try:
+                value = loader()
+            except BaseException:
+                with self._lock:
+                    self._key_locks.pop(key, None)
+                raise
+            elapsed = time.perf_counter() - start
+            size = int(sizer(value)) if sizer else 0
+
+            with self._lock:
+                self._load_time += elapsed
+                self._last_load_time = elapsed
+                if group is not None:
+                    stale = [k for k, e in self._entries.items() if e.group == group and k != key]
+                    for stale_key in stale:
+                        self._evict(stale_key)
+                self._entries[key] = _Entry(value, size, time.monotonic(), group)
+                self._bytes += size
+                self._enforce_limits()
+                self._key_locks.pop(key, None)
+        return value
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Return the cached value for ``key`` without loading it.
+
+        Args:
+            key: Cache key
+            default: Returned if the key is not cached (not counted as a miss)
+
+        Returns:
+            The cached value or ``default``
+        """
+        with self._lock:
+            value = self._lookup(key)
+        return default if value is _MISSING else value
+
+    def clear(self) -> None:
+        """Remove all entries (statistics are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return cache counters.
+
+        Returns:
+            dict: ``hits``, ``misses``, ``evictions``, ``entries``, ``bytes_resident``,
+            ``load_time_total`` and ``load_time_last`` (seconds), plus the active limits
+        """
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "entries": len(self._entries),
+                "bytes_resident": self._bytes,
+                "load_time_total": self._load_time,
+                "load_time_last": self._last_load_time,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+            }
+
+    # Internal helpers, called with self._lock held
+
+    def _lookup(self, key: Hashable) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING
+        if self._is_expired(entry, time.monotonic()):
+            self._evict(key)
+            return _MISSING
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return entry.value
+
+    def _is_expired(self, entry: _Entry, now: float) -> bool:
+        return self.ttl is not None and now - entry.created > self.ttl
+
+    def _purge_expired(self, now: float) -> None:
+        for key in [k for k, e in self._entries.items() if self._is_expired(e, now)]:
+            self._evict(key)
+
+    def _enforce_limits(self) -> None:
+        while self._entries and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries)
+            or (self.max_bytes is not None and self._bytes > self.max_bytes and len(self._entries) > 1)
+        ):
+            self._evict(next(iter(self._entries)))
+
+    def _evict(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+        self._evictions += 1
+
+
+_MISSING = object()
+
+
+def deep_nbytes(values: list) -> int:
+    """
+    Memory held by a list and every object it references.
+
+    Objects are counted like ``DataFrame.memory_usage(deep=True)`` counts an
+    object column, one ``sys.getsizeof`` per value.
+
+    Args:
+        values: List to measure
+
+    Returns:
+        int: Size in bytes
+    """
+    return sys.getsizeof(values) + sum(map(sys.getsizeof, values))
@@ -0,0 +1,440 @@
+"""
+Bulk conversion of DataFrames into JSON-ready data for the frontend.
+
+A dataset is converted once per version into column lists of plain Python
+values (``ColumnarTable``). Card fields (``data``, ``table_row``) and table
+payload rows are then derived from it by index, without per-cell checks.
+
+``ArrowTable`` offers the same read-only interface on top of an immutable
+(typically memory-mapped) Arrow table and only builds Python values for the
+rows that are read. ``TypedTable`` does the same for a frame with compact
+dtypes (see ``compact_frame``), formatting values back to strings on read.
+
+For the columnar transport, ``encode_columns`` serializes a row range as one
+typed vector per column (base64 encoded little-endian ``Int32Array`` /
+``Float64Array`` data, or dictionary codes for repetitive text) that the
+frontend reads cell by cell without building row arrays.
+"""
+import base64
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .cache import deep_nbytes
+
+# Canonical number formats that render identically in Python and JavaScript
+_INT_PATTERN = r"-?(?:0|[1-9]\d{0,14})"
+_FLOAT_PATTERN = r"-?(?:0|[1-9]\d{0,14})\.\d{0,14}[1-9]"
+_INT32_MIN, _INT32_MAX = -(2 ** 31), 2 ** 31 - 1
+# Dictionary-encode text columns with at most this share of distinct values
+_DICT_MAX_RATIO = 0.5
+
+
+class ColumnarTable:
+    """
+    Read-only, JSON-ready view of a DataFrame stored column by column.
+
+    Instances are shared between reruns and sessions, so neither the object
+    nor the lists it returns from ``column`` may be modified.
+
+    Attributes:
+        columns: Column names
+        values: One list of plain Python values per column
+        n_rows: Number of rows
+        source_columns: Column names of the source file (differs from
+            ``columns`` if only some columns were loaded)
+    """
+
+    __slots__ = ("columns", "values", "n_rows", "source_columns", "_vectors")
+
+    def __init__(self, columns: List[Any], values: List[list], n_rows: int):
+        self.columns = columns
+        self.values = values
+        self.n_rows = n_rows
+        self.source_columns = columns
+        self._vectors = None
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    def column(self, index: int) -> list:
+        """Return the values of one column (shared, do not modify)."""
+        return self.values[index]
+
+    def column_slice(self, index: int, start: int, end: int) -> list:
+        """Return the values of rows ``[start, end)`` of one column."""
+        return self.values[index][start:end]
+
+    def row(self, index: int) -> list:
+        """Return a single row as a list."""
+        return [column[index] for column in self.values]
+
+    def record(self, index: int) -> Dict[Any, Any]:
+        """Return a single row as a ``{column: value}`` dict."""
+        return {name: column[index] for name, column in zip(self.columns, self.values)}
+
+    def rows(self, start: int = 0, end: Optional[int] = None) -> List[list]:
+        """
+        Return rows ``[start, end)`` as lists.
+
+        Args:
+            start: First row (inclusive)
+            end: Last row (exclusive); defaults to the end of the table
+
+        Returns:
+            list: Row lists
+        """
+        end = self.n_rows if end is None else min(end, self.n_rows)
+        start = max(0, start)
+        if start >= end:
+            return []
+        if not self.values:
+            return [[] for _ in range(end - start)]
+        return list(map(list, zip(*(column[start:end] for column in self.values))))
+
+    def nbytes(self) -> int:
+        """Memory held by the column lists and their values (see ``deep_nbytes``)."""
+        return sum(deep_nbytes(column) for column in self.values)
+
+    def vectors(self) -> List[dict]:
+        """
+        Return the typed encoding of every column, inferred on first use.
+
+        Returns:
+            list: One dict per column with ``type`` and numpy arrays
+        """
+        if self._vectors is None:
+            self._vectors = [_infer_vector(column) for column in self.values]
+        return self._vectors
+
+
+class ArrowTable(ColumnarTable):
+    """
+    ``ColumnarTable`` backed by an immutable Arrow table.
+
+    Values are converted to Python objects only for the rows that are read, so
+    a memory-mapped table costs no private memory per process or session.
+
+    Args:
+        table: ``pyarrow.Table`` to wrap
+        mapped: Whether the table's buffers are memory-mapped (not counted by ``nbytes``)
+    """
+
+    __slots__ = ("table", "mapped")
+
+    def __init__(self, table, mapped: bool = False):
+        super().__init__([str(name) for name in table.column_names], [], int(table.num_rows))
+        self.table = table
+        self.mapped = mapped
+
+    def column(self, index: int) -> list:
+        return self.table.column(index).to_pylist()
+
+    def column_slice(self, index: int, start: int, end: int) -> list:
+        return self.table.column(index).slice(start, max(0, end - start)).to_pylist()
+
+    def row(self, index: int) -> list:
+        return self.rows(index, index + 1)[0]
+
+    def record(self, index: int) -> Dict[Any, Any]:
+        return dict(zip(self.columns, self.row(index)))
+
+    def rows(self, start: int = 0, end: Optional[int] = None) -> List[list]:
+        end = self.n_rows if end is None else min(end, self.n_rows)
+        start = max(0, start)
+        if start >= end:
+            return []
+        columns = [column.to_pylist() for column in self.table.slice(start, end - start).columns]
+        if not columns:
+            return [[] for _ in range(end - start)]
+        return list(map(list, zip(*columns)))
+
+    def nbytes(self) -> int:
+        """Private memory held by the table (0 if memory-mapped)."""
+        return 0 if self.mapped else int(self.table.nbytes)
+
+    def vectors(self) -> List[dict]:
+        if self._vectors is None:
+            # Python values are only materialized one column at a time
+            self._vectors = [_infer_vector(self.column(i)) for i in range(len(self.columns))]
+        return self._vectors
+
+
+class TypedTable(ColumnarTable):
+    """
+    ``ColumnarTable`` over a frame with compact dtypes (see ``compact_frame``).
+
+    Values are formatted back to the strings of the source file only for the
+    rows that are read, so the payload is the same as for a string frame.
+
+    Args:
+        frame: Compact frame (shared, must not be modified)
+        source_columns: Column names of the source file, if ``frame`` holds only some of them
+    """
+
+    __slots__ = ("frame",)
+
+    def __init__(self, frame: pd.DataFrame, source_columns: Optional[List[Any]] = None):
+        super().__init__(frame.columns.tolist(), [], int(len(frame)))
+        self.frame = frame
+        if source_columns is not None:
+            self.source_columns = source_columns
+
+    def column(self, index: int) -> list:
+        return _format_values(self.frame.iloc[:, index])
+
+    def column_slice(self, index: int, start: int, end: int) -> list:
+        return _format_values(self.frame.iloc[max(0, start):max(0, end), index])
+
+    def row(self, index: int) -> list:
+        return self.rows(index, index + 1)[0]
+
+    def record(self, index: int) -> Dict[Any, Any]:
+        return dict(zip(self.columns, self.row(index)))
+
+    def rows(self, start: int = 0, end: Optional[int] = None) -> List[list]:
+        end = self.n_rows if end is None else min(end, self.n_rows)
+        start = max(0, start)
+        if start >= end:
+            return []
+        if not self.columns:
+            return [[] for _ in range(end - start)]
+        columns = [self.column_slice(i, start, end) for i in range(len(self.columns))]
+        return list(map(list, zip(*columns)))
+
+    def nbytes(self) -> int:
+        """Memory held by the frame."""
+        return int(self.frame.memory_usage(index=False, deep=True).sum())
+
+    def vectors(self) -> List[dict]:
+        if self._vectors is None:
+            # The dtypes already tell the encoding; no values are formatted
+            self._vectors = [_typed_vector(self.frame.iloc[:, i]) for i in range(len(self.columns))]
+        return self._vectors
+
+
+def _int_dtype(low: int, high: int, nullable: bool) -> Optional[str]:
+    """Smallest integer dtype holding ``[low, high]`` (nullable if values are missing)."""
+    for bits in (8, 16, 32, 64):
+        info = np.iinfo(f"int{bits}")
+        if info.min <= low and high <= info.max:
+            return f"Int{bits}" if nullable else f"int{bits}"
+    return None
+
+
+def _compact_column(series: pd.Series) -> pd.Series:
+    """
+    Store one column of source strings (``""`` for missing) compactly.
+
+    Numbers are only typed when formatting them reproduces the source text
+    exactly (same canonical forms as the columnar transport), so
+    ``_format_values`` is lossless. Repetitive text becomes a categorical and
+    other text an Arrow-backed string column where available.
+
+    Args:
+        series: Column as read with ``dtype=str``
+
+    Returns:
+        pd.Series: Compact column
+    """
+    missing = series == ""
+    present = series[~missing]
+    if len(present):
+        is_int = present.str.fullmatch(_INT_PATTERN)
+        if is_int.all() and not present.eq("-0").any():
+            numbers = pd.to_numeric(present)
+            dtype = _int_dtype(int(numbers.min()), int(numbers.max()), bool(missing.any()))
+            if dtype is not None:
+                return pd.to_numeric(series.where(~missing)).astype(dtype)
+        elif (is_int | present.str.fullmatch(_FLOAT_PATTERN)).all():
+            if present.astype(float).map(repr).eq(present).all():
+                return pd.to_numeric(series.where(~missing)).astype("float64")
+    if series.nunique() <= len(series) * _DICT_MAX_RATIO:
+        # Categories in order of appearance, like the string encoding
+        return series.astype(pd.CategoricalDtype(series.unique()))
+    try:
+        return series.astype("string[pyarrow]")
+    except (ImportError, TypeError, ValueError):
+        return series
+
+
+def compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert a frame of strings into compact dtypes, column by column.
+
+    Args:
+        df: Dataset read with ``dtype=str`` and missing values as ``""``
+
+    Returns:
+        pd.DataFrame: Frame with integer, float, categorical and string columns
+    """
+    frame = pd.DataFrame({i: _compact_column(df.iloc[:, i]) for i in range(df.shape[1])}, index=df.index)
+    frame.columns = df.columns
+    return frame
+
+
+def _format_values(series: pd.Series) -> list:
+    """Format a compact column back to the source strings (inverse of ``_compact_column``)."""
+    if pd.api.types.is_integer_dtype(series.dtype):
+        return ["" if value is pd.NA else str(value) for value in series.tolist()]
+    if pd.api.types.is_float_dtype(series.dtype):
+        return ["" if value != value else repr(value) for value in series.tolist()]
+    return series.tolist()
+
+
+def _typed_vector(series: pd.Series) -> dict:
+    """Vector description of a compact column (see ``_infer_vector``)."""
+    if pd.api.types.is_integer_dtype(series.dtype) or pd.api.types.is_float_dtype(series.dtype):
+        valid = series.notna().to_numpy() if series.hasnans else None
+        vector = _numeric_vector(series.fillna(0) if valid is not None else series, valid)
+        if vector is not None:
+            return vector
+    elif isinstance(series.dtype, pd.CategoricalDtype):
+        return {"type": "dict", "codes": series.cat.codes.to_numpy(), "categories": series.cat.categories.tolist()}
+    return {"type": "values"}
+
+
+def _column_to_list(series: pd.Series) -> list:
+    """
+    Convert one column to a list of JSON-serializable Python values.
+
+    ``Series.tolist`` already unboxes numpy scalars in bulk; datetimes are
+    rendered as strings and missing values become ``None``.
+
+    Args:
+        series: Column to convert
+
+    Returns:
+        list: Plain Python values
+    """
+    if pd.api.types.is_datetime64_any_dtype(series) or pd.api.types.is_timedelta64_dtype(series):
+        values = series.astype(str).tolist()
+        mask = series.isna().tolist()
+        return [None if missing else value for value, missing in zip(values, mask)]
+    if series.hasnans:
+        series = series.astype(object).where(series.notna(), None)
+    return series.tolist()
+
+
+def to_columnar(df: pd.DataFrame) -> ColumnarTable:
+    """
+    Convert a DataFrame into a ``ColumnarTable`` in one pass per column.
+
+    Args:
+        df: Dataset to convert
+
+    Returns:
+        ColumnarTable: Converted dataset
+    """
+    values = [_column_to_list(df.iloc[:, i]) for i in range(df.shape[1])]
+    return ColumnarTable(df.columns.tolist(), values, int(len(df)))
+
+
+def _b64(array: np.ndarray) -> str:
+    """Base64 encode the raw little-endian bytes of an array."""
+    return base64.b64encode(np.ascontiguousarray(array).tobytes()).decode("ascii")
+
+
+def _numeric_vector(numbers: pd.Series, valid: Optional[np.ndarray]) -> Optional[dict]:
+    """
+    Build an ``int32`` or ``float64`` vector, or None if values do not fit.
+
+    Args:
+        numbers: Numeric values (missing entries already filled with 0)
+        valid: Boolean validity mask, or None if no value is missing
+
+    Returns:
+        dict or None: Vector description
+    """
+    if pd.api.types.is_integer_dtype(numbers):
+        if len(numbers) == 0 or (numbers.min() >= _INT32_MIN and numbers.max() <= _INT32_MAX):
+            return {"type": "int32", "data": numbers.to_numpy(dtype="<i4"), "valid": valid}
+        if numbers.abs().max() > 2 ** 53:
+            return None
+    return {"type": "float64", "data": numbers.to_numpy(dtype="<f8"), "valid": valid}
+
+
+def _infer_vector(values: list) -> dict:
+    """
+    Choose a compact encoding for one column of plain Python values.
+
+    Numeric strings are only typed when their canonical form round-trips to
+    the same text in JavaScript, so the table looks the same in both
+    transports. Repetitive text is dictionary encoded; everything else is
+    sent as a plain value list.
+
+    Args:
+        values: Column values
+
+    Returns:
+        dict: Vector description with ``type`` (``int32``, ``float64``,
+        ``dict`` or ``values``) and the data needed to encode row ranges
+    """
+    series = pd.Series(values, dtype=object)
+    missing = series.isna() | (series == "")
+    present = series[~missing]
+    valid = None if not missing.any() else (~missing).to_numpy()
+
+    if len(present) and present.map(type).eq(str).all():
+        is_int = present.str.fullmatch(_INT_PATTERN)
+        if is_int.all():
+            numbers = pd.to_numeric(series.where(~missing, "0"))
+            vector = _numeric_vector(numbers, valid)
+            if vector is not None:
+                return vector
+        elif (is_int | present.str.fullmatch(_FLOAT_PATTERN)).all():
+            floats = present[~is_int].astype(float)
+            if floats.map(repr).eq(present[~is_int]).all():
+                numbers = pd.to_numeric(series.where(~missing, "0")).astype(float)
+                return _numeric_vector(numbers, valid)
+
+        codes, categories = pd.factorize(series.where(series.notna(), ""))
+        if len(categories) <= len(series) * _DICT_MAX_RATIO:
+            return {"type": "dict", "codes": codes, "categories": categories.tolist()}
+    elif len(present) and present.map(type).isin((int, float)).all():
+        numbers = pd.to_numeric(series.where(~missing, 0))
+        vector = _numeric_vector(numbers, valid)
+        if vector is not None:
+            return vector
+
+    return {"type": "values"}
+
+
+def encode_columns(table: ColumnarTable, start: int, end: int) -> dict:
+    """
+    Encode rows ``[start, end)`` of a table as typed column vectors.
+
+    Dictionary columns only carry the categories used in the range, with
+    codes renumbered accordingly.
+
+    Args:
+        table: Converted dataset
+        start: First row (inclusive)
+        end: Last row (exclusive)
+
+    Returns:
+        dict: ``{"length": n, "column_data": [...]}`` for the frontend
+    """
+    end = min(end, table.n_rows)
+    start = max(0, min(start, end))
+    column_data = []
+    for index, vector in enumerate(table.vectors()):
+        kind = vector["type"]
+        if kind in ("int32", "float64"):
+            spec = {"type": kind, "data": _b64(vector["data"][start:end])}
+            if vector["valid"] is not None:
+                spec["valid"] = _b64(vector["valid"][start:end].astype(np.uint8))
+        elif kind == "dict":
+            used, local_codes = np.unique(vector["codes"][start:end], return_inverse=True)
+            width = 1 if len(used) <= 0xFF else (2 if len(used) <= 0xFFFF else 4)
+            spec = {
+                "type": "dict",
+                "categories": [vector["categories"][code] for code in used.tolist()],
+                "width": width,
+                "codes": _b64(local_codes.astype({1: "<u1", 2: "<u2", 4: "<u4"}[width])),
+            }
+        else:
+            spec = {"type": "values", "values": table.column_slice(index, start, end)}
+        column_data.append(spec)
+    return {"length": end - start, "column_data": column_data}
@@ -0,0 +1,253 @@
+"""
+Persistent on-disk dataset cache.
+
+The first load of a CSV/Excel file writes an uncompressed Feather (Arrow IPC)
+sidecar to the cache directory. Later loads - also after a server restart or
+from another worker process - memory-map the sidecar instead of parsing the
+source file again. ``load_with_disk_cache`` then converts the mapped table to a
+private DataFrame, which saves parsing time but not memory; only the Arrow path
+(``load_arrow_with_disk_cache``) keeps the mapped table and shares its pages.
+
+A sidecar is valid while the source file's size and modification time match
+the recorded ones. If only the modification time changed (for example after
+a copy or ``touch``), the content hash decides, so unchanged data is not
+re-parsed.
+"""
+import hashlib
+import json
+import os
+import tempfile
+from typing import Callable, List, Optional
+
+import pandas as pd
+
+# Environment variable providing the default cache directory
+CACHE_DIR_ENV = "STREAMLIT_SWIPECARDS_CACHE_DIR"
+
+# Bump when the sidecar layout or the way sources are parsed changes
+_FORMAT_VERSION = 1
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def resolve_cache_dir(cache_dir: Optional[str] = None) -> Optional[str]:
+    """
+    Return the cache directory to use, or None if disk caching is off.
+
+    Args:
+        cache_dir: Explicit directory; falls back to ``STREAMLIT_SWIPECARDS_CACHE_DIR``
+
+    Returns:
+        str or None: Absolute cache directory
+    """
+    cache_dir = cache_dir or os.environ.get(CACHE_DIR_ENV)
+    return os.path.abspath(os.path.expanduser(cache_dir)) if cache_dir else None
+
+
+def file_digest(file_path: str) -> str:
+    """
+    Hash a file's content.
+
+    Args:
+        file_path: File to hash
+
+    Returns:
+        str: Hex digest (BLAKE2b, 128 bit)
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _sidecar_paths(file_path: str, cache_dir: str):
+    name = hashlib.sha1(os.path.abspath(file_path).encode("utf-8")).hexdigest()
+    base = os.path.join(cache_dir, name)
+    return base + ".feather", base + ".json"
+
+
+def _read_meta(meta_path: str) -> Optional[dict]:
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return meta if meta.get("version") == _FORMAT_VERSION else None
+
+
+def _dump_meta(meta: dict, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+
+
+def _unchanged(file_path: str, stat: os.stat_result) -> bool:
+    """Whether a file still has the size and modification time of ``stat``."""
+    try:
+        current = os.stat(file_path)
+    except OSError:
+        return False
+    return current.st_size == stat.st_size and current.st_mtime_ns == stat.st_mtime_ns
+
+
+def _write_atomic(path: str, write: Callable[[str], None]) -> None:
+    """Write through a temporary file in the same directory, then rename."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _load_sidecar(
+    file_path: str,
+    reader: Callable[[str], pd.DataFrame],
+    cache_dir: str,
+    columns: Optional[List[str]] = None,
+):
+    """
+    Return the memory-mapped sidecar table of a file, or the parsed frame.
+
+    The sidecar always holds every column; ``columns`` only limits what is
+    mapped from an existing sidecar.
+
+    Returns:
+        tuple: ``(table, None, data_path)`` with a memory-mapped ``pyarrow.Table``
+        when a valid sidecar exists, otherwise ``(None, df, data_path)`` after
+        parsing the source; ``data_path`` is None if no sidecar could be written
+    """
+    from pyarrow import feather
+
+    stat = os.stat(file_path)
+    data_path, meta_path = _sidecar_paths(file_path, cache_dir)
+    meta = _read_meta(meta_path)
+
+    if meta is not None and meta.get("size") == stat.st_size and os.path.exists(data_path):
+        valid = meta.get("mtime") == stat.st_mtime
+        if not valid:
+            # Same size but touched: only a content change invalidates
+            content_hash = file_digest(file_path)
+            valid = meta.get("hash") == content_hash
+            if valid and _unchanged(file_path, stat):
+                meta["mtime"] = stat.st_mtime
+                try:
+                    _write_atomic(meta_path, lambda p: _dump_meta(meta, p))
+                except OSError:
+                    pass
+        if valid:
+            try:
+                return feather.read_table(data_path, columns=columns, memory_map=True), None, data_path
+            except Exception:
+                pass  # Corrupt or unreadable sidecar: rebuild below
+
+    content_hash = file_digest(file_path)
+    df = reader(file_path)
+    if not _unchanged(file_path, stat):
+        # Modified while being read: the hash and stat may not describe df
+        return None, df, None
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Drop the old meta first so it never vouches for the new data
+        try:
+            os.remove(meta_path)
+        except FileNotFoundError:
+            pass
+        _write_atomic(
+            data_path,
+            lambda p: feather.write_feather(df.reset_index(drop=True), p, compression="uncompressed"),
+        )
+        meta = {
+            "version": _FORMAT_VERSION,
+            "source": os.path.abspath(file_path),
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "hash": content_hash,
+        }
+        if _unchanged(file_path, stat):
+            _write_atomic(meta_path, lambda p: _dump_meta(meta, p))
+    except Exception:
+        return None, df, None  # Caching is an optimization only
+    return None, df, data_path
+
+
+def load_with_disk_cache(
+    file_path: str,
+    reader: Callable[[str], pd.DataFrame],
+    cache_dir: str,
+    columns: Optional[List[str]] = None,
+) -> pd.DataFrame:
+    """
+    Load a dataset through its Feather sidecar, creating it if needed.
+
+    This saves parsing time only: the memory-mapped sidecar is converted into a
+    DataFrame owned by the calling process. Use ``load_arrow_with_disk_cache``
+    to share one copy between processes.
+
+    Caching is best effort: if pyarrow is unavailable, the directory is not
+    writable or the frame cannot be stored as Feather (e.g. non-string column
+    names), the dataset is simply read with ``reader``.
+
+    Args:
+        file_path: Path to the source dataset
+        reader: Function parsing the source file into a DataFrame
+        cache_dir: Directory holding the sidecars
+        columns: Only return these columns (read selectively from the sidecar)
+
+    Returns:
+        pd.DataFrame: Loaded dataset
+    """
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        df = reader(file_path)
+        return df if columns is None else df[columns]
+    table, df, _ = _load_sidecar(file_path, reader, cache_dir, columns)
+    if table is not None:
+        return table.to_pandas()
+    return df if columns is None else df[columns]
+
+
+def load_arrow_with_disk_cache(
+    file_path: str,
+    reader: Callable[[str], pd.DataFrame],
+    cache_dir: Optional[str] = None,
+):
+    """
+    Load a dataset as an Arrow table, memory-mapped from its sidecar if possible.
+
+    A memory-mapped table lives in the operating system's page cache, so all
+    sessions and worker processes reading the same file version share one
+    copy. Without a cache directory (or if the sidecar cannot be written) the
+    table is built in memory from the parsed frame.
+
+    Args:
+        file_path: Path to the source dataset
+        reader: Function parsing the source file into a DataFrame
+        cache_dir: Directory holding the sidecars (None to skip them)
+
+    Returns:
+        tuple: The ``pyarrow.Table`` and whether it is memory-mapped
+
+    Raises:
+        ImportError: If pyarrow is not installed
+    """
+    import pyarrow as pa
+    from pyarrow import feather
+
+    if not cache_dir:
+        return pa.Table.from_pandas(reader(file_path), preserve_index=False), False
+    table, df, data_path = _load_sidecar(file_path, reader, cache_dir)
+    if table is not None:
+        return table, True
+    if data_path is not None:
+        # Map the sidecar just written rather than keeping a private copy
+        try:
+            return feather.read_table(data_path, memory_map=True), True
+        except Exception:
+            pass
+    return pa.Table.from_pandas(df, preserve_index=False), False
@@ -7,6 +7,84 @@ function sendValue(value) {
   Streamlit.setComponentValue(value)
 }
 
+// Console logging is level-gated: debug messages are only written in metrics
+// mode, and a disabled call returns before touching its arguments
+const LOG_LEVELS = { error: 0, warn: 1, info: 2, debug: 3 };
+let logLevel = LOG_LEVELS.warn;
+
+function debugLog(...args) {
+  if (logLevel >= LOG_LEVELS.debug) console.log('[swipecards]', ...args);
+}
+
+/**
+ * Opt-in performance timings (`metrics=True`). Spans are recorded with
+ * `performance.mark`/`measure`, so they also appear in the browser's
+ * performance timeline, and aggregated per name for the component value.
+ * While disabled, `start` returns null and `end` does nothing.
+ */
+class PerfMetrics {
+  constructor() {
+    this.enabled = false;
+    this.stats = new Map(); // name -> { count, total, max, last } in ms
+    this.seq = 0;
+  }
+
+  configure(enabled) {
+    this.enabled = Boolean(enabled);
+    logLevel = this.enabled ? LOG_LEVELS.debug : LOG_LEVELS.warn;
+  }
+
+  start(name) {
+    if (!this.enabled) return null;
+    const mark = `swipecards:${name}:${++this.seq}`;
+    try { performance.mark(mark); } catch (e) {}
+    return { name, mark, startTime: performance.now() };
+  }
+
+  end(span) {
+    if (!span) return;
+    const duration = performance.now() - span.startTime;
+    try {
+      performance.measure(`swipecards:${span.name}`, span.mark);
+      // The timeline keeps its copy; drop ours so entries do not pile up
+      performance.clearMarks(span.mark);
+      performance.clearMeasures(`swipecards:${span.name}`);
+    } catch (e) {}
+    this.record(span.name, duration);
+  }
+
+  // End a span once the next frame has been painted
+  endAfterPaint(span) {
+    if (!span) return;
+    requestAnimationFrame(() => requestAnimationFrame(() => this.end(span)));
+  }
+
+  record(name, ms) {
+    const entry = this.stats.get(name) || { count: 0, total: 0, max: 0, last: 0 };
+    entry.count++;
+    entry.total += ms;
+    entry.max = Math.max(entry.max, ms);
+    entry.last = ms;
+    this.stats.set(name, entry);
+  }
+
+  snapshot() {
+    const round = (ms) => Math.round(ms * 1000) / 1000;
+    const result = {};
+    this.stats.forEach((entry, name) => {
+      result[name] = {
+        count: entry.count,
+        mean_ms: round(entry.total / entry.count),
+        max_ms: round(entry.max),
+        last_ms: round(entry.last),
+      };
+    });
+    return result;
+  }
+}
+
+const perfMetrics = new PerfMetrics();
+
 // Hidden progress tracker
 const progressEl = (() => {
   let el = document.getElementById('swipe-progress');
@@ -62,6 +140,261 @@ function updateFrameHeightDebounced() {
   });
 }
 
+/**
+ * Downloads and decodes the images of cards about to enter the stack,
+ * off-screen and with bounded concurrency, so they paint as soon as they are
+ * rendered. Decoded images are kept in a small LRU; fetches for cards that
+ * were swiped past are cancelled.
+ */
+class ImagePrefetcher {
+  constructor() {
+    this.concurrency = 3;
+    this.maxDecoded = 10;
+    this.decoded = new Map(); // url -> decoded Image, least recently used first
+    this.inflight = new Map(); // url -> Image being fetched
+    this.queue = [];
+  }
+
+  configure(depth, concurrency) {
+    this.concurrency = Math.max(1, concurrency);
+    // Room for the lookahead plus the cards currently in the stack
+    this.maxDecoded = Math.max(10, 2 * depth + STACK_SIZE);
+    this.trim();
+  }
+
+  isReady(url) {
+    return this.decoded.has(url);
+  }
+
+  // Prefetch `urls` in order. In-flight fetches are only kept if their url
+  // is in `urls` or `retain` (e.g. cards already in the stack).
+  update(urls, retain = []) {
+    const wanted = new Set(urls);
+    const keep = new Set([...urls, ...retain]);
+    this.inflight.forEach((img, url) => {
+      if (!keep.has(url)) {
+        this.inflight.delete(url);
+        img.src = ''; // Aborts the download
+      }
+    });
+    // Refresh wanted entries, most important last so they are evicted last
+    [...wanted].reverse().forEach(url => {
+      const img = this.decoded.get(url);
+      if (img) {
+        this.decoded.delete(url);
+        this.decoded.set(url, img);
+      }
+    });
+    this.queue = [...wanted].filter(url => !this.decoded.has(url) && !this.inflight.has(url));
+    this.pump();
+  }
+
+  pump() {
+    while (this.inflight.size < this.concurrency && this.queue.length > 0) {
+      this.start(this.queue.shift());
+    }
+  }
+
+  start(url) {
+    const img = new Image();
+    img.decoding = 'async';
+    img.src = url;
+    this.inflight.set(url, img);
+    const span = perfMetrics.start('image_decode');
+    img.decode()
+      .then(() => {
+        if (this.inflight.get(url) !== img) return; // Cancelled
+        perfMetrics.end(span);
+        this.decoded.set(url, img);
+        this.trim();
+      })
+      .catch(() => {})
+      .finally(() => {
+        if (this.inflight.get(url) === img) this.inflight.delete(url);
+        this.pump();
+      });
+  }
+
+  trim() {
+    while (this.decoded.size > this.maxDecoded) {
+      this.decoded.delete(this.decoded.keys().next().value);
+    }
+  }
+}
+
+const imagePrefetcher = new ImagePrefetcher();
+
+/**
+ * Content-addressed store for heavy render arguments (client_cache). Python
+ * replaces table payloads, row blocks and inline images by `{ $blob: hash }`
+ * references and sends each blob only once; contents are kept in memory and
+ * persisted to IndexedDB so a remounted component can restore them without
+ * asking Python again.
+ */
+const BLOB_DB_NAME = 'streamlit-swipecards';
+const BLOB_DB_STORE = 'blobs';
+const MAX_MEMORY_BLOBS = 1024;
+const MAX_STORED_BLOBS = 4096;
+
+class BlobCache {
+  constructor() {
+    this.memory = new Map(); // hash -> value, least recently used first
+    this.pinned = new Set(); // Hashes referenced by the latest render, never trimmed
+    this.dbPromise = null;
+  }
+
+  pin(hashes) {
+    this.pinned = new Set(hashes);
+  }
+
+  has(hash) {
+    return this.memory.has(hash);
+  }
+
+  get(hash) {
+    const value = this.memory.get(hash);
+    if (value !== undefined) {
+      this.memory.delete(hash);
+      this.memory.set(hash, value);
+    }
+    return value;
+  }
+
+  // Keep new blobs in memory and write them to IndexedDB in one transaction
+  putAll(blobs) {
+    const entries = Object.entries(blobs || {});
+    if (entries.length === 0) return;
+    entries.forEach(([hash, value]) => this.memory.set(hash, value));
+    this.trim();
+    this.openDb().then(db => {
+      if (!db) return;
+      try {
+        const tx = db.transaction(BLOB_DB_STORE, 'readwrite');
+        const store = tx.objectStore(BLOB_DB_STORE);
+        const stored = Date.now();
+        entries.forEach(([hash, value]) => store.put({ hash, value, stored }));
+        tx.oncomplete = () => this.prune(db);
+      } catch (e) {
+        // Quota or serialization errors: the memory copy is enough
+      }
+    });
+  }
+
+  // Restore `hashes` from IndexedDB; resolves with the ones still missing
+  load(hashes) {
+    const wanted = hashes.filter(hash => !this.memory.has(hash));
+    if (wanted.length === 0) return Promise.resolve([]);
+    return this.openDb().then(db => {
+      if (!db) return wanted;
+      return new Promise(resolve => {
+        const missing = [];
+        try {
+          const tx = db.transaction(BLOB_DB_STORE, 'readonly');
+          const store = tx.objectStore(BLOB_DB_STORE);
+          wanted.forEach(hash => {
+            const request = store.get(hash);
+            request.onsuccess = () => {
+              if (request.result) {
+                this.memory.set(hash, request.result.value);
+              } else {
+                missing.push(hash);
+              }
+            };
+          });
+          tx.oncomplete = () => { this.trim(); resolve(missing); };
+          tx.onerror = tx.onabort = () => resolve(wanted.filter(hash => !this.memory.has(hash)));
+        } catch (e) {
+          resolve(wanted);
+        }
+      });
+    });
+  }
+
+  openDb() {
+    if (!this.dbPromise) {
+      this.dbPromise = new Promise(resolve => {
+        try {
+          const request = indexedDB.open(BLOB_DB_NAME, 1);
+          request.onupgradeneeded = () => {
+            const store = request.result.createObjectStore(BLOB_DB_STORE, { keyPath: 'hash' });
+            store.createIndex('stored', 'stored');
+          };
+          request.onsuccess = () => resolve(request.result);
+          request.onerror = request.onblocked = () => resolve(null);
+        } catch (e) {
+          resolve(null); // IndexedDB unavailable (e.g. sandboxed iframe)
+        }
+      });
+    }
+    return this.dbPromise;
+  }
+
+  // Drop the oldest persisted blobs beyond MAX_STORED_BLOBS
+  prune(db) {
+    try {
+      const tx = db.transaction(BLOB_DB_STORE, 'readwrite');
+      const store = tx.objectStore(BLOB_DB_STORE);
+      const count = store.count();
+      count.onsuccess = () => {
+        let excess = count.result - MAX_STORED_BLOBS;
+        if (excess <= 0) return;
+        store.index('stored').openCursor().onsuccess = (e) => {
+          const cursor = e.target.result;
+          if (!cursor || excess-- <= 0) return;
+          cursor.delete();
+          cursor.continue();
+        };
+      };
+    } catch (e) {}
+  }
+
+  trim() {
+    for (const hash of this.memory.keys()) {
+      if (this.memory.size <= MAX_MEMORY_BLOBS) break;
+      if (!this.pinned.has(hash)) this.memory.delete(hash);
+    }
+  }
+
+  // Replace a blob reference by its content; other values are returned as is
+  resolve(value) {
+    if (value && typeof value === 'object' && typeof value.$blob === 'string') {
+      return this.get(value.$blob);
+    }
+    return value;
+  }
+
+  // Resolve the references Python may place in the render arguments
+  inflateArgs(args) {
+    const payload = (data) => {
+      data = this.resolve(data);
+      if (!data || !data.blocks) return data;
+      const blocks = {};
+      Object.entries(data.blocks).forEach(([block, value]) => {
+        blocks[block] = this.resolve(value);
+      });
+      return { ...data, blocks };
+    };
+    const datasets = {};
+    Object.entries(args.datasets || {}).forEach(([id, data]) => {
+      datasets[id] = payload(data);
+    });
+    const cards = (this.resolve(args.cards) || []).map(card => {
+      if (!card || typeof card !== 'object') return card;
+      let resolved = card;
+      Object.entries(card).forEach(([name, value]) => {
+        if (value && typeof value === 'object' && typeof value.$blob === 'string') {
+          if (resolved === card) resolved = { ...card };
+          resolved[name] = this.get(value.$blob);
+        }
+      });
+      return resolved;
+    });
+    return { ...args, cards, datasets, table_data: payload(args.table_data) };
+  }
+}
+
+const blobCache = new BlobCache();
+
 function handleImageLoad(img) {
   if (img.dataset.full && !img.dataset.fullLoaded) {
     const hiRes = new Image();
@@ -79,151 +412,333 @@ function handleImageLoad(img) {
 }
 
 // Theme detection and application
-function detectAndApplyTheme() {
-  // Try to detect theme from Streamlit's CSS variables or parent styles
-  let isDark = false;
-  
-  try {
-    // Multiple detection methods for robustness
-    const parentDoc = window.parent.document;
-    
-    // Method 1: Check for explicit theme attributes
-    if (parentDoc.documentElement.hasAttribute('data-theme')) {
-      isDark = parentDoc.documentElement.getAttribute('data-theme') === 'dark';
-    }
-    // Method 2: Check for dark class names
-    else if (parentDoc.documentElement.classList.contains('dark') || 
-             parentDoc.body.classList.contains('dark-theme') ||
-             parentDoc.body.classList.contains('dark')) {
-      isDark = true;
-    }
-    // Method 3: Check Streamlit app background color
-    else {
-      const streamlitSelectors = [
-        '.stApp', '.main', '[data-testid="stAppViewContainer"]',
-        '.css-1d391kg', '.css-fg4pbf', '[data-testid="stApp"]',
-        '.streamlit-container', '.st-emotion-cache-uf99v8'
-      ];
-      
-      let streamlitApp = null;
-      for (const selector of streamlitSelectors) {
-        streamlitApp = parentDoc.querySelector(selector);
-        if (streamlitApp) break;
-      }
-      
-      if (streamlitApp) {
-        const computedStyle = window.parent.getComputedStyle(streamlitApp);
-        const bgColor = computedStyle.backgroundColor;
-        
-        // Parse RGB to determine brightness
-        const rgbMatch = bgColor.match(/rgb\((\d+),\s*(\d+),\s*(\d+)\)/);
-        if (rgbMatch) {
-          const [, r, g, b] = rgbMatch.map(Number);
-          const brightness = (r * 299 + g * 587 + b * 114) / 1000;
-          isDark = brightness < 128;
-        }
-        // Check for known dark colors
-        else if (bgColor.includes('14, 17, 23') || bgColor.includes('38, 39, 48') || 
-                 bgColor.includes('11, 11, 11') || bgColor.includes('0, 0, 0')) {
-          isDark = true;
-        }
-      }
+// Streamlit selectors probed (in order) for the app background when the
+// parent document exposes no explicit theme marker
+const STREAMLIT_APP_SELECTORS = [
+  '.stApp', '.main', '[data-testid="stAppViewContainer"]',
+  '.css-1d391kg', '.css-fg4pbf', '[data-testid="stApp"]',
+  '.streamlit-container', '.st-emotion-cache-uf99v8'
+];
+
+/**
+ * Long-lived theme subsystem (one instance per iframe).
+ *
+ * The palette comes from Streamlit's `event.detail.theme` when available and
+ * is only probed from the parent document otherwise. Observers are installed
+ * once; inputs and observer callbacks mark the theme dirty and a single
+ * requestAnimationFrame batch writes the CSS variables that actually changed.
+ */
+class ThemeManager {
+  constructor() {
+    this.inputs = null; // { theme, colors, showBorder, tableFontSize }
+    this.inputsSignature = null;
+    this.probedPalette = null; // Cached parent-document palette
+    this.appElement = null; // Cached Streamlit app element in the parent
+    this.applied = new Map(); // CSS variable -> value currently set
+    this.appliedMode = null; // 'dark' | 'light'
+    this.started = false;
+    this.frame = null;
+    this.listeners = new Set(); // Called when the primary color changes
+  }
+
+  // Register a callback for primary color changes; returns its unsubscribe
+  subscribe(listener) {
+    this.listeners.add(listener);
+    return () => this.listeners.delete(listener);
+  }
+
+  // Record the theme-related render args; applies synchronously on the first
+  // render so the initial paint is themed, batched afterwards
+  update(inputs) {
+    const signature = JSON.stringify(inputs);
+    if (signature === this.inputsSignature) return;
+    this.inputs = inputs;
+    this.inputsSignature = signature;
+    if (!this.started) {
+      this.start();
+      this.flush();
+    } else {
+      this.schedule();
     }
-    
-    // Method 4: Check CSS custom properties
-    if (!isDark) {
-      const rootStyle = window.parent.getComputedStyle(parentDoc.documentElement);
-      const colorScheme = rootStyle.getPropertyValue('color-scheme');
-      if (colorScheme === 'dark') {
-        isDark = true;
+  }
+
+  // Install the observers for theme switches (once)
+  start() {
+    if (this.started) return;
+    this.started = true;
+    const invalidate = () => {
+      // Streamlit's theme arrives with render events; only probe without it
+      if (this.inputs?.theme) return;
+      this.probedPalette = null;
+      this.schedule();
+    };
+
+    try {
+      const mediaQuery = window.matchMedia('(prefers-color-scheme: dark)');
+      if (mediaQuery.addEventListener) {
+        mediaQuery.addEventListener('change', invalidate);
+      } else if (mediaQuery.addListener) {
+        mediaQuery.addListener(invalidate);
+      }
+    } catch (e) {}
+
+    // Monitor parent document changes (for Streamlit theme switching)
+    try {
+      const parentDoc = window.parent.document;
+      const observer = new MutationObserver(invalidate);
+      observer.observe(parentDoc.documentElement, {
+        attributes: true,
+        attributeFilter: ['class', 'data-theme', 'style']
+      });
+      observer.observe(parentDoc.body, {
+        attributes: true,
+        attributeFilter: ['class', 'style']
+      });
+      const appContainer = parentDoc.querySelector('.stApp, .main, [data-testid="stAppViewContainer"]');
+      if (appContainer) {
+        observer.observe(appContainer, {
+          attributes: true,
+          attributeFilter: ['style', 'class']
+        });
       }
+      this.observer = observer;
+    } catch (e) {
+      debugLog('Could not set up theme monitoring:', e);
     }
+  }
 
-    // Copy Streamlit theme colors into component variables
-    const parentStyle = window.parent.getComputedStyle(parentDoc.documentElement);
-    const docStyle = document.documentElement.style;
-    
-    // Get colors from parent
-    const primary = parentStyle.getPropertyValue('--primary-color');
-    const bg = parentStyle.getPropertyValue('--background-color');
-    const secondaryBg = parentStyle.getPropertyValue('--secondary-background-color');
-    const text = parentStyle.getPropertyValue('--text-color');
+  schedule() {
+    if (this.frame !== null) return;
+    this.frame = requestAnimationFrame(() => {
+      this.frame = null;
+      this.flush();
+    });
+  }
 
-    if (primary) docStyle.setProperty('--primary-color', primary.trim());
-    if (bg) {
-      docStyle.setProperty('--background-color', bg.trim());
-      docStyle.setProperty('--bg-color', bg.trim());
-    }
-    if (secondaryBg) {
-      docStyle.setProperty('--secondary-background-color', secondaryBg.trim());
-      docStyle.setProperty('--card-bg', secondaryBg.trim());
+  flush() {
+    if (this.frame !== null) {
+      cancelAnimationFrame(this.frame);
+      this.frame = null;
     }
-    if (text) {
-      docStyle.setProperty('--text-color', text.trim());
-      docStyle.setProperty('--text-primary', text.trim());
+    const palette = this.resolvePalette();
+    const variables = this.computeVariables(palette);
+
+    const rootStyle = document.documentElement.style;
+    variables.forEach((value, name) => {
+      if (this.applied.get(name) !== value) rootStyle.setProperty(name, value);
+    });
+    this.applied.forEach((_, name) => {
+      if (!variables.has(name)) rootStyle.removeProperty(name);
+    });
+    this.applied = variables;
+
+    const mode = palette.isDark ? 'dark' : 'light';
+    if (mode !== this.appliedMode) {
+      document.documentElement.setAttribute('data-theme', mode);
+      // Also set it on body for compatibility
+      document.body.className = palette.isDark ? 'dark-theme' : 'light-theme';
+      this.appliedMode = mode;
+      debugLog('Applied theme:', mode);
     }
 
-    // Persist theme snapshot for JS usage
+    // Persist theme snapshot for JS usage; highlight styles are resolved
+    // against the primary color, so a new one is announced to rebuild them
+    const previous = window._swipecardsTheme;
     window._swipecardsTheme = {
-      primary: (primary || '').trim(),
-      background: (bg || '').trim(),
-      secondaryBackground: (secondaryBg || '').trim(),
-      text: (text || '').trim(),
+      primary: palette.primary,
+      background: palette.background,
+      secondaryBackground: palette.secondaryBackground,
+      text: palette.text,
     };
-  } catch (e) {
-    console.log('Theme detection fallback:', e);
-    // Fallback: use system preference
-    const mediaQuery = window.matchMedia('(prefers-color-scheme: dark)');
-    isDark = mediaQuery.matches;
+    if (previous && previous.primary !== palette.primary) {
+      this.listeners.forEach(listener => listener());
+    }
   }
-  
-  // Apply theme to the document
-  document.documentElement.setAttribute('data-theme', isDark ? 'dark' : 'light');
-  
-  // Also set it on body for compatibility
-  document.body.className = isDark ? 'dark-theme' : 'light-theme';
-  
-  console.log('Applied theme:', isDark ? 'dark' : 'light');
-  return isDark;
-}
 
-// Apply Streamlit-provided theme (if available via event.detail.theme)
-function applyStreamlitTheme(theme) {
-  if (!theme) return;
-  try {
-    const root = document.documentElement.style;
-    if (theme.primaryColor) root.setProperty('--primary-color', theme.primaryColor);
-    if (theme.backgroundColor) {
-      root.setProperty('--background-color', theme.backgroundColor);
-      root.setProperty('--bg-color', theme.backgroundColor);
+  resolvePalette() {
+    const theme = this.inputs?.theme;
+    if (theme) {
+      const background = theme.backgroundColor || '';
+      let isDark;
+      if (theme.base) {
+        isDark = theme.base.toLowerCase() === 'dark';
+      } else {
+        const rgb = background ? hexToRgb(background) : null;
+        isDark = rgb ? (rgb.r * 299 + rgb.g * 587 + rgb.b * 114) / 1000 < 128 : false;
+      }
+      return {
+        isDark,
+        primary: theme.primaryColor || '',
+        background,
+        secondaryBackground: theme.secondaryBackgroundColor || '',
+        text: theme.textColor || '',
+        font: theme.font || '',
+      };
+    }
+    if (!this.probedPalette) {
+      this.probedPalette = this.probeParent();
+    }
+    return this.probedPalette;
+  }
+
+  // Detect the palette from the parent Streamlit document
+  probeParent() {
+    const palette = { isDark: false, primary: '', background: '', secondaryBackground: '', text: '', font: '' };
+    try {
+      const parentDoc = window.parent.document;
+      const rootStyle = window.parent.getComputedStyle(parentDoc.documentElement);
+
+      // Method 1: Check for explicit theme attributes
+      if (parentDoc.documentElement.hasAttribute('data-theme')) {
+        palette.isDark = parentDoc.documentElement.getAttribute('data-theme') === 'dark';
+      }
+      // Method 2: Check for dark class names
+      else if (parentDoc.documentElement.classList.contains('dark') ||
+               parentDoc.body.classList.contains('dark-theme') ||
+               parentDoc.body.classList.contains('dark')) {
+        palette.isDark = true;
+      }
+      // Method 3: Check Streamlit app background color
+      else {
+        if (!this.appElement || !this.appElement.isConnected) {
+          this.appElement = null;
+          for (const selector of STREAMLIT_APP_SELECTORS) {
+            this.appElement = parentDoc.querySelector(selector);
+            if (this.appElement) break;
+          }
+        }
+        if (this.appElement) {
+          const bgColor = window.parent.getComputedStyle(this.appElement).backgroundColor;
+          // Parse RGB to determine brightness
+          const rgbMatch = bgColor.match(/rgb\((\d+),\s*(\d+),\s*(\d+)\)/);
+          if (rgbMatch) {
+            const [, r, g, b] = rgbMatch.map(Number);
+            palette.isDark = (r * 299 + g * 587 + b * 114) / 1000 < 128;
+          }
+          // Check for known dark colors
+          else if (bgColor.includes('14, 17, 23') || bgColor.includes('38, 39, 48') ||
+                   bgColor.includes('11, 11, 11') || bgColor.includes('0, 0, 0')) {
+            palette.isDark = true;
+          }
+        }
+      }
+
+      // Method 4: Check CSS custom properties
+      if (!palette.isDark && rootStyle.getPropertyValue('color-scheme') === 'dark') {
+        palette.isDark = true;
+      }
+
+      // Streamlit theme colors
+      palette.primary = (rootStyle.getPropertyValue('--primary-color') || '').trim();
+      palette.background = (rootStyle.getPropertyValue('--background-color') || '').trim();
+      palette.secondaryBackground = (rootStyle.getPropertyValue('--secondary-background-color') || '').trim();
+      palette.text = (rootStyle.getPropertyValue('--text-color') || '').trim();
+    } catch (e) {
+      debugLog('Theme detection fallback:', e);
+      // Fallback: use system preference
+      palette.isDark = window.matchMedia('(prefers-color-scheme: dark)').matches;
     }
-    if (theme.secondaryBackgroundColor) {
-      root.setProperty('--secondary-background-color', theme.secondaryBackgroundColor);
-      root.setProperty('--card-bg', theme.secondaryBackgroundColor);
+    return palette;
+  }
+
+  // All CSS variables for a palette and the explicit overrides from Python
+  computeVariables(palette) {
+    const { colors = null, showBorder = true, tableFontSize = 14 } = this.inputs || {};
+    const vars = new Map();
+
+    // Copy Streamlit theme colors into component variables
+    if (palette.primary) vars.set('--primary-color', palette.primary);
+    if (palette.background) {
+      vars.set('--background-color', palette.background);
+      vars.set('--bg-color', palette.background);
     }
-    if (theme.textColor) {
-      root.setProperty('--text-color', theme.textColor);
-      root.setProperty('--text-primary', theme.textColor);
+    if (palette.secondaryBackground) {
+      vars.set('--secondary-background-color', palette.secondaryBackground);
+      vars.set('--card-bg', palette.secondaryBackground);
     }
-    if (theme.font) {
-      root.setProperty('--font', theme.font);
+    if (palette.text) {
+      vars.set('--text-color', palette.text);
+      vars.set('--text-primary', palette.text);
     }
-    // Base can be 'light' or 'dark'
-    if (theme.base) {
-      document.documentElement.setAttribute('data-theme', theme.base.toLowerCase() === 'dark' ? 'dark' : 'light');
-      document.body.className = theme.base.toLowerCase() === 'dark' ? 'dark-theme' : 'light-theme';
+    if (palette.font) vars.set('--font', palette.font);
+
+    // Card border preference and table font size
+    vars.set('--card-border', showBorder ? '1px solid var(--card-border-color)' : 'none');
+    if (tableFontSize) vars.set('--table-font-size', `${tableFontSize}px`);
+
+    // Button theming derived from the palette
+    const isDark = palette.isDark;
+    const textCol = palette.text;
+    if (palette.primary) {
+      const base = hexToRgb(palette.primary) || { r: 102, g: 126, b: 234 };
+      // For pass button, use a complementary color that works with the theme
+      const passRgb = isDark ? lightenRgb(base, 20) : darkenRgb(base, 20);
+      vars.set('--btn-like-bg', toRgbaString(base, 1));
+      vars.set('--btn-like-fg', bestTextOn(base));
+      vars.set('--btn-pass-bg', toRgbaString(passRgb, 1));
+      vars.set('--btn-pass-fg', bestTextOn(passRgb));
+      // For back button, use secondary background with contrasting text
+      vars.set('--btn-back-bg', palette.secondaryBackground || (isDark ? '#262730' : '#ffffff'));
+      vars.set('--btn-back-fg', textCol || (isDark ? '#fafafa' : '#262730'));
+      vars.set('--btn-border', textCol || (isDark ? '#fafafa' : '#262730'));
+    } else {
+      // Fallback: use consistent theme-based colors for all buttons
+      const buttonBg = isDark ? '#262730' : '#F0F2F6';
+      const buttonFg = isDark ? '#fafafa' : '#262730';
+      ['like', 'pass', 'back'].forEach(name => {
+        vars.set(`--btn-${name}-bg`, buttonBg);
+        vars.set(`--btn-${name}-fg`, buttonFg);
+      });
+      vars.set('--btn-border', textCol || (isDark ? '#fafafa' : '#262730'));
     }
-    window._swipecardsTheme = {
-      primary: theme.primaryColor || '',
-      background: theme.backgroundColor || '',
-      secondaryBackground: theme.secondaryBackgroundColor || '',
-      text: theme.textColor || '',
-    };
-  } catch (e) {
-    console.log('Could not apply Streamlit theme directly:', e);
+
+    // Apply explicit color overrides from Python after theme and defaults
+    if (colors && typeof colors === 'object') {
+      // Helper to safely read nested values: a.b.c or fallback keys
+      const get = (obj, path) => {
+        try {
+          return path.split('.').reduce((o, k) => (o && o[k] !== undefined ? o[k] : undefined), obj);
+        } catch (_) { return undefined; }
+      };
+      const overrides = {
+        '--btn-like-bg': get(colors, 'buttons.like.bg') ?? get(colors, 'like.bg') ?? colors.like_bg ?? colors.likeBg,
+        '--btn-like-fg': get(colors, 'buttons.like.fg') ?? get(colors, 'like.fg') ?? colors.like_fg ?? colors.likeFg,
+        '--btn-pass-bg': get(colors, 'buttons.pass.bg') ?? get(colors, 'pass.bg') ?? colors.pass_bg ?? colors.passBg,
+        '--btn-pass-fg': get(colors, 'buttons.pass.fg') ?? get(colors, 'pass.fg') ?? colors.pass_fg ?? colors.passFg,
+        '--btn-back-bg': get(colors, 'buttons.back.bg') ?? get(colors, 'back.bg') ?? colors.back_bg ?? colors.backBg,
+        '--btn-back-fg': get(colors, 'buttons.back.fg') ?? get(colors, 'back.fg') ?? colors.back_fg ?? colors.backFg,
+        '--btn-border': get(colors, 'buttons.border') ?? colors.btn_border ?? colors.button_border ?? colors.border,
+      };
+      Object.entries(overrides).forEach(([name, value]) => {
+        if (value) vars.set(name, value);
+      });
+
+      // General colors
+      const cardBg = colors.card_bg ?? colors.cardBg;
+      const bg = colors.background_color ?? colors.backgroundColor;
+      const secondaryBg = colors.secondary_background_color ?? colors.secondaryBackgroundColor;
+      const text = colors.text_color ?? colors.textColor;
+      if (bg) {
+        vars.set('--background-color', bg);
+        vars.set('--bg-color', bg);
+      }
+      if (secondaryBg) {
+        vars.set('--secondary-background-color', secondaryBg);
+        // Only override card bg with secondary if explicit card_bg not set
+        if (!cardBg) vars.set('--card-bg', secondaryBg);
+      }
+      if (cardBg) vars.set('--card-bg', cardBg);
+      if (text) {
+        vars.set('--text-color', text);
+        vars.set('--text-primary', text);
+      }
+    }
+    return vars;
   }
 }
 
+const themeManager = new ThemeManager();
+
 // Color helpers
 function hexToRgb(hex) {
   if (!hex) return null;
@@ -253,6 +768,18 @@ function darkenRgb(rgb, pct) {
     b: clamp(Math.round(rgb.b * (1 - f)), 0, 255),
   };
 }
+// Darken a #rrggbb color by `percent` (of the full channel range)
+function darkenHexColor(color, percent) {
+  const num = parseInt(color.replace("#", ""), 16);
+  const amt = Math.round(2.55 * percent);
+  const R = (num >> 16) - amt;
+  const G = (num >> 8 & 0x00FF) - amt;
+  const B = (num & 0x0000FF) - amt;
+  return "#" + (0x1000000 + (R < 255 ? R < 1 ? 0 : R : 255) * 0x10000 +
+    (G < 255 ? G < 1 ? 0 : G : 255) * 0x100 +
+    (B < 255 ? B < 1 ? 0 : B : 255)).toString(16).slice(1);
+}
+
 function bestTextOn(rgb) {
   if (!rgb) return '#fff';
   // Luma formula
@@ -260,6 +787,450 @@ function bestTextOn(rgb) {
   return luma > 186 ? '#000' : '#fff';
 }
 
+// AG-Grid is only loaded for table decks, asynchronously: from the copy
+// shipped in ./vendor (offline installs), otherwise from the CDN. Both use
+// the npm package layout. The local copy is only tried when Python reports
+// that it is packaged, so regular installs make no failing requests.
+const AG_GRID_LOCAL = './vendor/ag-grid-community';
+const AG_GRID_CDN = 'https://cdn.jsdelivr.net/npm/ag-grid-community@31.0.3';
+let agGridPackaged = false;
+let agGridPromise = null;
+
+function loadAgGrid() {
+  if (window.agGrid) return Promise.resolve(window.agGrid);
+  if (!agGridPromise) {
+    const sources = agGridPackaged ? [AG_GRID_LOCAL, AG_GRID_CDN] : [AG_GRID_CDN];
+    agGridPromise = sources.reduce(
+      (attempt, base) => attempt.catch(() => loadAgGridFrom(base)),
+      Promise.reject(new Error('AG-Grid not loaded'))
+    );
+    agGridPromise.catch(error => console.warn('AG-Grid unavailable, using plain tables:', error));
+  }
+  return agGridPromise;
+}
+
+function loadAgGridFrom(base) {
+  return new Promise((resolve, reject) => {
+    const links = ['styles/ag-grid.css', 'styles/ag-theme-alpine.css'].map(path => {
+      const link = document.createElement('link');
+      link.rel = 'stylesheet';
+      link.href = `${base}/${path}`;
+      document.head.appendChild(link);
+      return link;
+    });
+    const script = document.createElement('script');
+    script.src = `${base}/dist/ag-grid-community.min.js`;
+    script.async = true;
+    script.onload = () => (window.agGrid ? resolve(window.agGrid) : script.onerror());
+    script.onerror = () => {
+      script.remove();
+      links.forEach(link => link.remove());
+      reject(new Error(`Could not load ${script.src}`));
+    };
+    document.head.appendChild(script);
+  });
+}
+
+// Columnar table transport: lazily decoded typed column vectors
+function decodeBase64(data) {
+  const binary = atob(data || '');
+  const bytes = new Uint8Array(binary.length);
+  for (let i = 0; i < binary.length; i++) bytes[i] = binary.charCodeAt(i);
+  return bytes.buffer;
+}
+
+class ColumnVectors {
+  constructor(columnData) {
+    this.specs = columnData || [];
+    this.decoded = new Array(this.specs.length);
+  }
+
+  column(colIndex) {
+    let column = this.decoded[colIndex];
+    if (column) return column;
+    const spec = this.specs[colIndex];
+    if (!spec) return null;
+    switch (spec.type) {
+      case 'int32':
+        column = { values: new Int32Array(decodeBase64(spec.data)) };
+        break;
+      case 'float64':
+        column = { values: new Float64Array(decodeBase64(spec.data)) };
+        break;
+      case 'dict': {
+        const buffer = decodeBase64(spec.codes);
+        const codes = spec.width === 4 ? new Uint32Array(buffer)
+          : spec.width === 2 ? new Uint16Array(buffer) : new Uint8Array(buffer);
+        column = { codes, categories: spec.categories || [] };
+        break;
+      }
+      default:
+        column = { values: spec.values || [] };
+    }
+    if (spec.valid) column.valid = new Uint8Array(decodeBase64(spec.valid));
+    this.decoded[colIndex] = column;
+    // Release the encoded strings once decoded
+    this.specs[colIndex] = { type: spec.type };
+    return column;
+  }
+
+  get(rowIndex, colIndex) {
+    const column = this.column(colIndex);
+    if (!column) return '';
+    if (column.valid && !column.valid[rowIndex]) return '';
+    const value = column.codes ? column.categories[column.codes[rowIndex]] : column.values[rowIndex];
+    return value ?? '';
+  }
+}
+
+// Number of rows in a row list or columnar payload
+function tableLength(source) {
+  if (!source) return 0;
+  return source.column_data ? (source.length || 0) : source.length;
+}
+
+// Read a cell from a row list (`[[...], ...]`) or a columnar payload
+function readTableCell(source, rowIndex, colIndex) {
+  if (!source) return '';
+  if (source.column_data) {
+    if (!source._vectors) {
+      Object.defineProperty(source, '_vectors', { value: new ColumnVectors(source.column_data) });
+    }
+    return source._vectors.get(rowIndex, colIndex);
+  }
+  const row = source[rowIndex];
+  return row ? (row[colIndex] ?? '') : '';
+}
+
+const HIGHLIGHT_COLORS = [
+  '#FFB6C1', // Light Pink
+  '#98FB98', // Pale Green
+  '#87CEEB', // Sky Blue
+  '#DDA0DD', // Plum
+  '#F0E68C', // Khaki
+  '#FFA07A', // Light Salmon
+  '#20B2AA', // Light Sea Green
+  '#FFE4B5', // Moccasin
+  '#D3D3D3', // Light Gray
+  '#F5DEB3'  // Wheat
+];
+
+// Highlights of one table, normalized into hashed lookups with resolved
+// styles, so styling a cell costs a few Map lookups instead of list scans.
+// Cell highlights win over row highlights, which win over column highlights;
+// within a list the first matching entry wins.
+class HighlightIndex {
+  constructor(highlightCells = [], highlightRows = [], highlightColumns = [], columnNames = []) {
+    const columnIndexes = new Map(columnNames.map((name, i) => [name, i]));
+    const columnOf = (h) => {
+      if (typeof h.column_index === 'number') return h.column_index;
+      if (typeof h.column === 'number') return h.column;
+      return columnIndexes.get(h.column);
+    };
+    const theme = window._swipecardsTheme?.primary ? hexToRgb(window._swipecardsTheme.primary) : null;
+    // Entries with the same color share one style object
+    const styles = new Map();
+    const intern = (key, make) => {
+      let style = styles.get(key);
+      if (!style) {
+        style = make();
+        styles.set(key, style);
+      }
+      return style;
+    };
+
+    this.cells = new Map(); // "row:col" -> style
+    this.rows = new Map(); // row -> style
+    this.columns = new Map(); // col -> style
+    (highlightCells || []).forEach(h => {
+      const col = h ? columnOf(h) : undefined;
+      const key = `${h?.row}:${col}`;
+      if (col === undefined || this.cells.has(key)) return;
+      const color = HighlightIndex.resolveColor(h.color);
+      this.cells.set(key, intern(`cell:${color}`, () => HighlightIndex.cellStyle(color, theme)));
+    });
+    (highlightRows || []).forEach(h => {
+      if (!h || this.rows.has(h.row)) return;
+      const color = HighlightIndex.resolveColor(h.color);
+      this.rows.set(h.row, intern(`row:${color}`, () => HighlightIndex.lineStyle(color, theme, '#E3F2FD')));
+    });
+    (highlightColumns || []).forEach(h => {
+      const col = h ? columnOf(h) : undefined;
+      if (col === undefined || this.columns.has(col)) return;
+      const color = HighlightIndex.resolveColor(h.color);
+      this.columns.set(col, intern(`column:${color}`, () => HighlightIndex.lineStyle(color, theme, '#E8F5E8')));
+    });
+    // Columns with highlighted cells (autosized and kept out of flex sizing)
+    this.cellColumns = new Set(Array.from(this.cells.keys(), key => Number(key.split(':')[1])));
+  }
+
+  static resolveColor(color) {
+    return color === 'random' ? HIGHLIGHT_COLORS[Math.floor(Math.random() * HIGHLIGHT_COLORS.length)] : color;
+  }
+
+  static cellStyle(color, theme) {
+    color = HighlightIndex.resolveColor(color);
+    let bg;
+    let bd;
+    if (!color && theme) {
+      // Theme-based default if no explicit color
+      bg = toRgbaString(theme, 0.18);
+      bd = toRgbaString(darkenRgb(theme, 20), 0.9);
+    } else {
+      bg = color || '#FFD700';
+      bd = darkenHexColor(bg, 20);
+    }
+    return { backgroundColor: bg, border: '1px solid transparent', boxShadow: `inset 0 0 0 1px ${bd}`, outline: `3px solid ${bd}`, outlineOffset: '-3px', fontWeight: 'bold', position: 'relative', zIndex: 2, boxSizing: 'border-box' };
+  }
+
+  static lineStyle(color, theme, fallback) {
+    color = HighlightIndex.resolveColor(color);
+    const bg = !color && theme ? toRgbaString(theme, 0.12) : (color || fallback);
+    return { backgroundColor: bg, border: '1px solid #111111', outline: '2px solid #111111', outlineOffset: '-2px', fontWeight: '500' };
+  }
+
+  style(rowIndex, colIndex) {
+    return this.cells.get(`${rowIndex}:${colIndex}`) || this.rows.get(rowIndex) || this.columns.get(colIndex) || null;
+  }
+
+  isRowHighlighted(rowIndex) {
+    return this.rows.has(rowIndex);
+  }
+}
+
+// Inline CSS text for a style object
+function styleToCss(style) {
+  if (!style) return '';
+  return Object.entries(style)
+    .map(([prop, value]) => `${prop.replace(/[A-Z]/g, c => '-' + c.toLowerCase())}: ${value};`)
+    .join(' ');
+}
+
+// Rows rendered above and below the visible part of a virtual table
+const VIRTUAL_OVERSCAN_ROWS = 6;
+// Rows around the centered one whose values size the columns
+const VIRTUAL_SAMPLE_ROWS = 50;
+let virtualTableCount = 0;
+
+/**
+ * Virtual-scrolling table used when AG-Grid is unavailable. Only the rows and
+ * columns in view (plus a few overscan rows) exist in the DOM: row elements
+ * are positioned absolutely and reused while scrolling, and highlight styles
+ * become generated classes instead of per-cell inline styles.
+ */
+class VirtualTable {
+  constructor(container, { columns, rowCount, cell, highlights = null, rowHeight = 28, fontSize = 14, sampleRows = [], onRowsNeeded = null }) {
+    this.container = container;
+    this.columns = columns;
+    this.rowCount = rowCount;
+    this.cell = cell;
+    this.highlights = highlights;
+    this.rowHeight = rowHeight;
+    this.onRowsNeeded = onRowsNeeded;
+    this.id = `virtual-table-${++virtualTableCount}`;
+    this.frame = null;
+    this.version = 0; // Bumped when cell values change (e.g. row blocks arrived)
+    this.rowElements = new Map(); // row index -> element
+    this.spareRows = [];
+    this.styleClasses = new Map(); // highlight CSS text -> class name
+    this.styleNames = new WeakMap(); // highlight style object -> class name
+
+    this.widths = this.measureColumns(sampleRows, fontSize);
+    this.offsets = [0];
+    this.widths.forEach(width => this.offsets.push(this.offsets[this.offsets.length - 1] + width));
+    const totalWidth = this.offsets[this.offsets.length - 1];
+
+    container.innerHTML = '';
+    container.classList.add('virtual-table', this.id);
+    container.style.setProperty('--vt-row-height', `${rowHeight}px`);
+    this.styleEl = document.createElement('style');
+    this.header = document.createElement('div');
+    this.header.className = 'vt-header';
+    this.header.style.width = `${totalWidth}px`;
+    this.body = document.createElement('div');
+    this.body.className = 'vt-body';
+    this.body.style.width = `${totalWidth}px`;
+    this.body.style.height = `${rowCount * rowHeight}px`;
+    container.append(this.styleEl, this.header, this.body);
+
+    this.onScroll = () => this.schedule();
+    container.addEventListener('scroll', this.onScroll, { passive: true });
+    this.update();
+  }
+
+  // Column widths from the header and the values of a few rows
+  measureColumns(sampleRows, fontSize) {
+    const charWidth = fontSize * 0.6;
+    const highlighted = this.highlights ? this.highlights.cellColumns : new Set();
+    return this.columns.map((name, colIndex) => {
+      let chars = String(name).length;
+      sampleRows.forEach(rowIndex => {
+        chars = Math.max(chars, String(this.cell(rowIndex, colIndex) ?? '').length);
+      });
+      // Highlighted cells are allowed to grow wider, like autosized grid columns
+      const max = highlighted.has(colIndex) ? 400 : 240;
+      return clamp(Math.ceil(chars * charWidth) + 20, 60, max);
+    });
+  }
+
+  // Index of the column at horizontal offset `x`
+  columnAt(x) {
+    let low = 0;
+    let high = this.columns.length - 1;
+    while (low < high) {
+      const mid = (low + high + 1) >> 1;
+      if (this.offsets[mid] <= x) low = mid;
+      else high = mid - 1;
+    }
+    return Math.max(0, low);
+  }
+
+  schedule() {
+    if (this.frame !== null) return;
+    this.frame = requestAnimationFrame(() => {
+      this.frame = null;
+      this.update();
+    });
+  }
+
+  // Redraw with new cell values
+  refresh() {
+    this.version++;
+    this.schedule();
+  }
+
+  update() {
+    const { scrollTop, scrollLeft } = this.container;
+    const viewHeight = this.container.clientHeight || 300;
+    const viewWidth = this.container.clientWidth || 320;
+    // The sticky header takes one row height above the body
+    const bodyTop = scrollTop - this.rowHeight;
+    const firstRow = clamp(Math.floor(bodyTop / this.rowHeight) - VIRTUAL_OVERSCAN_ROWS, 0, this.rowCount);
+    const lastRow = clamp(Math.ceil((bodyTop + viewHeight) / this.rowHeight) + VIRTUAL_OVERSCAN_ROWS, firstRow, this.rowCount);
+    const firstCol = this.columnAt(scrollLeft);
+    const lastCol = Math.min(this.columns.length, this.columnAt(scrollLeft + viewWidth) + 1);
+    const colKey = `${firstCol}:${lastCol}`;
+
+    if (this.onRowsNeeded && lastRow > firstRow) this.onRowsNeeded(firstRow, lastRow);
+
+    if (this.header.dataset.columns !== colKey) {
+      this.header.dataset.columns = colKey;
+      this.renderCells(this.header, firstCol, lastCol, colIndex => this.columns[colIndex], () => 'vt-cell vt-header-cell');
+    }
+
+    // Rows that stay in view keep their element; the others are reused
+    const free = [];
+    this.rowElements.forEach((element, rowIndex) => {
+      if (rowIndex < firstRow || rowIndex >= lastRow) {
+        this.rowElements.delete(rowIndex);
+        free.push(element);
+      }
+    });
+    const key = `${colKey}:${this.version}`;
+    for (let rowIndex = firstRow; rowIndex < lastRow; rowIndex++) {
+      let element = this.rowElements.get(rowIndex);
+      if (!element) {
+        element = free.pop() || this.spareRows.pop() || this.createRow();
+        element.style.transform = `translateY(${rowIndex * this.rowHeight}px)`;
+        element.hidden = false;
+        element.dataset.key = '';
+        this.rowElements.set(rowIndex, element);
+      }
+      if (element.dataset.key !== key) {
+        element.dataset.key = key;
+        this.renderCells(element, firstCol, lastCol,
+          colIndex => this.cell(rowIndex, colIndex),
+          colIndex => this.cellClass(rowIndex, colIndex));
+      }
+    }
+    free.forEach(element => {
+      element.hidden = true;
+      this.spareRows.push(element);
+    });
+  }
+
+  createRow() {
+    const element = document.createElement('div');
+    element.className = 'vt-row';
+    this.body.appendChild(element);
+    return element;
+  }
+
+  // Fill `parent` with one cell per column in [firstCol, lastCol)
+  renderCells(parent, firstCol, lastCol, value, className) {
+    const count = lastCol - firstCol;
+    while (parent.childElementCount < count) parent.appendChild(document.createElement('div'));
+    while (parent.childElementCount > count) parent.lastElementChild.remove();
+    for (let i = 0; i < count; i++) {
+      const colIndex = firstCol + i;
+      const cell = parent.children[i];
+      cell.className = className(colIndex);
+      cell.style.left = `${this.offsets[colIndex]}px`;
+      cell.style.width = `${this.widths[colIndex]}px`;
+      cell.textContent = String(value(colIndex) ?? '');
+    }
+  }
+
+  // Cell highlights first, then row, then column highlights
+  cellClass(rowIndex, colIndex) {
+    const style = this.highlights ? this.highlights.style(rowIndex, colIndex) : null;
+    return style ? `vt-cell vt-highlight ${this.styleClass(style)}` : 'vt-cell';
+  }
+
+  // One generated class per distinct highlight style of this table; styles
+  // with the same CSS text share a class, and each new rule is appended as
+  // its own text node instead of rewriting the whole stylesheet
+  styleClass(style) {
+    let name = this.styleNames.get(style);
+    if (name) return name;
+    // Cells stay absolutely positioned
+    const { position, ...rule } = style;
+    const css = styleToCss(rule);
+    name = this.styleClasses.get(css);
+    if (!name) {
+      name = `vt-style-${this.styleClasses.size}`;
+      this.styleClasses.set(css, name);
+      this.styleEl.appendChild(document.createTextNode(`.${this.id} .${name} { ${css} }\n`));
+    }
+    this.styleNames.set(style, name);
+    return name;
+  }
+
+  // Scroll so the given row and column are in the middle of the view
+  scrollToCell(rowIndex, colIndex) {
+    const viewHeight = this.container.clientHeight || 300;
+    const viewWidth = this.container.clientWidth || 320;
+    if (rowIndex !== null && rowIndex >= 0 && rowIndex < this.rowCount) {
+      this.container.scrollTop = Math.max(0, (rowIndex + 1.5) * this.rowHeight - viewHeight / 2);
+    }
+    if (colIndex !== null && colIndex >= 0 && colIndex < this.columns.length) {
+      this.container.scrollLeft = Math.max(0, this.offsets[colIndex] + this.widths[colIndex] / 2 - viewWidth / 2);
+    }
+    this.update();
+  }
+
+  destroy() {
+    if (this.frame !== null) cancelAnimationFrame(this.frame);
+    this.frame = null;
+    this.container.removeEventListener('scroll', this.onScroll);
+  }
+}
+
+// Number of cards rendered in the stack
+const STACK_SIZE = 5;
+// Card elements kept after leaving the stack, so going back is instant
+const MAX_RECYCLED_CARDS = 3;
+// Table cards behind the front card that also get a live grid; the rest of
+// the stack shows a static preview
+const GRID_LOOKAHEAD = 1;
+// Idle grid instances kept for rebinding instead of calling createGrid again
+const MAX_POOLED_GRIDS = 2;
+// Size of the static table preview around a card's focus cell
+const PREVIEW_ROWS = 12;
+const PREVIEW_COLUMNS = 8;
+// Paged decks: cards kept behind the current one (at least one window)
+const CARDS_KEPT_BEHIND = 20;
+
 class SwipeCards {
   constructor(container, cards, tableData = null, highlightCells = [], highlightRows = [], highlightColumns = [], displayMode = 'cards', centerTableRow = null, centerTableColumn = null, lastCardMessage = 'No more cards to swipe', opts = {}) {
     this.container = container;
@@ -276,6 +1247,39 @@ class SwipeCards {
     this.tableFontSize = opts.tableFontSize ?? 14;
     this.tableMaxRows = opts.tableMaxRows ?? null;
     this.tableMaxColumns = opts.tableMaxColumns ?? null;
+    // Image decks: cards beyond the stack to prefetch and parallel downloads
+    this.imagePrefetch = opts.imagePrefetch ?? 5;
+    this.imagePrefetchConcurrency = opts.imagePrefetchConcurrency ?? 3;
+    // Result reporting: 'immediate', 'batch', 'idle', 'complete' or 'manual'
+    this.reportMode = opts.reportMode ?? 'immediate';
+    this.reportBatchSize = opts.reportBatchSize ?? 10;
+    this.reportIdleMs = opts.reportIdleMs ?? 1500;
+    this.unreportedActions = 0; // Actions since the last value sent to Python
+    this._reportTimer = null;
+    // Result encoding: 'full' history or 'delta' events since the last acknowledged one
+    this.resultEncoding = opts.resultEncoding ?? 'full';
+    this.resultStream = Math.random().toString(36).slice(2, 10); // Identifies this deck instance
+    this.resultSeq = 0;
+    this.resultEvents = []; // Unacknowledged { seq, action, cardIndex } events
+    this.lastValue = null; // Last value sent, repeated when asking for blobs
+    // Shared table payloads referenced by cards via `dataset_id`
+    this.datasets = opts.datasets || {};
+    // Windowed table mode: row blocks requested from Python but not yet received
+    this.outstandingBlocks = new Map(); // "datasetId:block" -> { dataset_id, block }
+    this.pendingRowRequests = []; // Grid row requests waiting for blocks
+    this._blockRequestTimer = null;
+    // Used by update() to detect what changed between renders
+    this.cardSignatures = cards.map(cardSignature);
+    // Paged decks: `cards` is a sparse array holding a sliding window of the
+    // deck at global indices (see mergeCardWindow)
+    this.cardStream = null;
+    this.totalCards = null; // Deck size, once known
+    this.cardWindowSize = 0;
+    this.firstCard = 0; // Lowest index still held
+    this.cardRequest = null; // { id, position, loaded } sent to Python
+    this._lastCardRequest = null;
+    this._cardRequestTimer = null;
+    this.renderSignature = opts.renderSignature ?? null;
     // Theme flags removed: always follow Streamlit theme when available
     this.currentIndex = 0;
     this.swipedCards = [];
@@ -285,8 +1289,12 @@ class SwipeCards {
     this.currentX = 0;
     this.currentY = 0;
     this.lastAction = null; // Store the last action without sending immediately
-    this.agGridInstances = new Map(); // Store AG-Grid instances for cleanup
+    this.liveGrids = new Map(); // cardIndex -> grid slot { grid, element, blockSize, binding }
+    this.gridPool = []; // Idle grid slots, rebound to the next cards
+    this._liveGridTimer = null;
     this.gridHandlers = new Map(); // Store table interaction handlers
+    this.recycledCards = new Map(); // Card elements that recently left the stack, by index
+    this.highlightIndexes = new WeakMap(); // card -> HighlightIndex
     this.isAnimating = false; // Prevent rapid repeated actions
     this.mode = 'swipe'; // Default mode
     this.moveRaf = null; // Track scheduled move frame
@@ -294,17 +1302,26 @@ class SwipeCards {
     this.pillsModalOpen = false; // Track pills modal state
     this.maxVisiblePills = 3; // Max pills shown inline before collapsing
 
+    if (opts.cardWindow) {
+      this.cards = [];
+      this.cardSignatures = [];
+      this.mergeCardWindow(cards, opts.cardWindow);
+      this.firstCard = opts.cardWindow.offset;
+      this.currentIndex = opts.cardWindow.position ?? opts.cardWindow.offset;
+    }
+
     // Bind swipe handlers once so we can add/remove them easily
     this.handleStart = this.handleStart.bind(this);
     this.handleMove = this.handleMove.bind(this);
     this.handleEnd = this.handleEnd.bind(this);
 
+    // Highlight indexes hold styles resolved against the theme's primary color
+    this.unsubscribeTheme = themeManager.subscribe(() => this.render());
+
     this.init();
   }
 
   init() {
-    // Apply theme detection
-    detectAndApplyTheme();
     this.render();
     this.bindEvents();
 
@@ -334,6 +1351,14 @@ class SwipeCards {
             return;
           }
 
+          const commitBtn = e.target && e.target.closest && e.target.closest('.commit-btn');
+          if (commitBtn && this.container.contains(commitBtn)) {
+            e.preventDefault();
+            e.stopPropagation();
+            if (this.unreportedActions > 0) this.sendResults();
+            return;
+          }
+
           // Close modal via header close button or overlay click
           const closeBtn = e.target && e.target.closest && e.target.closest('.pills-modal-close');
           if (closeBtn) {
@@ -374,80 +1399,24 @@ class SwipeCards {
       note.classList.remove('visible');
       setTimeout(() => note.remove(), 300);
     }, 2000);
-  }
-  
-  render() {
-    console.log('Rendering cards. CurrentIndex:', this.currentIndex, 'Total cards:', this.cards.length, 'Display mode:', this.displayMode);
-    
-    // Clean up existing AG-Grid instances
-    this.cleanupAgGrids();
-
-    if (this.currentIndex >= this.cards.length) {
-      this.container.innerHTML = `
-        <div class="cards-stack">
-          <div class="swipe-card no-more-cards">
-            <h3>🎉 All done!</h3>
-            <p>${this.lastCardMessage}</p>
-          </div>
-        </div>
-        <div class="action-buttons">
-          <button class="action-btn btn-pass" onclick="swipeCards.swipeLeft()" disabled>❌</button>
-          <button class="action-btn btn-back" onclick="swipeCards.goBack()">
-            <svg width="24" height="24" viewBox="0 0 24 24" fill="none" xmlns="http://www.w3.org/2000/svg">
-              <path d="M12 3C16.9706 3 21 7.02944 21 12C21 16.9706 16.9706 21 12 21C8.5 21 5.5 18.5 4 15.5" stroke="#FFA500" stroke-width="2.5" stroke-linecap="round" fill="none"/>
-              <path d="M2 14L4 12.5L6 14" stroke="#FFA500" stroke-width="2.5" stroke-linecap="round" stroke-linejoin="round" fill="none"/>
-            </svg>
-          </button>
-          <button class="action-btn btn-like" onclick="swipeCards.swipeRight()" disabled>✔️</button>
-        </div>
-        <div class="results-section">
-          <div class="swipe-counter">Total swiped: ${this.swipedCards.length}</div>
-        </div>
-      `;
-      return;
-    }
-    
-    let cardsHTML = '';
-
-    // Show up to 5 cards in the stack for smoother animations
-    for (let i = 0; i < Math.min(5, this.cards.length - this.currentIndex); i++) {
-      const cardIndex = this.currentIndex + i;
-      const card = this.cards[cardIndex];
-      
-      console.log('Creating card for index:', cardIndex, 'Display mode:', this.displayMode);
-      
-      // Add position classes for consistent sizing
-      let positionClass = '';
-      if (i === 0) positionClass = 'card-front';
-      else if (i === 1) positionClass = 'card-second';
-      else if (i === 2) positionClass = 'card-third';
-      
-      let cardContent = '';
-      
-      if (this.displayMode === 'table' && card.data) {
-        // Render table card
-        cardContent = this.renderTableCard(card, cardIndex);
-      } else {
-        // Render traditional image card
-        cardContent = this.renderImageCard(card);
-      }
-      
-      cardsHTML += `
-        <div class="swipe-card ${positionClass}" data-index="${cardIndex}">
-          ${cardContent}
-          <div class="action-indicator like">✔️</div>
-          <div class="action-indicator pass">❌</div>
-        </div>
-      `;
-    }
+  }
+  
+  // Full render: rebuild the stack and action bar, e.g. after settings changed.
+  // Swipes and back actions only reconcile the stack (see syncStack).
+  render() {
+    const span = perfMetrics.start('render');
+    debugLog('Rendering cards. CurrentIndex:', this.currentIndex, 'Total cards:', this.cards.length, 'Display mode:', this.displayMode);
     
+    // Return live grids to the pool, drop recycled cards and highlight lookups
+    this.releaseAllGrids();
+    this.recycledCards.clear();
+    this.highlightIndexes = new WeakMap();
+
     this.container.classList.toggle('inspect-mode', this.mode === 'inspect');
     this.container.classList.toggle('swipe-mode', this.mode === 'swipe');
 
     this.container.innerHTML = `
-      <div class="cards-stack">
-        ${cardsHTML}
-      </div>
+      <div class="cards-stack"></div>
       <div class="action-buttons">
         <button class="action-btn btn-pass" onclick="swipeCards.swipeLeft()">❌</button>
         <button class="action-btn btn-back" onclick="swipeCards.goBack()">
@@ -459,7 +1428,8 @@ class SwipeCards {
         <button class="action-btn btn-like" onclick="swipeCards.swipeRight()">✔️</button>
       </div>
       <div class="results-section">
-        <div class="swipe-counter">Swiped: ${this.swipedCards.length} | Remaining: ${this.cards.length - this.currentIndex}</div>
+        <div class="swipe-counter"></div>
+        <button class="commit-btn" hidden>Submit</button>
       </div>
     `;
 
@@ -474,10 +1444,248 @@ class SwipeCards {
       });
     }
 
+    this.syncStack();
+    perfMetrics.end(span);
+  }
+
+  // Reconcile the card stack with `currentIndex`. Card elements are keyed by
+  // `data-index`: cards still in the stack are kept and only promoted, cards
+  // leaving it are parked in a small recycle bin (so going back restores them
+  // with decoded images and live grids), and only missing cards are created.
+  syncStack() {
+    const stack = this.container.querySelector('.cards-stack');
+    if (!stack) return;
+    const end = Math.min(this.currentIndex + STACK_SIZE, this.cards.length);
+
+    const existing = new Map();
+    Array.from(stack.children).forEach(element => {
+      if (!element.hasAttribute('data-index')) {
+        element.remove(); // "All done" card
+        return;
+      }
+      const cardIndex = parseInt(element.getAttribute('data-index'));
+      if (cardIndex >= this.currentIndex && cardIndex < end) {
+        existing.set(cardIndex, element);
+      } else {
+        element.remove();
+        this.recycleCard(cardIndex, element);
+      }
+    });
+
+    let previous = null;
+    for (let cardIndex = this.currentIndex; cardIndex < end; cardIndex++) {
+      if (!this.cards[cardIndex]) break; // Paged deck: not loaded yet
+      const element = existing.get(cardIndex) || this.takeRecycledCard(cardIndex) || this.createCardElement(cardIndex);
+      const expected = previous ? previous.nextElementSibling : stack.firstElementChild;
+      if (element !== expected) {
+        stack.insertBefore(element, expected);
+      }
+      previous = element;
+    }
+
+    const done = this.currentIndex >= this.cards.length && !this.hasMoreCards();
+    const waiting = !done && !this.cards[this.currentIndex];
+    if (done) {
+      stack.insertAdjacentHTML('beforeend', `
+        <div class="swipe-card no-more-cards">
+          <h3>🎉 All done!</h3>
+          <p>${this.lastCardMessage}</p>
+        </div>
+      `);
+    } else if (waiting) {
+      stack.insertAdjacentHTML('beforeend', `
+        <div class="swipe-card no-more-cards">
+          <p>Loading more cards…</p>
+        </div>
+      `);
+    }
+    this.container.querySelectorAll('.btn-pass, .btn-like').forEach(btn => {
+      btn.disabled = done || waiting;
+    });
+
+    this.updateCardStackClasses();
+    this.updateSwipeCounter();
+    this.updateCommitButton();
+    this.bindEvents();
+    this.scheduleLiveGrids();
+    this.prefetchImages();
+    this.requestCardsIfNeeded();
+
     // Ensure the Streamlit iframe height tracks content
     updateFrameHeightDebounced();
   }
 
+  // Warm the images of the cards that enter the stack next
+  prefetchImages() {
+    if (this.displayMode === 'table') return;
+    const image = (cardIndex) => this.cards[cardIndex]?.image;
+    const stackEnd = Math.min(this.currentIndex + STACK_SIZE, this.cards.length);
+    const end = Math.min(stackEnd + this.imagePrefetch, this.cards.length);
+    const upcoming = [];
+    for (let cardIndex = stackEnd; cardIndex < end; cardIndex++) upcoming.push(image(cardIndex));
+    const stack = [];
+    for (let cardIndex = this.currentIndex; cardIndex < stackEnd; cardIndex++) stack.push(image(cardIndex));
+    imagePrefetcher.configure(this.imagePrefetch, this.imagePrefetchConcurrency);
+    imagePrefetcher.update(upcoming.filter(Boolean), stack.filter(Boolean));
+  }
+
+  createCardElement(cardIndex) {
+    const template = document.createElement('template');
+    template.innerHTML = this.renderCardHTML(cardIndex).trim();
+    return template.content.firstElementChild;
+  }
+
+  // Park a card that left the stack; the oldest parked card is destroyed
+  recycleCard(cardIndex, element) {
+    this.recycledCards.delete(cardIndex);
+    this.recycledCards.set(cardIndex, element);
+    while (this.recycledCards.size > MAX_RECYCLED_CARDS) {
+      const oldest = this.recycledCards.keys().next().value;
+      this.recycledCards.delete(oldest);
+      this.releaseCardGrid(oldest);
+    }
+  }
+
+  takeRecycledCard(cardIndex) {
+    const element = this.recycledCards.get(cardIndex);
+    if (!element) return null;
+    this.recycledCards.delete(cardIndex);
+    // Reset swipe-out state
+    element.classList.remove('swiped-left', 'swiped-right', 'dragging');
+    element.style.transform = '';
+    element.querySelectorAll('.action-indicator').forEach(indicator => indicator.classList.remove('show'));
+    return element;
+  }
+
+  // Markup of one card in the stack
+  renderCardHTML(cardIndex, positionClass = '') {
+    const card = this.cards[cardIndex];
+    let cardContent = '';
+    
+    if (this.displayMode === 'table' && card.data) {
+      // Render table card
+      cardContent = this.renderTableCard(card, cardIndex);
+    } else {
+      // Render traditional image card
+      cardContent = this.renderImageCard(card);
+    }
+    
+    return `
+      <div class="swipe-card ${positionClass}" data-index="${cardIndex}">
+        ${cardContent}
+        <div class="action-indicator like">✔️</div>
+        <div class="action-indicator pass">❌</div>
+      </div>
+    `;
+  }
+
+  // Apply the args of a new render to the live instance. Swipe position, DOM
+  // and grids are kept; only cards whose content changed are re-rendered.
+  // Returns false if the deck shrank or another paged deck started, which
+  // needs a fresh instance.
+  update(cards, tableData, datasets, settings, renderSignature, cardWindow = null) {
+    if (cardWindow ? cardWindow.stream !== this.cardStream
+                   : this.cardStream !== null || cards.length < this.cards.length) {
+      return false;
+    }
+
+    const rerenderAll = renderSignature !== this.renderSignature;
+    Object.assign(this, settings);
+    this.renderSignature = renderSignature;
+    this.mergeTableData(datasets, tableData);
+
+    let changed = [];
+    if (cardWindow) {
+      changed = this.mergeCardWindow(cards, cardWindow);
+    } else {
+      const signatures = cards.map(cardSignature);
+      signatures.forEach((signature, i) => {
+        if (signature !== this.cardSignatures[i]) changed.push(i);
+      });
+      this.cards = cards;
+      this.cardSignatures = signatures;
+    }
+
+    if (rerenderAll) {
+      this.render();
+      return true;
+    }
+    if (changed.length === 0) return true;
+
+    changed.forEach(cardIndex => this.patchCard(cardIndex));
+    this.syncStack();
+    return true;
+  }
+
+  // Place the window of a paged deck at its global indices and forget cards
+  // far behind the current one. Returns the indices whose content changed.
+  mergeCardWindow(cards, cardWindow) {
+    const changed = [];
+    cards.forEach((card, i) => {
+      const cardIndex = cardWindow.offset + i;
+      const signature = cardSignature(card);
+      if (signature !== this.cardSignatures[cardIndex]) changed.push(cardIndex);
+      this.cards[cardIndex] = card;
+      this.cardSignatures[cardIndex] = signature;
+    });
+    this.cardStream = cardWindow.stream;
+    this.totalCards = cardWindow.total ?? null;
+    this.cardWindowSize = cardWindow.size || cards.length;
+    if (this.totalCards !== null && this.cards.length > this.totalCards) {
+      this.cards.length = this.cardSignatures.length = this.totalCards;
+    }
+    const keepFrom = this.currentIndex - Math.max(CARDS_KEPT_BEHIND, this.cardWindowSize);
+    for (; this.firstCard < keepFrom; this.firstCard++) {
+      delete this.cards[this.firstCard];
+      delete this.cardSignatures[this.firstCard];
+    }
+    this.cardRequest = null; // Python answered; ask again below if still short
+    return changed;
+  }
+
+  hasMoreCards() {
+    if (this.cardStream === null) return false;
+    return this.totalCards === null || this.cards.length < this.totalCards;
+  }
+
+  // Number of cards in the deck, as far as known
+  deckLength() {
+    return this.totalCards ?? this.cards.length;
+  }
+
+  // Paged decks: ask Python for the next window once fewer than half a window
+  // of cards is left ahead, or when the current card is not loaded
+  requestCardsIfNeeded() {
+    if (this.cardStream === null) return;
+    const ahead = this.cards.length - this.currentIndex;
+    const missing = !this.cards[this.currentIndex] && this.currentIndex < this.deckLength();
+    if (!missing && (!this.hasMoreCards() || ahead >= Math.ceil(this.cardWindowSize / 2))) return;
+    const position = this.currentIndex;
+    const loaded = this.cards.length;
+    // One request per position and loaded range, so a window Python cannot
+    // serve (e.g. an iterator that moved on) is not requested in a loop
+    if (this._lastCardRequest === `${position}:${loaded}` || this._cardRequestTimer) return;
+    // Deferred: a results value sent right after a swipe carries the position
+    // as well and makes the request unnecessary (see sendResults)
+    this._cardRequestTimer = setTimeout(() => {
+      this._cardRequestTimer = null;
+      this._lastCardRequest = `${position}:${loaded}`;
+      this.cardRequest = { id: Math.random().toString(36).slice(2, 10), position, loaded };
+      sendValue({ ...this.lastValue, cardPosition: position, cardRequest: this.cardRequest });
+    }, 0);
+  }
+
+  // Re-render a single card in place if it is part of the visible stack
+  patchCard(cardIndex) {
+    this.recycledCards.delete(cardIndex);
+    this.releaseCardGrid(cardIndex);
+    const element = this.container.querySelector(`.cards-stack .swipe-card[data-index="${cardIndex}"]`);
+    if (!element) return;
+    const positionClass = ['card-front', 'card-second', 'card-third'].find(c => element.classList.contains(c)) || '';
+    element.insertAdjacentHTML('afterend', this.renderCardHTML(cardIndex, positionClass));
+    element.remove();
+  }
+
   setMode(mode) {
     this.mode = mode;
     if (mode !== 'swipe') {
@@ -529,22 +1737,7 @@ class SwipeCards {
     const blockOpts = { passive: false, capture: true };
 
     this.gridHandlers.forEach((handlers, gridContainer) => {
-      gridContainer.removeEventListener('pointerdown', handlers.handlePointerDown, pdOpts);
-      gridContainer.removeEventListener('pointerup', handlers.handlePointerUp, puOpts);
-      gridContainer.removeEventListener('wheel', handlers.blockScroll, blockOpts);
-      gridContainer.removeEventListener('touchmove', handlers.blockScroll, blockOpts);
-      gridContainer.removeEventListener('keydown', handlers.handleKeyDown, true);
-      gridContainer.removeEventListener('wheel', handlers.handleWheel, false);
-      if (handlers.blockResizeHandle) {
-        gridContainer.removeEventListener('mousedown', handlers.blockResizeHandle, true);
-        gridContainer.removeEventListener('dblclick', handlers.blockResizeHandle, true);
-      }
-      gridContainer.removeEventListener('pointerdown', handlers.handlePanStart, { passive: false });
-      gridContainer.removeEventListener('pointermove', handlers.handlePanMove, { passive: false });
-      window.removeEventListener('pointerup', handlers.handlePanEnd, { passive: true });
-      gridContainer.removeEventListener('touchstart', handlers.handlePanStart, { passive: false });
-      gridContainer.removeEventListener('touchmove', handlers.handlePanMove, { passive: false });
-      window.removeEventListener('touchend', handlers.handlePanEnd, { passive: true });
+      this.removeGridListeners(gridContainer, handlers);
 
       if (this.mode === 'swipe') {
         gridContainer.addEventListener('pointerdown', handlers.handlePointerDown, pdOpts);
@@ -568,41 +1761,50 @@ class SwipeCards {
       }
     });
   }
-  
-  cleanupAgGrids() {
-    // Destroy existing AG-Grid instances to prevent memory leaks
-    if (this.agGridInstances) {
-      this.agGridInstances.forEach((grid) => {
-        try {
-          if (grid && grid.destroy) {
-            grid.destroy();
-          }
-        } catch (error) {
-          console.warn('Error destroying AG-Grid instance:', error);
-        }
-      });
-      this.agGridInstances.clear();
-    }
 
-    if (this.gridHandlers) {
-      const pdOpts = { capture: true };
-      const puOpts = { passive: false, capture: true };
-      const blockOpts = { passive: false, capture: true };
+  // Remove the swipe and inspect mode handlers of one grid container
+  removeGridListeners(gridContainer, handlers) {
+    const pdOpts = { capture: true };
+    const puOpts = { passive: false, capture: true };
+    const blockOpts = { passive: false, capture: true };
 
-      this.gridHandlers.forEach((handlers, gridContainer) => {
-        gridContainer.removeEventListener('pointerdown', handlers.handlePointerDown, pdOpts);
-        gridContainer.removeEventListener('pointerup', handlers.handlePointerUp, puOpts);
-        gridContainer.removeEventListener('wheel', handlers.blockScroll, blockOpts);
-        gridContainer.removeEventListener('touchmove', handlers.blockScroll, blockOpts);
-        gridContainer.removeEventListener('keydown', handlers.handleKeyDown, true);
-        gridContainer.removeEventListener('wheel', handlers.handleWheel, false);
-        if (handlers.blockResizeHandle) {
-          gridContainer.removeEventListener('mousedown', handlers.blockResizeHandle, true);
-          gridContainer.removeEventListener('dblclick', handlers.blockResizeHandle, true);
-        }
-      });
-      this.gridHandlers.clear();
+    gridContainer.removeEventListener('pointerdown', handlers.handlePointerDown, pdOpts);
+    gridContainer.removeEventListener('pointerup', handlers.handlePointerUp, puOpts);
+    gridContainer.removeEventListener('wheel', handlers.blockScroll, blockOpts);
+    gridContainer.removeEventListener('touchmove', handlers.blockScroll, blockOpts);
+    gridContainer.removeEventListener('keydown', handlers.handleKeyDown, true);
+    gridContainer.removeEventListener('wheel', handlers.handleWheel, false);
+    if (handlers.blockResizeHandle) {
+      gridContainer.removeEventListener('mousedown', handlers.blockResizeHandle, true);
+      gridContainer.removeEventListener('dblclick', handlers.blockResizeHandle, true);
     }
+    gridContainer.removeEventListener('pointerdown', handlers.handlePanStart, { passive: false });
+    gridContainer.removeEventListener('pointermove', handlers.handlePanMove, { passive: false });
+    window.removeEventListener('pointerup', handlers.handlePanEnd, { passive: true });
+    gridContainer.removeEventListener('touchstart', handlers.handlePanStart, { passive: false });
+    gridContainer.removeEventListener('touchmove', handlers.handlePanMove, { passive: false });
+    window.removeEventListener('touchend', handlers.handlePanEnd, { passive: true });
+  }
+  
+  // Release grids and document listeners before the instance is replaced
+  destroy() {
+    this.unsubscribeTheme();
+    this.cleanupAgGrids();
+    document.removeEventListener('mousemove', this.handleMove);
+    document.removeEventListener('touchmove', this.handleMove);
+    document.removeEventListener('mouseup', this.handleEnd);
+    document.removeEventListener('touchend', this.handleEnd);
+    clearTimeout(this._blockRequestTimer);
+    clearTimeout(this._reportTimer);
+    clearTimeout(this._liveGridTimer);
+    clearTimeout(this._cardRequestTimer);
+  }
+
+  cleanupAgGrids() {
+    // Destroy live and pooled AG-Grid instances to prevent memory leaks
+    this.releaseAllGrids();
+    this.gridPool.forEach(slot => this.destroyGridSlot(slot));
+    this.gridPool = [];
   }
   
   renderImageCard(card) {
@@ -614,9 +1816,11 @@ class SwipeCards {
     const lowRes = card.lowres || card.lowRes || card.image_low || card.thumbnail;
     const placeholder = card.placeholder || card.placeholder_image;
 
-    const src = placeholder || card.image;
-    const srcsetAttr = lowRes ? `srcset="${lowRes} 480w, ${card.image} 800w"` : '';
-    const placeholderAttrs = placeholder ? `data-full="${card.image}"` : '';
+    // Prefetched images are already decoded: skip the placeholder stage
+    const ready = imagePrefetcher.isReady(card.image);
+    const src = ready ? card.image : (placeholder || card.image);
+    const srcsetAttr = lowRes && !ready ? `srcset="${lowRes} 480w, ${card.image} 800w"` : '';
+    const placeholderAttrs = placeholder && !ready ? `data-full="${card.image}"` : '';
 
     return `
       <img src="${src}" ${srcsetAttr} ${placeholderAttrs} alt="${card.name}" class="card-image loading" loading="lazy" onload="handleImageLoad(this)"
@@ -628,56 +1832,526 @@ class SwipeCards {
       </div>
     `;
   }
-  
-  renderTableCard(card, cardIndex) {
-    const rowIndex = card.row_index;
-    
-    // Create AG-Grid container, initially hidden
-    let tableHTML = '<div class="table-card-image">';
-    tableHTML += '<div class="loading-overlay">';
-    tableHTML += '<div class="loading-snake"></div>';
-    tableHTML += '<button class="loading-btn">Loading data...</button>';
-    tableHTML += '</div>';
-    tableHTML += `<div class="ag-grid-container loading" id="ag-grid-${cardIndex}" style="visibility: hidden;"></div>`;
-    tableHTML += '</div>';
-    
-    // Add pills if they exist
-    let pillsHTML = '';
-    if (card.pills && Array.isArray(card.pills) && card.pills.length > 0) {
-      pillsHTML = this.renderPills(card.pills);
+  
+  renderTableCard(card, cardIndex) {
+    const rowIndex = card.row_index;
+    if (!this.getTableDataForCard(card)) {
+      console.warn(`No table data for card ${cardIndex} (dataset_id: ${card.dataset_id})`);
+    }
+    
+    // Static preview; the front cards get a live grid on top (see updateLiveGrids)
+    let tableHTML = '<div class="table-card-image">';
+    tableHTML += `<div class="table-preview">${this.renderTablePreview(card)}</div>`;
+    tableHTML += '</div>';
+    
+    // Add pills if they exist
+    let pillsHTML = '';
+    if (card.pills && Array.isArray(card.pills) && card.pills.length > 0) {
+      pillsHTML = this.renderPills(card.pills);
+    }
+    
+    // Add card content section like image cards
+    const modeLabel = this.mode === 'swipe' ? 'Inspect' : 'Swipe';
+    tableHTML += '<div class="card-content">';
+    tableHTML += '<div class="card-header">';
+    tableHTML += `<h3 class="card-name">${card.name || `Row ${rowIndex + 1}`}</h3>`;
+    tableHTML += '<div class="card-header-buttons">';
+    tableHTML += `<button class="mode-toggle-btn">${modeLabel}</button>`;
+    tableHTML += '</div>';
+    tableHTML += '</div>';
+    tableHTML += `<p class="card-description">${card.description || `Swipe to evaluate this data row`}</p>`;
+    tableHTML += pillsHTML;
+    tableHTML += '</div>';
+    
+    return tableHTML;
+  }
+
+  // Plain table of the rows and columns around a card's focus cell
+  renderTablePreview(card) {
+    const tableData = this.getTableDataForCard(card);
+    if (!tableData || !Array.isArray(tableData.columns)) return '';
+    const highlights = this.getHighlightIndex(card, tableData);
+    const columnCount = Math.min(tableData.columns.length, this.tableMaxColumns || tableData.columns.length);
+    const rowCount = this.getTableRowCount(tableData);
+
+    const centerRow = card.center_table_row ?? this.centerTableRow ?? card.row_index ?? 0;
+    const centerColumn = tableData.columns.indexOf(card.center_table_column ?? this.centerTableColumn);
+    const rowStart = Math.max(0, Math.min(centerRow - Math.floor(PREVIEW_ROWS / 2), rowCount - PREVIEW_ROWS));
+    const colStart = centerColumn < 0
+      ? 0
+      : Math.max(0, Math.min(centerColumn - Math.floor(PREVIEW_COLUMNS / 2), columnCount - PREVIEW_COLUMNS));
+    const rowEnd = Math.min(rowStart + PREVIEW_ROWS, rowCount);
+    const colEnd = Math.min(colStart + PREVIEW_COLUMNS, columnCount);
+
+    let tableHTML = '<table class="data-table preview-table"><thead><tr>';
+    for (let colIndex = colStart; colIndex < colEnd; colIndex++) {
+      tableHTML += `<th>${tableData.columns[colIndex]}</th>`;
+    }
+    tableHTML += '</tr></thead><tbody>';
+    for (let rowIndex = rowStart; rowIndex < rowEnd; rowIndex++) {
+      tableHTML += '<tr>';
+      for (let colIndex = colStart; colIndex < colEnd; colIndex++) {
+        const style = styleToCss(highlights.style(rowIndex, colIndex));
+        tableHTML += `<td style="${style}">${this.getTableCell(tableData, rowIndex, colIndex)}</td>`;
+      }
+      tableHTML += '</tr>';
+    }
+    tableHTML += '</tbody></table>';
+    return tableHTML;
+  }
+  
+  // Highlight lookups for a card, built once per card and table
+  getHighlightIndex(card, tableData) {
+    let index = this.highlightIndexes.get(card);
+    if (!index) {
+      index = new HighlightIndex(
+        card.highlight_cells || this.highlightCells,
+        card.highlight_rows || this.highlightRows,
+        card.highlight_columns || this.highlightColumns,
+        tableData?.columns || []
+      );
+      this.highlightIndexes.set(card, index);
+    }
+    return index;
+  }
+
+  // Resolve the table data for a card: inline `table_data`, a reference into
+  // the shared `datasets` map, or the legacy single dataset.
+  getTableDataForCard(card) {
+    if (card && card.table_data) return card.table_data;
+    if (card && card.dataset_id !== undefined && card.dataset_id !== null) {
+      const shared = this.datasets[card.dataset_id];
+      if (shared) return shared;
+    }
+    return this.tableData;
+  }
+
+  // Number of rows the table shows, respecting windowed payloads and trimming
+  getTableRowCount(tableData) {
+    if (!tableData) return 0;
+    let total = 0;
+    if (tableData.blocks) {
+      total = tableData.total_rows || 0;
+    } else if (tableData.column_data) {
+      total = tableData.length || 0;
+    } else if (Array.isArray(tableData.rows)) {
+      total = tableData.rows.length;
+    }
+    return this.tableMaxRows ? Math.min(total, this.tableMaxRows) : total;
+  }
+
+  // Read one cell; works for row lists, columnar vectors and windowed blocks
+  getTableCell(tableData, rowIndex, colIndex) {
+    if (!tableData) return '';
+    let source = tableData.column_data ? tableData : tableData.rows;
+    let localRow = rowIndex;
+    if (tableData.blocks) {
+      const block = Math.floor(rowIndex / tableData.block_size);
+      source = tableData.blocks[block];
+      localRow = rowIndex - block * tableData.block_size;
+    }
+    return readTableCell(source, localRow, colIndex);
+  }
+
+  // Block numbers missing to show rows [start, end) of a windowed table
+  getMissingTableBlocks(tableData, start, end) {
+    if (!tableData || !tableData.blocks) return [];
+    const size = tableData.block_size;
+    const missing = [];
+    for (let block = Math.floor(start / size); block * size < end; block++) {
+      if (!tableData.blocks[block]) missing.push(block);
+    }
+    return missing;
+  }
+
+  // Indices of all rows currently available, in row order
+  getLoadedRowIndexes(tableData) {
+    if (!tableData) return [];
+    const count = this.getTableRowCount(tableData);
+    if (!tableData.blocks) {
+      return Array.from({ length: count }, (_, i) => i);
+    }
+    const size = tableData.block_size;
+    const loaded = [];
+    Object.keys(tableData.blocks)
+      .map(Number)
+      .sort((a, b) => a - b)
+      .forEach(block => {
+        const length = tableLength(tableData.blocks[block]);
+        for (let i = 0; i < length && block * size + i < count; i++) {
+          loaded.push(block * size + i);
+        }
+      });
+    return loaded;
+  }
+
+  // Call `callback` once rows [start, end) are available, asking Python for
+  // missing blocks in windowed mode
+  fetchTableRows(tableData, start, end, callback) {
+    const missing = this.getMissingTableBlocks(tableData, start, end);
+    if (missing.length === 0) {
+      callback();
+      return;
+    }
+    this.pendingRowRequests.push({ tableData, start, end, callback });
+    this.requestTableBlocks(tableData.dataset_id, missing);
+  }
+
+  requestTableBlocks(datasetId, blocks) {
+    let added = false;
+    blocks.forEach(block => {
+      const requestKey = `${datasetId}:${block}`;
+      if (!this.outstandingBlocks.has(requestKey)) {
+        this.outstandingBlocks.set(requestKey, { dataset_id: datasetId, block });
+        added = true;
+      }
+    });
+    // Coalesce requests from several grid pages into a single component value
+    if (added && !this._blockRequestTimer) {
+      this._blockRequestTimer = setTimeout(() => {
+        this._blockRequestTimer = null;
+        this.sendResults();
+      }, 0);
+    }
+  }
+
+  // Merge table payloads from a new render into the live instance. Windowed
+  // payloads are merged in place so grids holding a reference see new blocks.
+  mergeTableData(datasets = {}, tableData = null) {
+    const merge = (existing, incoming) => {
+      if (!existing || !incoming || !existing.blocks || !incoming.blocks ||
+          existing.dataset_id !== incoming.dataset_id) {
+        return incoming;
+      }
+      Object.assign(existing.blocks, incoming.blocks);
+      return existing;
+    };
+    Object.entries(datasets || {}).forEach(([id, incoming]) => {
+      this.datasets[id] = merge(this.datasets[id], incoming);
+    });
+    // Every render carries all datasets in use; drop the others
+    Object.keys(this.datasets).forEach(id => {
+      if (!datasets || !(id in datasets)) delete this.datasets[id];
+    });
+    if (tableData) {
+      this.tableData = merge(this.tableData, tableData);
+    }
+
+    // Drop requests that have been answered and resume waiting grids
+    const loaded = (id) => (id === this.tableData?.dataset_id ? this.tableData : this.datasets[id]);
+    this.outstandingBlocks.forEach((request, requestKey) => {
+      if (loaded(request.dataset_id)?.blocks?.[request.block]) {
+        this.outstandingBlocks.delete(requestKey);
+      }
+    });
+    this.pendingRowRequests = this.pendingRowRequests.filter(request => {
+      if (this.getMissingTableBlocks(request.tableData, request.start, request.end).length > 0) {
+        return true;
+      }
+      request.callback();
+      return false;
+    });
+  }
+
+  // Bind live grids to the front cards once the stack has settled
+  scheduleLiveGrids() {
+    if (this.displayMode !== 'table' || this._liveGridTimer) return;
+    this._liveGridTimer = setTimeout(() => {
+      this._liveGridTimer = null;
+      this.updateLiveGrids();
+    }, 10);
+  }
+
+  // Only the front card and GRID_LOOKAHEAD cards behind it hold a live grid;
+  // grids of cards leaving that window go back to the pool for reuse
+  updateLiveGrids() {
+    const end = Math.min(this.currentIndex + 1 + GRID_LOOKAHEAD, this.cards.length);
+    Array.from(this.liveGrids.keys()).forEach(cardIndex => {
+      if (cardIndex < this.currentIndex || cardIndex >= end) this.releaseCardGrid(cardIndex);
+    });
+    for (let cardIndex = this.currentIndex; cardIndex < end; cardIndex++) {
+      this.activateCardGrid(cardIndex);
+    }
+  }
+
+  // Give a card in the stack a live grid, rebinding a pooled one if possible
+  activateCardGrid(cardIndex) {
+    const host = this.container.querySelector(`.cards-stack .swipe-card[data-index="${cardIndex}"] .table-card-image`);
+    if (!host) return;
+    const live = this.liveGrids.get(cardIndex);
+    if (live && host.contains(live.element) && !(live.awaitingGrid && window.agGrid)) return;
+    if (live) this.releaseCardGrid(cardIndex);
+
+    const card = this.cards[cardIndex];
+    const tableData = this.getTableDataForCard(card);
+    if (!tableData) return;
+
+    if (!window.agGrid) {
+      // Show the plain table until the grid library has loaded
+      const element = document.createElement('div');
+      element.className = 'table-container';
+      host.appendChild(element);
+      const slot = { grid: null, element, blockSize: null, binding: { cardIndex, presented: true }, awaitingGrid: true };
+      this.liveGrids.set(cardIndex, slot);
+      slot.table = this.renderFallbackTable(element, card.row_index, tableData, card);
+      this.showGrid(slot);
+      loadAgGrid().then(() => this.scheduleLiveGrids(), () => {});
+      return;
+    }
+
+    const blockSize = tableData.block_size || 100;
+    const pooled = this.gridPool.findIndex(slot => slot.blockSize === blockSize);
+    const slot = pooled >= 0
+      ? this.gridPool.splice(pooled, 1)[0]
+      : (this.gridPool.pop() || { grid: null, element: null, blockSize, binding: null });
+    this.liveGrids.set(cardIndex, slot);
+
+    if (slot.grid) {
+      host.appendChild(slot.element);
+      // Swap column defs and datasource instead of creating a new grid
+      const span = perfMetrics.start('grid_rebind');
+      slot.grid.updateGridOptions(this.bindGridSlot(slot, cardIndex, card, tableData));
+      perfMetrics.end(span);
+      return;
+    }
+
+    slot.element = document.createElement('div');
+    slot.element.className = 'ag-grid-container loading';
+    host.appendChild(slot.element);
+    const span = perfMetrics.start('grid_init');
+    const gridOptions = this.bindGridSlot(slot, cardIndex, card, tableData);
+    try {
+      slot.grid = agGrid.createGrid(slot.element, {
+        ...gridOptions,
+        defaultColDef: {
+          resizable: true
+        },
+        rowModelType: 'infinite',
+        // Align grid pages with windowed row blocks so each page maps to one block
+        cacheBlockSize: blockSize,
+        maxBlocksInCache: 10,
+        suppressHorizontalScroll: false,
+        suppressVerticalScroll: false,
+        domLayout: 'normal',
+        // Only adjust height for highlighted rows to 27px
+        getRowHeight: (params) => {
+          const binding = slot.binding;
+          if (!binding) return undefined;
+          const rowIndex = params.node?.rowIndex ?? -1;
+          return binding.highlights.isRowHighlighted(rowIndex) ? 27 : binding.rowHeight;
+        },
+        animateRows: false,
+        suppressMovableColumns: true,
+        suppressMenuHide: true,
+        suppressColumnVirtualisation: false,
+        suppressRowVirtualisation: false,
+        suppressContextMenu: true,
+        enableCellTextSelection: true,
+        rowSelection: 'none',
+      });
+      this.attachGridHandlers(slot.element);
+      perfMetrics.end(span);
+    } catch (error) {
+      console.error('Error creating AG-Grid:', error);
+      // Fallback to simple table if AG-Grid fails
+      slot.grid = null;
+      slot.table = this.renderFallbackTable(slot.element, card.row_index, tableData, card);
+      slot.binding.presented = true;
+      this.showGrid(slot);
+    }
+  }
+
+  // Point a grid slot at a card. Returns the card-specific grid options.
+  bindGridSlot(slot, cardIndex, card, tableData) {
+    // Apply max columns/rows (visual trim)
+    const effectiveColumns = Array.isArray(tableData.columns)
+      ? tableData.columns.slice(0, this.tableMaxColumns || tableData.columns.length)
+      : [];
+    const rowCount = this.getTableRowCount(tableData);
+    const binding = {
+      cardIndex,
+      card,
+      tableData,
+      effectiveColumns,
+      // Card-specific highlights, indexed once for constant-time cell styling
+      highlights: this.getHighlightIndex(card, tableData),
+      // Default row height based on font size (original behavior)
+      rowHeight: Math.max(24, Math.round((this.tableFontSize || 14) + 12)),
+      presented: false,
+    };
+    slot.binding = binding;
+    slot.element.id = `ag-grid-${cardIndex}`;
+    slot.element.classList.add('loading');
+    slot.element.style.visibility = 'hidden';
+
+    const highlights = binding.highlights;
+    const isInspect = this.mode === 'inspect';
+    const columnDefs = effectiveColumns.map((col, colIndex) => {
+      const isHighlightedCol = highlights.cellColumns.has(colIndex);
+      return {
+        field: col,
+        headerName: col,
+        valueGetter: (params) => (params.data ? this.getTableCell(tableData, params.data.__row, colIndex) : ''),
+        // In inspect mode, avoid flex sizing so columns can exceed the viewport
+        // and enable horizontal scrolling; in swipe mode, keep flex for tidy fit.
+        // Also avoid flex on highlighted columns so width autosizing isn't overridden.
+        ...((isInspect || isHighlightedCol) ? {} : { flex: 1 }),
+        minWidth: 60,
+        // Prevent sizeColumnsToFit() from shrinking highlighted columns
+        suppressSizeToFit: isInspect || isHighlightedCol,
+        resizable: true,
+        sortable: false,
+        filter: false,
+        // Keep a fixed row height even for highlighted columns
+        // Do not enable wrap/autoHeight which would override rowHeight
+        ...(isHighlightedCol ? { wrapText: false, autoHeight: false } : {}),
+        // Cell highlights first, then row, then column highlights
+        cellStyle: (params) => highlights.style(params.node.rowIndex, colIndex)
+      };
+    });
+
+    // Rows only carry their index; cell values are read on demand through
+    // valueGetter, so no per-row objects with copied values are built
+    const rowRefs = (start, end) => Array.from({ length: Math.max(0, end - start) }, (_, i) => ({ __row: start + i }));
+
+    // Data source for infinite row model. In windowed mode missing blocks
+    // are requested from Python and the page is delivered once they arrive.
+    const datasource = {
+      rowCount: rowCount,
+      getRows: (params) => {
+        const start = params.startRow ?? params.request?.startRow ?? 0;
+        const end = Math.min(params.endRow ?? params.request?.endRow ?? 0, rowCount);
+        this.fetchTableRows(tableData, start, end, () => {
+          // The grid may have been rebound to another card meanwhile
+          if (slot.binding !== binding) return;
+          params.successCallback(rowRefs(start, end), rowCount);
+          if (!binding.presented) {
+            binding.presented = true;
+            requestAnimationFrame(() => this.presentGrid(slot, binding));
+          }
+        });
+      }
+    };
+
+    return {
+      columnDefs,
+      datasource,
+      rowHeight: binding.rowHeight,
+      headerHeight: Math.max(28, Math.round((this.tableFontSize || 14) + 14)),
+    };
+  }
+
+  // Size and center a grid once its first rows are rendered, then reveal it
+  presentGrid(slot, binding) {
+    if (slot.binding !== binding || !slot.grid) return;
+    const api = slot.grid;
+    const gridContainer = slot.element;
+    const { card, cardIndex, effectiveColumns, highlights } = binding;
+
+    // 1) Auto-size columns to their content (including header)
+    const allColIds = (api.getColumns() || []).map(c => c.getColId());
+    if (allColIds.length > 0) {
+      api.autoSizeColumns(allColIds, false);
+    }
+    // 1b) Ensure highlighted columns are fully auto-sized immediately in all modes
+    try {
+      const colIds = Array.from(highlights.cellColumns, i => effectiveColumns[i]).filter(Boolean);
+      if (colIds.length > 0) {
+        colIds.forEach(id => api.ensureColumnVisible(id, 'middle'));
+        // Delay slightly so target row paints before measuring
+        setTimeout(() => {
+          try { if (slot.binding === binding) api.autoSizeColumns(colIds, false); } catch (_) {}
+        }, 50);
+      }
+    } catch (_) {}
+    // 2) If the widget is wider than the total of the autosized columns,
+    //    expand columns to utilize available width (keep as-is otherwise).
+    if (this.mode !== 'inspect') {
+      try {
+        const gridWidth = gridContainer.getBoundingClientRect().width || gridContainer.clientWidth || 0;
+        const displayed = api.getAllDisplayedColumns() || [];
+        const totalColumnsWidth = displayed.reduce((sum, col) => sum + (col.getActualWidth ? col.getActualWidth() : 0), 0);
+        if (gridWidth > 0 && totalColumnsWidth > 0 && gridWidth > totalColumnsWidth) {
+          // Make columns grow to (approximately) the widget width in swipe mode only
+          api.sizeColumnsToFit();
+        }
+      } catch (e) {
+        // Non-fatal: fallback is to keep autosized widths
+      }
+    }
+
+    // Scroll to current row or centered view
+    const rowIndexToCenter = card.center_table_row ?? this.centerTableRow ?? card.row_index;
+    const colIdToCenter = card.center_table_column ?? this.centerTableColumn;
+
+    debugLog('Centering card', cardIndex, 'row:', rowIndexToCenter, 'col:', colIdToCenter);
+
+    if (rowIndexToCenter >= 0) {
+      api.ensureIndexVisible(rowIndexToCenter, 'middle');
+    }
+    if (colIdToCenter !== undefined && colIdToCenter !== null && colIdToCenter !== '') {
+      api.ensureColumnVisible(colIdToCenter, 'middle');
+    }
+
+    this.showGrid(slot);
+  }
+
+  // Replace the static preview with the live grid
+  showGrid(slot) {
+    const gridContainer = slot.element;
+    gridContainer.style.visibility = 'visible';
+    gridContainer.classList.remove('loading');
+    const preview = gridContainer.parentElement?.querySelector('.table-preview');
+    if (preview) preview.hidden = true;
+
+    window.swipeProgress.loaded++;
+    updateSwipeProgress();
+    // Update frame height after data renders and centering completes
+    updateFrameHeightDebounced();
+  }
+
+  // Detach a card's grid, restore its preview and keep the grid for reuse
+  releaseCardGrid(cardIndex) {
+    const slot = this.liveGrids.get(cardIndex);
+    if (!slot) return;
+    this.liveGrids.delete(cardIndex);
+    const preview = slot.element.parentElement?.querySelector('.table-preview');
+    if (preview) preview.hidden = false;
+    if (slot.table) {
+      slot.table.destroy();
+      slot.table = null;
+    }
+    slot.element.remove();
+    slot.element.id = '';
+    slot.binding = null;
+    if (slot.grid && this.gridPool.length < MAX_POOLED_GRIDS) {
+      this.gridPool.push(slot);
+    } else {
+      this.destroyGridSlot(slot);
     }
-    
-    // Add card content section like image cards
-    const modeLabel = this.mode === 'swipe' ? 'Inspect' : 'Swipe';
-    tableHTML += '<div class="card-content">';
-    tableHTML += '<div class="card-header">';
-    tableHTML += `<h3 class="card-name">${card.name || `Row ${rowIndex + 1}`}</h3>`;
-    tableHTML += '<div class="card-header-buttons">';
-    tableHTML += `<button class="mode-toggle-btn">${modeLabel}</button>`;
-    tableHTML += '</div>';
-    tableHTML += '</div>';
-    tableHTML += `<p class="card-description">${card.description || `Swipe to evaluate this data row`}</p>`;
-    tableHTML += pillsHTML;
-    tableHTML += '</div>';
-    
-    // Initialize AG-Grid after rendering - pre-center all cards, not just visible ones
-    setTimeout(() => {
-      this.initializeAgGrid(cardIndex, rowIndex);
-    }, 10);
-    
-    return tableHTML;
   }
-  
-  initializeAgGrid(cardIndex, currentRowIndex) {
-    const gridContainer = document.getElementById(`ag-grid-${cardIndex}`);
-    if (!gridContainer) return;
 
-    // Get the table data for this specific card using the correct card index
-    const card = this.cards[cardIndex];
-    const tableData = card.table_data || this.tableData;
+  releaseAllGrids() {
+    Array.from(this.liveGrids.keys()).forEach(cardIndex => this.releaseCardGrid(cardIndex));
+  }
 
-    if (!tableData) return;
+  destroyGridSlot(slot) {
+    try {
+      if (slot.grid && slot.grid.destroy) slot.grid.destroy();
+    } catch (error) {
+      console.warn('Error destroying AG-Grid instance:', error);
+    }
+    const handlers = this.gridHandlers.get(slot.element);
+    if (handlers) {
+      this.removeGridListeners(slot.element, handlers);
+      this.gridHandlers.delete(slot.element);
+    }
+    slot.grid = null;
+  }
 
+  // Install the swipe/inspect interaction handlers of a grid container. They
+  // only depend on the container, so pooled grids keep them across cards.
+  attachGridHandlers(gridContainer) {
     const shouldBlockResize = this.isTouchDevice && this.displayMode !== 'table';
 
     // Warn users in swipe mode that they need to inspect to interact with the table
@@ -820,620 +2494,117 @@ class SwipeCards {
     this.gridHandlers.set(gridContainer, {
       handlePointerDown,
       handlePointerUp,
-      blockScroll,
-      handleKeyDown,
-      handleWheel,
-      blockResizeHandle,
-      handlePanStart,
-      handlePanMove,
-      handlePanEnd,
-    });
-
-    if (this.mode === 'swipe') {
-      gridContainer.addEventListener('pointerdown', handlePointerDown, { capture: true });
-      gridContainer.addEventListener('pointerup', handlePointerUp, { passive: false, capture: true });
-      gridContainer.addEventListener('wheel', blockScroll, { passive: false, capture: true });
-      gridContainer.addEventListener('touchmove', blockScroll, { passive: false, capture: true });
-      gridContainer.addEventListener('keydown', handleKeyDown, true);
-      // Prevent header resize drag and double-click autosize in swipe mode
-      if (blockResizeHandle) {
-        gridContainer.addEventListener('mousedown', blockResizeHandle, true);
-        gridContainer.addEventListener('dblclick', blockResizeHandle, true);
-      }
-    } else {
-      // In inspect mode, enable drag panning for desktop and touch + wheel scrolling
-      gridContainer.addEventListener('pointerdown', handlePanStart, { passive: false });
-      gridContainer.addEventListener('pointermove', handlePanMove, { passive: false });
-      window.addEventListener('pointerup', handlePanEnd, { passive: true });
-      // For older mobile browsers that fire touch events
-      gridContainer.addEventListener('touchstart', handlePanStart, { passive: false });
-      gridContainer.addEventListener('touchmove', handlePanMove, { passive: false });
-      window.addEventListener('touchend', handlePanEnd, { passive: true });
-      // Desktop wheel and trackpad support (both axes)
-      gridContainer.addEventListener('wheel', handleWheel, { passive: false });
-    }
-    
-    // Use card-specific highlight configurations
-    const highlightCells = card.highlight_cells || this.highlightCells;
-    const highlightRows = card.highlight_rows || this.highlightRows;
-    const highlightColumns = card.highlight_columns || this.highlightColumns;
-    
-    // Apply max columns/rows (visual trim)
-    const effectiveColumns = Array.isArray(tableData.columns)
-      ? tableData.columns.slice(0, this.tableMaxColumns || tableData.columns.length)
-      : [];
-    const effectiveRows = Array.isArray(tableData.rows)
-      ? tableData.rows.slice(0, this.tableMaxRows || tableData.rows.length)
-      : [];
-
-    // Build a quick lookup for highlighted column ids (respecting numeric indices under trimming)
-    const highlightedColIds = new Set(
-      (highlightCells || [])
-        .map(h => (typeof h?.column === 'number' ? effectiveColumns[h.column] : h?.column))
-        .filter(Boolean)
-    );
-
-    // Prepare column definitions
-    const isInspect = this.mode === 'inspect';
-    const columnDefs = effectiveColumns.map(col => {
-      const isHighlightedCol = highlightedColIds.has(col);
-      return {
-        field: col,
-        headerName: col,
-        // In inspect mode, avoid flex sizing so columns can exceed the viewport
-        // and enable horizontal scrolling; in swipe mode, keep flex for tidy fit.
-        // Also avoid flex on highlighted columns so width autosizing isn't overridden.
-        ...((isInspect || isHighlightedCol) ? {} : { flex: 1 }),
-        minWidth: 60,
-        // Prevent sizeColumnsToFit() from shrinking highlighted columns
-        suppressSizeToFit: isInspect || isHighlightedCol,
-        resizable: true,
-        sortable: false,
-        filter: false,
-        // Keep a fixed row height even for highlighted columns
-        // Do not enable wrap/autoHeight which would override rowHeight
-        ...(isHighlightedCol ? { wrapText: false, autoHeight: false } : {}),
-        cellStyle: (params) => {
-          const rowIndex = params.node.rowIndex;
-          const columnField = params.colDef.field;
-
-          // Apply cell highlighting first (highest priority)
-          const isCellHighlighted = this.isCellHighlightedForCard(rowIndex, columnField, columnField, highlightCells);
-          if (isCellHighlighted) {
-            const style = this.getHighlightStyleObjectForCard(rowIndex, columnField, columnField, highlightCells);
-            return style;
-          }
-
-          // Apply row highlighting
-          const isRowHighlighted = this.isRowHighlightedForCard(rowIndex, highlightRows);
-          if (isRowHighlighted) {
-            const style = this.getRowHighlightStyleObjectForCard(rowIndex, highlightRows);
-            return style;
-          }
-
-          // Apply column highlighting
-          const isColumnHighlighted = this.isColumnHighlightedForCard(columnField, highlightColumns);
-          if (isColumnHighlighted) {
-            const style = this.getColumnHighlightStyleObjectForCard(columnField, highlightColumns);
-            return style;
-          }
-
-          return null;
-        }
-      };
-    });
-    
-    // Prepare row data
-    const rowData = effectiveRows.map(row => {
-      const rowObj = {};
-      effectiveColumns.forEach((col, index) => {
-        rowObj[col] = row[index] || '';
-      });
-      return rowObj;
-    });
-
-    // Data source for infinite row model
-    const dataSource = {
-      rowCount: rowData.length,
-      getRows: (params) => {
-        const start = params.startRow ?? params.request?.startRow ?? 0;
-        const end = params.endRow ?? params.request?.endRow ?? 0;
-        const rowsThisPage = rowData.slice(start, end);
-        params.successCallback(rowsThisPage, rowData.length);
-      }
-    };
-
-    // Grid options
-    // Default row height based on font size (original behavior)
-    const defaultRowHeight = Math.max(24, Math.round((this.tableFontSize || 14) + 12));
-    const headerHeight = Math.max(28, Math.round((this.tableFontSize || 14) + 14));
-    const gridOptions = {
-      columnDefs: columnDefs,
-      defaultColDef: {
-        resizable: true
-      },
-      rowModelType: 'infinite',
-      cacheBlockSize: 100,
-      maxBlocksInCache: 10,
-      suppressHorizontalScroll: false,
-      suppressVerticalScroll: false,
-      domLayout: 'normal',
-      headerHeight: headerHeight,
-      rowHeight: defaultRowHeight,
-      // Only adjust height for highlighted rows to 27px
-      getRowHeight: (params) => {
-        const rowIndex = params.node?.rowIndex ?? -1;
-        if (this.isRowHighlightedForCard(rowIndex, highlightRows)) {
-          return 27;
-        }
-        return defaultRowHeight;
-      },
-      animateRows: false,
-      suppressMovableColumns: true,
-      suppressMenuHide: true,
-      suppressColumnVirtualisation: false,
-      suppressRowVirtualisation: false,
-      suppressContextMenu: true,
-      enableCellTextSelection: true,
-      rowSelection: 'none',
-      onGridReady: (params) => {
-        params.api.setDatasource(dataSource);
-      },
-      onFirstDataRendered: (params) => {
-        // 1) Auto-size columns to their content (including header)
-        const allColIds = [];
-        const cols = params.columnApi.getColumns() || [];
-        cols.forEach(c => allColIds.push(c.getColId()));
-        if (allColIds.length > 0) {
-          params.columnApi.autoSizeColumns(allColIds, false);
-        }
-        // 1b) Ensure highlighted columns are fully auto-sized immediately in all modes
-        try {
-          const cardHighlights = (card.highlight_cells || this.highlightCells || []).filter(h => h);
-          if (cardHighlights.length > 0) {
-            const colIds = Array.from(new Set(cardHighlights.map(h => {
-              if (typeof h.column === 'number') {
-                return effectiveColumns[h.column];
-              }
-              return h.column;
-            }).filter(Boolean)));
-            if (colIds.length > 0) {
-              colIds.forEach(id => params.api.ensureColumnVisible(id, 'middle'));
-              // Delay slightly so target row paints before measuring
-              setTimeout(() => {
-                try { params.columnApi.autoSizeColumns(colIds, false); } catch (_) {}
-              }, 50);
-            }
-          }
-        } catch (_) {}
-        // 2) If the widget is wider than the total of the autosized columns,
-        //    expand columns to utilize available width (keep as-is otherwise).
-        if (this.mode !== 'inspect') {
-          try {
-            const gridWidth = gridContainer.getBoundingClientRect().width || gridContainer.clientWidth || 0;
-            const displayed = params.columnApi.getAllDisplayedColumns() || [];
-            const totalColumnsWidth = displayed.reduce((sum, col) => sum + (col.getActualWidth ? col.getActualWidth() : 0), 0);
-            if (gridWidth > 0 && totalColumnsWidth > 0 && gridWidth > totalColumnsWidth) {
-              // Make columns grow to (approximately) the widget width in swipe mode only
-              params.api.sizeColumnsToFit();
-            }
-          } catch (e) {
-            // Non-fatal: fallback is to keep autosized widths
-          }
-        }
-        // Do not cap widths; allow full resize in Inspect mode
-        
-        // Scroll to current row or centered view
-        const rowIndexToCenter = card.center_table_row !== null ? card.center_table_row : (this.centerTableRow !== null ? this.centerTableRow : currentRowIndex);
-        const colIdToCenter = card.center_table_column ?? this.centerTableColumn;
-
-        console.log(`Centering card ${cardIndex}: row=${rowIndexToCenter}, col=${colIdToCenter}`);
-
-        // Force the grid to be fully visible for centering
-        gridContainer.style.visibility = 'visible';
-        gridContainer.style.zIndex = '9999';
-
-        const overlay = gridContainer.parentElement.querySelector('.loading-overlay');
-        if (overlay) {
-          overlay.classList.add('fade-out');
-          setTimeout(() => overlay.remove(), 300);
-        }
-
-        gridContainer.classList.remove('loading');
-        window.swipeProgress.loaded++;
-        updateSwipeProgress();
-
-        if (rowIndexToCenter >= 0) {
-          params.api.ensureIndexVisible(rowIndexToCenter, 'middle');
-        }
-        if (colIdToCenter !== undefined && colIdToCenter !== null && colIdToCenter !== '') {
-          params.api.ensureColumnVisible(colIdToCenter, 'middle');
-        }
-
-        // (Kept) Highlight autosize handled above for both modes
-
-        // After centering, adjust visibility based on card position
-        setTimeout(() => {
-          if (cardIndex <= this.currentIndex + 2) {
-            // Keep visible for first 3 cards
-            gridContainer.style.visibility = 'visible';
-            gridContainer.style.opacity = '1';
-            gridContainer.style.zIndex = '';
-          } else {
-            // Hide background cards but keep them rendered
-            gridContainer.style.visibility = 'hidden';
-            gridContainer.style.opacity = '0';
-            gridContainer.style.zIndex = '-1';
-          }
-          
-          // Always store grid reference
-          this.agGridInstances.set(`${cardIndex}_centered`, true);
-        }, 200); // Longer delay to ensure centering is complete
-
-        // Update frame height after data renders and centering completes
-        updateFrameHeightDebounced();
-      }
-    };
-    
-    // Create the grid
-    try {
-      const grid = agGrid.createGrid(gridContainer, gridOptions);
-      
-      // Store grid instance for cleanup
-      if (!this.agGridInstances) {
-        this.agGridInstances = new Map();
-      }
-      this.agGridInstances.set(cardIndex, grid);
-      
-    } catch (error) {
-      console.error('Error creating AG-Grid:', error);
-      // Fallback to simple table if AG-Grid fails
-      this.renderFallbackTable(gridContainer, currentRowIndex);
-      gridContainer.classList.remove('loading');
-      const overlay = gridContainer.parentElement.querySelector('.loading-overlay');
-      if (overlay) overlay.remove();
-      window.swipeProgress.loaded++;
-      updateSwipeProgress();
-    }
-  }
-
-  // Expand the highlighted cell's column(s) for a given card so the
-  // highlighted content is fully visible. Safe to call anytime after
-  // the grid has been created for that card.
-  autosizeHighlightedColumnsForCard(cardIndex, rowIndex) {
-    try {
-      const grid = this.agGridInstances?.get(cardIndex);
-      if (!grid) return;
-      const card = this.cards?.[cardIndex];
-      if (!card) return;
-      const tableData = card.table_data || this.tableData;
-      if (!tableData) return;
-
-      // Respect visual trimming settings to map numeric indices correctly
-      const effectiveColumns = Array.isArray(tableData.columns)
-        ? tableData.columns.slice(0, this.tableMaxColumns || tableData.columns.length)
-        : [];
-
-      const highlights = (card.highlight_cells || this.highlightCells || []).filter(h => h);
-      if (highlights.length === 0) return;
-
-      const colIds = Array.from(new Set(highlights.map(h => {
-        if (typeof h.column === 'number') {
-          return effectiveColumns[h.column];
-        }
-        return h.column;
-      }).filter(Boolean)));
-      if (colIds.length === 0) return;
-
-      // Center the row/columns, then autosize after a short delay to ensure
-      // DOM rendering has caught up.
-      try { grid.ensureIndexVisible?.(rowIndex, 'middle'); } catch (_) {}
-      colIds.forEach(id => { try { grid.ensureColumnVisible?.(id, 'middle'); } catch (_) {} });
-
-      const columnApi = grid.getColumnApi ? grid.getColumnApi() : null;
-      if (!columnApi) return;
-
-      setTimeout(() => {
-        try {
-          columnApi.autoSizeColumns(colIds, false);
-        } catch (_) {}
-      }, 60);
-    } catch (_) {
-      // Silently ignore; autosize is a non-critical enhancement
-    }
-  }
-
-  renderFallbackTable(container, currentRowIndex) {
-    let tableHTML = '<table class="data-table fallback-table">';
-    
-    // Header row
-    if (this.tableData && this.tableData.columns) {
-      tableHTML += '<thead><tr>';
-      this.tableData.columns.forEach(col => {
-        tableHTML += `<th>${col}</th>`;
-      });
-      tableHTML += '</tr></thead>';
-    }
-    
-    // Data rows
-    tableHTML += '<tbody>';
-    if (this.tableData && this.tableData.rows) {
-      this.tableData.rows.forEach((row, rIndex) => {
-        tableHTML += '<tr>';
-        this.tableData.columns.forEach((col, colIndex) => {
-          const cellValue = row[colIndex] || '';
-
-          // Check for cell highlighting first (highest priority)
-          const isCellHighlighted = this.isCellHighlighted(rIndex, col, colIndex);
-          // Check for row highlighting
-          const isRowHighlighted = this.isRowHighlighted(rIndex);
-          // Check for column highlighting
-          const isColumnHighlighted = this.isColumnHighlighted(col);
-
-          let style = '';
-          if (isCellHighlighted) {
-            style = this.getHighlightStyle(rIndex, col, colIndex);
-          } else if (isRowHighlighted) {
-            const highlight = this.highlightRows.find(h => h.row === rIndex);
-            let color = highlight?.color;
-            if (color === 'random') color = this.getRandomColor();
-            if (!color && window._swipecardsTheme?.primary) {
-              const rgb = hexToRgb(window._swipecardsTheme.primary);
-              const bg = toRgbaString(rgb, 0.12);
-              style = `background-color: ${bg}; border: 1px solid #111111; outline: 2px solid #111111; outline-offset: -2px; font-weight: 500;`;
-            } else {
-              color = color || '#E3F2FD';
-              style = `background-color: ${color}; border: 1px solid #111111; outline: 2px solid #111111; outline-offset: -2px; font-weight: 500;`;
-            }
-          } else if (isColumnHighlighted) {
-            const highlight = this.highlightColumns.find(h => h.column === col);
-            let color = highlight?.color;
-            if (color === 'random') color = this.getRandomColor();
-            if (!color && window._swipecardsTheme?.primary) {
-              const rgb = hexToRgb(window._swipecardsTheme.primary);
-              const bg = toRgbaString(rgb, 0.12);
-              style = `background-color: ${bg}; border: 1px solid #111111; outline: 2px solid #111111; outline-offset: -2px; font-weight: 500;`;
-            } else {
-              color = color || '#E8F5E8';
-              style = `background-color: ${color}; border: 1px solid #111111; outline: 2px solid #111111; outline-offset: -2px; font-weight: 500;`;
-            }
-          }
-
-          tableHTML += `<td style="${style}">${cellValue}</td>`;
-        });
-        tableHTML += '</tr>';
-      });
-    }
-    tableHTML += '</tbody>';
-    tableHTML += '</table>';
-    
-    container.innerHTML = tableHTML;
-  }
-  
-  isCellHighlighted(rowIndex, columnName, columnIndex) {
-    return this.highlightCells.some(highlight => {
-      const matchesRow = highlight.row === rowIndex;
-      const matchesColumn = highlight.column === columnName || highlight.column === columnIndex;
-      return matchesRow && matchesColumn;
-    });
-  }
-  
-  getHighlightStyle(rowIndex, columnName, columnIndex) {
-    const highlight = this.highlightCells.find(h => {
-      const matchesRow = h.row === rowIndex;
-      const matchesColumn = h.column === columnName || h.column === columnIndex;
-      return matchesRow && matchesColumn;
-    });
-    
-    if (highlight) {
-      let color = highlight.color;
-      if (color === 'random') color = this.getRandomColor();
-      if (!color && window._swipecardsTheme?.primary) {
-        const rgb = hexToRgb(window._swipecardsTheme.primary);
-        const bg = toRgbaString(rgb, 0.18);
-        const bd = toRgbaString(darkenRgb(rgb, 20), 0.9);
-        return `background-color: ${bg}; border: 1px solid transparent; position: relative; z-index: 2; box-shadow: inset 0 0 0 1px ${bd}; outline: 3px solid ${bd}; outline-offset: -3px;`;
-      }
-      color = color || '#FFD700';
-      const bd = this.darkenColor(color, 20);
-      return `background-color: ${color}; border: 1px solid transparent; position: relative; z-index: 2; box-shadow: inset 0 0 0 1px ${bd}; outline: 3px solid ${bd}; outline-offset: -3px;`;
-    }
-    return '';
-  }
-  
-  getHighlightStyleObject(rowIndex, columnName, columnIndex) {
-    const highlight = this.highlightCells.find(h => {
-      const matchesRow = h.row === rowIndex;
-      const matchesColumn = h.column === columnName || h.column === columnIndex;
-      return matchesRow && matchesColumn;
-    });
-    
-    if (highlight) {
-      let color = highlight.color;
-      
-      // Handle random color
-      if (color === 'random') {
-        color = this.getRandomColor();
-      }
-      
-      // Use provided color or default
-      color = color || '#FFD700'; // Gold as default when theme color is not used
-      
-      const bd = this.darkenColor(color, 20);
-      return {
-        backgroundColor: color,
-        border: '1px solid transparent',
-        boxShadow: `inset 0 0 0 1px ${bd}`,
-        outline: `3px solid ${bd}`,
-        outlineOffset: '-3px',
-        fontWeight: 'bold',
-        position: 'relative',
-        zIndex: 2,
-        boxSizing: 'border-box',
-      };
-    }
-    return null;
-  }
-  
-  isRowHighlighted(rowIndex) {
-    return this.highlightRows.some(highlight => highlight.row === rowIndex);
-  }
-  
-  isColumnHighlighted(columnName) {
-    return this.highlightColumns.some(highlight => {
-      return highlight.column === columnName || highlight.column === columnName;
-    });
-  }
-  
-  getRowHighlightStyleObject(rowIndex) {
-    const highlight = this.highlightRows.find(h => h.row === rowIndex);
-    
-    if (highlight) {
-      let color = highlight.color;
-      
-      // Handle random color
-      if (color === 'random') {
-        color = this.getRandomColor();
-      }
-      
-      // Use provided color or default light blue
-      color = color || '#E3F2FD'; // Light blue as default for rows
-      
-      return {
-        backgroundColor: color,
-        border: `1px solid #111111`,
-        outline: '2px solid #111111',
-        outlineOffset: '-2px',
-        fontWeight: '500'
-      };
-    }
-    return null;
-  }
-  
-  getColumnHighlightStyleObject(columnName) {
-    const highlight = this.highlightColumns.find(h => {
-      return h.column === columnName || h.column === columnName;
-    });
-    
-    if (highlight) {
-      let color = highlight.color;
-      
-      // Handle random color
-      if (color === 'random') {
-        color = this.getRandomColor();
-      }
-      
-      // Use provided color or default light green
-      color = color || '#E8F5E8'; // Light green as default for columns
-      
-      return {
-        backgroundColor: color,
-        border: `1px solid #111111`,
-        outline: '2px solid #111111',
-        outlineOffset: '-2px',
-        fontWeight: '500'
-      };
-    }
-    return null;
-  }
-  
-  getRandomColor() {
-    const colors = [
-      '#FFB6C1', // Light Pink
-      '#98FB98', // Pale Green
-      '#87CEEB', // Sky Blue
-      '#DDA0DD', // Plum
-      '#F0E68C', // Khaki
-      '#FFA07A', // Light Salmon
-      '#20B2AA', // Light Sea Green
-      '#FFE4B5', // Moccasin
-      '#D3D3D3', // Light Gray
-      '#F5DEB3'  // Wheat
-    ];
-    return colors[Math.floor(Math.random() * colors.length)];
-  }
-  
-  // Card-specific highlighting methods
-  isCellHighlightedForCard(rowIndex, columnName, columnIndex, highlightCells) {
-    return highlightCells.some(highlight => {
-      const matchesRow = highlight.row === rowIndex;
-      const matchesColumn = highlight.column === columnName || highlight.column === columnIndex;
-      return matchesRow && matchesColumn;
-    });
-  }
-  
-  getHighlightStyleObjectForCard(rowIndex, columnName, columnIndex, highlightCells) {
-    const highlight = highlightCells.find(h => {
-      const matchesRow = h.row === rowIndex;
-      const matchesColumn = h.column === columnName || h.column === columnIndex;
-      return matchesRow && matchesColumn;
+      blockScroll,
+      handleKeyDown,
+      handleWheel,
+      blockResizeHandle,
+      handlePanStart,
+      handlePanMove,
+      handlePanEnd,
     });
-    
-    if (highlight) {
-      let color = highlight.color;
-      if (color === 'random') color = this.getRandomColor();
 
-      // Theme-based default if no explicit color
-      if (!color && window._swipecardsTheme?.primary) {
-        const rgb = hexToRgb(window._swipecardsTheme.primary);
-        const bg = toRgbaString(rgb, 0.18);
-        const bd = toRgbaString(darkenRgb(rgb, 20), 0.9);
-        return { backgroundColor: bg, border: '1px solid transparent', boxShadow: `inset 0 0 0 1px ${bd}`, outline: `3px solid ${bd}`, outlineOffset: '-3px', fontWeight: 'bold', position: 'relative', zIndex: 2, boxSizing: 'border-box' };
+    if (this.mode === 'swipe') {
+      gridContainer.addEventListener('pointerdown', handlePointerDown, { capture: true });
+      gridContainer.addEventListener('pointerup', handlePointerUp, { passive: false, capture: true });
+      gridContainer.addEventListener('wheel', blockScroll, { passive: false, capture: true });
+      gridContainer.addEventListener('touchmove', blockScroll, { passive: false, capture: true });
+      gridContainer.addEventListener('keydown', handleKeyDown, true);
+      // Prevent header resize drag and double-click autosize in swipe mode
+      if (blockResizeHandle) {
+        gridContainer.addEventListener('mousedown', blockResizeHandle, true);
+        gridContainer.addEventListener('dblclick', blockResizeHandle, true);
       }
-      // Fallback to previous default
-      color = color || '#FFD700';
-      const bd = this.darkenColor(color, 20);
-      return { backgroundColor: color, border: '1px solid transparent', boxShadow: `inset 0 0 0 1px ${bd}`, outline: `3px solid ${bd}`, outlineOffset: '-3px', fontWeight: 'bold', position: 'relative', zIndex: 2, boxSizing: 'border-box' };
+    } else {
+      // In inspect mode, enable drag panning for desktop and touch + wheel scrolling
+      gridContainer.addEventListener('pointerdown', handlePanStart, { passive: false });
+      gridContainer.addEventListener('pointermove', handlePanMove, { passive: false });
+      window.addEventListener('pointerup', handlePanEnd, { passive: true });
+      // For older mobile browsers that fire touch events
+      gridContainer.addEventListener('touchstart', handlePanStart, { passive: false });
+      gridContainer.addEventListener('touchmove', handlePanMove, { passive: false });
+      window.addEventListener('touchend', handlePanEnd, { passive: true });
+      // Desktop wheel and trackpad support (both axes)
+      gridContainer.addEventListener('wheel', handleWheel, { passive: false });
     }
-    return null;
-  }
-  
-  isRowHighlightedForCard(rowIndex, highlightRows) {
-    return highlightRows.some(highlight => highlight.row === rowIndex);
   }
-  
-  getRowHighlightStyleObjectForCard(rowIndex, highlightRows) {
-    const highlight = highlightRows.find(h => h.row === rowIndex);
-    
-    if (highlight) {
-      let color = highlight.color;
-      if (color === 'random') color = this.getRandomColor();
-      if (!color && window._swipecardsTheme?.primary) {
-        const rgb = hexToRgb(window._swipecardsTheme.primary);
-        const bg = toRgbaString(rgb, 0.12);
-        const bd = toRgbaString(darkenRgb(rgb, 25), 0.8);
-        return { backgroundColor: bg, border: `1px solid #111111`, outline: '2px solid #111111', outlineOffset: '-2px', fontWeight: '500' };
-      }
-      color = color || '#E3F2FD';
-      return { backgroundColor: color, border: `1px solid #111111`, outline: '2px solid #111111', outlineOffset: '-2px', fontWeight: '500' };
+
+  // Expand the highlighted cell's column(s) for a given card so the
+  // highlighted content is fully visible. Safe to call anytime after
+  // the grid has been created for that card.
+  autosizeHighlightedColumnsForCard(cardIndex, rowIndex) {
+    try {
+      const slot = this.liveGrids.get(cardIndex);
+      const grid = slot?.grid;
+      if (!grid || !slot.binding?.presented) return;
+      const card = this.cards?.[cardIndex];
+      if (!card) return;
+      const tableData = this.getTableDataForCard(card);
+      if (!tableData) return;
+
+      // Respect visual trimming settings to map numeric indices correctly
+      const effectiveColumns = Array.isArray(tableData.columns)
+        ? tableData.columns.slice(0, this.tableMaxColumns || tableData.columns.length)
+        : [];
+
+      const highlights = this.getHighlightIndex(card, tableData);
+      const colIds = Array.from(highlights.cellColumns, i => effectiveColumns[i]).filter(Boolean);
+      if (colIds.length === 0) return;
+
+      // Center the row/columns, then autosize after a short delay to ensure
+      // DOM rendering has caught up.
+      try { grid.ensureIndexVisible?.(rowIndex, 'middle'); } catch (_) {}
+      colIds.forEach(id => { try { grid.ensureColumnVisible?.(id, 'middle'); } catch (_) {} });
+
+      setTimeout(() => {
+        try {
+          if (slot.grid === grid) grid.autoSizeColumns(colIds, false);
+        } catch (_) {}
+      }, 60);
+    } catch (_) {
+      // Silently ignore; autosize is a non-critical enhancement
     }
-    return null;
-  }
-  
-  isColumnHighlightedForCard(columnName, highlightColumns) {
-    return highlightColumns.some(highlight => {
-      return highlight.column === columnName || highlight.column === columnName;
-    });
   }
-  
-  getColumnHighlightStyleObjectForCard(columnName, highlightColumns) {
-    const highlight = highlightColumns.find(h => {
-      return h.column === columnName || h.column === columnName;
+
+  // Virtual-scrolling table shown until (or instead of) an AG-Grid, centered
+  // like the grid. Returns the VirtualTable, to be destroyed with its slot.
+  renderFallbackTable(container, currentRowIndex, tableData = this.tableData, card = null) {
+    const highlights = card
+      ? this.getHighlightIndex(card, tableData)
+      : new HighlightIndex(this.highlightCells, this.highlightRows, this.highlightColumns, tableData?.columns || []);
+    const columns = Array.isArray(tableData?.columns)
+      ? tableData.columns.slice(0, this.tableMaxColumns || tableData.columns.length)
+      : [];
+    const rowCount = this.getTableRowCount(tableData);
+    const centerRow = card?.center_table_row ?? this.centerTableRow ?? currentRowIndex ?? 0;
+    const centerColumn = card?.center_table_column ?? this.centerTableColumn;
+    const sampleStart = clamp(centerRow - Math.floor(VIRTUAL_SAMPLE_ROWS / 2), 0, Math.max(0, rowCount - VIRTUAL_SAMPLE_ROWS));
+    const sampleRows = Array.from({ length: Math.min(VIRTUAL_SAMPLE_ROWS, rowCount) }, (_, i) => sampleStart + i);
+
+    // Windowed mode: ask for the blocks scrolled into view, one request at a time
+    let waiting = false;
+    const onRowsNeeded = tableData?.blocks
+      ? (start, end) => {
+          if (waiting || this.getMissingTableBlocks(tableData, start, end).length === 0) return;
+          waiting = true;
+          this.fetchTableRows(tableData, start, end, () => {
+            waiting = false;
+            table.refresh();
+          });
+        }
+      : null;
+
+    const table = new VirtualTable(container, {
+      columns,
+      rowCount,
+      cell: (rowIndex, colIndex) => this.getTableCell(tableData, rowIndex, colIndex),
+      highlights,
+      rowHeight: Math.max(24, Math.round((this.tableFontSize || 14) + 12)),
+      fontSize: this.tableFontSize || 14,
+      sampleRows,
+      onRowsNeeded,
     });
-    
-    if (highlight) {
-      let color = highlight.color;
-      if (color === 'random') color = this.getRandomColor();
-      if (!color && window._swipecardsTheme?.primary) {
-        const rgb = hexToRgb(window._swipecardsTheme.primary);
-        const bg = toRgbaString(rgb, 0.12);
-        const bd = toRgbaString(darkenRgb(rgb, 25), 0.8);
-        return { backgroundColor: bg, border: `1px solid #111111`, outline: '2px solid #111111', outlineOffset: '-2px', fontWeight: '500' };
-      }
-      color = color || '#E8F5E8';
-      return { backgroundColor: color, border: `1px solid #111111`, outline: '2px solid #111111', outlineOffset: '-2px', fontWeight: '500' };
-    }
-    return null;
+    table.scrollToCell(centerRow, typeof centerColumn === 'number' ? centerColumn : columns.indexOf(centerColumn));
+    return table;
   }
   
   renderPills(pills) {
@@ -1460,17 +2631,6 @@ class SwipeCards {
     return div.innerHTML;
   }
   
-  darkenColor(color, percent) {
-    // Simple color darkening function
-    const num = parseInt(color.replace("#", ""), 16);
-    const amt = Math.round(2.55 * percent);
-    const R = (num >> 16) - amt;
-    const G = (num >> 8 & 0x00FF) - amt;
-    const B = (num & 0x0000FF) - amt;
-    return "#" + (0x1000000 + (R < 255 ? R < 1 ? 0 : R : 255) * 0x10000 +
-      (G < 255 ? G < 1 ? 0 : G : 255) * 0x100 +
-      (B < 255 ? B < 1 ? 0 : B : 255)).toString(16).slice(1);
-  }
   
   bindEvents() {
     // Always bind to the first card in the stack (topmost/front card)
@@ -1650,11 +2810,12 @@ class SwipeCards {
       return;
     }
     if (this.isAnimating) return;
-    this.isAnimating = true;
     const topCard = this.container.querySelector('.swipe-card:first-child');
     const card = this.cards[this.currentIndex];
     
     if (topCard && card) {
+      const span = perfMetrics.start('swipe_to_paint');
+      this.isAnimating = true;
       topCard.classList.add('swiped-right');
       
       this.swipedCards.push({ index: this.currentIndex, action: 'right' });
@@ -1662,17 +2823,12 @@ class SwipeCards {
 
       setTimeout(() => {
         this.currentIndex++;
-        topCard.remove(); // Remove the swiped card from the DOM
-        this.addNewCardToStack(); // Add a new card to the bottom
-        this.updateCardStackClasses();
-        this.updateSwipeCounter();
-        this.bindEvents();
-        if (this.currentIndex >= this.cards.length) {
-          this.render();
-        }
-        this.sendResults();
+        // Drops the swiped card, promotes the rest and appends one card
+        this.syncStack();
+        this.reportAction();
         this.isAnimating = false;
         updateFrameHeightDebounced();
+        perfMetrics.endAfterPaint(span);
       }, 300);
     }
   }
@@ -1683,11 +2839,12 @@ class SwipeCards {
       return;
     }
     if (this.isAnimating) return;
-    this.isAnimating = true;
     const topCard = this.container.querySelector('.swipe-card:first-child');
     const card = this.cards[this.currentIndex];
     
     if (topCard && card) {
+      const span = perfMetrics.start('swipe_to_paint');
+      this.isAnimating = true;
       topCard.classList.add('swiped-left');
 
       this.swipedCards.push({ index: this.currentIndex, action: 'left' });
@@ -1695,17 +2852,12 @@ class SwipeCards {
 
       setTimeout(() => {
         this.currentIndex++;
-        topCard.remove();
-        this.addNewCardToStack();
-        this.updateCardStackClasses();
-        this.updateSwipeCounter();
-        this.bindEvents();
-        if (this.currentIndex >= this.cards.length) {
-          this.render();
-        }
-        this.sendResults();
+        // Drops the swiped card, promotes the rest and appends one card
+        this.syncStack();
+        this.reportAction();
         this.isAnimating = false;
         updateFrameHeightDebounced();
+        perfMetrics.endAfterPaint(span);
       }, 300);
     }
   }
@@ -1732,10 +2884,9 @@ class SwipeCards {
       cardIndex: this.currentIndex
     };
 
-    this.render();
-    this.bindEvents();
-    this.updateSwipeCounter();
-    this.sendResults();
+    // Restores the card from the recycle bin when possible
+    this.syncStack();
+    this.reportAction();
 
     const topCard = this.container.querySelector('.swipe-card:first-child');
     if (topCard) {
@@ -1753,64 +2904,11 @@ class SwipeCards {
     }
   }
 
-  addNewCardToStack() {
-    const stack = this.container.querySelector('.cards-stack');
-    const nextCardIndex = this.currentIndex + 4; // The 5th card from the new current
-
-    if (nextCardIndex < this.cards.length && stack) {
-      const card = this.cards[nextCardIndex];
-      let cardContent = '';
-
-      if (this.displayMode === 'table' && card.data) {
-        cardContent = this.renderTableCard(card, nextCardIndex);
-      } else {
-        cardContent = this.renderImageCard(card);
-      }
-
-      const newCardHTML = `
-        <div class="swipe-card" data-index="${nextCardIndex}">
-          ${cardContent}
-          <div class="action-indicator like">✔️</div>
-          <div class="action-indicator pass">❌</div>
-        </div>
-      `;
-      stack.insertAdjacentHTML('beforeend', newCardHTML);
-
-      // Ensure new table cards are centered after being added to the DOM
-      if (this.displayMode === 'table' && card.data) {
-        setTimeout(() => {
-          this.initializeAgGrid(nextCardIndex, card.row_index);
-        }, 20);
-      }
-      updateFrameHeightDebounced();
-    }
-  }
-
   updateCardStackClasses() {
-    const cards = this.container.querySelectorAll('.swipe-card');
+    const cards = this.container.querySelectorAll('.cards-stack .swipe-card[data-index]');
     cards.forEach((card, i) => {
       card.classList.remove('card-front', 'card-second', 'card-third');
       
-      // Update visibility for table cards
-      if (this.displayMode === 'table') {
-        const cardIndex = parseInt(card.getAttribute('data-index'));
-        const gridContainer = card.querySelector(`#ag-grid-${cardIndex}`);
-        
-        if (gridContainer) {
-          if (i <= 2) {
-            // Show the first 3 cards
-            gridContainer.style.visibility = 'visible';
-            gridContainer.style.opacity = '1';
-            gridContainer.style.zIndex = '';
-          } else {
-            // Hide cards beyond the third position but keep them rendered
-            gridContainer.style.visibility = 'hidden';
-            gridContainer.style.opacity = '0';
-            gridContainer.style.zIndex = '-1';
-          }
-        }
-      }
-      
       if (i === 0) {
         card.classList.add('card-front');
         // Re-center the new front card if it needs recentering
@@ -1827,15 +2925,10 @@ class SwipeCards {
     if (this.displayMode !== 'table') return;
     
     const cardIndex = parseInt(cardElement.getAttribute('data-index'));
-    const gridContainer = cardElement.querySelector(`#ag-grid-${cardIndex}`);
     
-    // Simply ensure the grid is visible when it becomes the front card
-    if (gridContainer) {
-      gridContainer.style.visibility = 'visible';
-      gridContainer.style.opacity = '1';
-      gridContainer.style.zIndex = '';
-      console.log(`Made card ${cardIndex} visible as front card`);
-      // Also immediately autosize and center highlighted columns for this front card
+    // A lookahead grid that becomes the front card is already live
+    if (this.liveGrids.has(cardIndex)) {
+      // Immediately autosize and center highlighted columns for this front card
       try {
         const card = this.cards?.[cardIndex];
         if (card) {
@@ -1854,25 +2947,168 @@ class SwipeCards {
   updateSwipeCounter() {
     const swipeCounter = this.container.querySelector('.swipe-counter');
     if (swipeCounter) {
-      swipeCounter.textContent = `Swiped: ${this.swipedCards.length} | Remaining: ${this.cards.length - this.currentIndex}`;
-      console.log('Updated counter:', swipeCounter.textContent);
+      const remaining = `${this.deckLength() - this.currentIndex}${this.totalCards === null && this.hasMoreCards() ? '+' : ''}`;
+      swipeCounter.textContent = this.currentIndex >= this.deckLength() && !this.hasMoreCards()
+        ? `Total swiped: ${this.swipedCards.length}`
+        : `Swiped: ${this.swipedCards.length} | Remaining: ${remaining}`;
+      debugLog('Updated counter:', swipeCounter.textContent);
     } else {
       console.warn('Swipe counter element not found');
     }
   }
   
+  // Report a swipe or back action according to `reportMode`. Every value
+  // carries the complete state, so deferred actions are simply coalesced.
+  reportAction() {
+    if (this.resultEncoding === 'delta' && this.lastAction) {
+      this.resultEvents.push({ seq: ++this.resultSeq, ...this.lastAction });
+    }
+    this.unreportedActions++;
+    const done = this.currentIndex >= this.cards.length && !this.hasMoreCards();
+    switch (this.reportMode) {
+      case 'batch':
+        if (done || this.unreportedActions >= this.reportBatchSize) this.sendResults();
+        break;
+      case 'idle':
+        clearTimeout(this._reportTimer);
+        if (done) {
+          this.sendResults();
+        } else {
+          this._reportTimer = setTimeout(() => this.sendResults(), this.reportIdleMs);
+        }
+        break;
+      case 'complete':
+        if (done) this.sendResults();
+        break;
+      case 'manual':
+        this.updateCommitButton();
+        break;
+      default:
+        this.sendResults();
+    }
+  }
+
+  // Show the number of unsent actions on the "Submit" button (manual mode)
+  updateCommitButton() {
+    const commitBtn = this.container.querySelector('.commit-btn');
+    if (!commitBtn) return;
+    commitBtn.hidden = this.reportMode !== 'manual';
+    commitBtn.disabled = this.unreportedActions === 0;
+    commitBtn.textContent = this.unreportedActions > 0 ? `Submit (${this.unreportedActions})` : 'Submit';
+  }
+
+  // Drop delta events Python has folded into its log
+  acknowledgeResults(ack) {
+    if (!ack || ack.stream !== this.resultStream) return;
+    this.resultEvents = this.resultEvents.filter(event => event.seq > ack.seq);
+  }
+
   sendResults() {
+    clearTimeout(this._reportTimer);
+    this._reportTimer = null;
+    this.unreportedActions = 0;
+    this.updateCommitButton();
     const results = {
-      swipedCards: this.swipedCards.map(({ index, action }) => ({ index, action })),
       lastAction: this.lastAction,
       totalSwiped: this.swipedCards.length,
-      remainingCards: this.cards.length - this.currentIndex,
+      remainingCards: this.deckLength() - this.currentIndex,
     };
+    if (this.cardStream !== null) {
+      // Python sends the window around this position with the next render
+      results.cardPosition = this.currentIndex;
+      clearTimeout(this._cardRequestTimer);
+      this._cardRequestTimer = null;
+    }
+    if (this.resultEncoding === 'delta') {
+      // Only actions Python has not acknowledged yet
+      results.stream = this.resultStream;
+      results.seq = this.resultSeq;
+      results.events = this.resultEvents.slice();
+    } else {
+      results.swipedCards = this.swipedCards.map(({ index, action }) => ({ index, action }));
+    }
+    // Keep asking for row blocks until they arrive, so a swipe in between
+    // does not drop the request
+    if (this.outstandingBlocks.size > 0) {
+      results.tableRequests = Array.from(this.outstandingBlocks.values());
+    }
+    if (perfMetrics.enabled) {
+      results.metrics = perfMetrics.snapshot();
+    }
+    this.lastValue = results;
     sendValue(results);
   }
 }
 
 let swipeCards = null;
+let lastShellSignature = null;
+let windowListenersRegistered = false;
+let pendingBlobRender = null; // Render waiting for blobs from IndexedDB or Python
+
+// Ask Python for blobs the cache does not hold. The last results are repeated
+// so the value returned to the script does not change, and undelivered
+// actions are not reported early.
+function requestBlobs(hashes) {
+  const needBlobs = { id: Math.random().toString(36).slice(2, 10), hashes };
+  sendValue({ ...(swipeCards && swipeCards.lastValue), needBlobs });
+}
+
+// Identity of a card's content, used to find cards that changed between renders
+function cardSignature(card) {
+  return JSON.stringify(card);
+}
+
+// Signature of the settings and table payloads without the row data. When it
+// changes, the whole stack is re-rendered; row blocks alone are merged.
+function renderSignature(settings, tableData, datasets) {
+  const shape = (payload) => {
+    if (!payload) return null;
+    const { rows, blocks, column_data, length, ...meta } = payload;
+    return meta;
+  };
+  const datasetShapes = {};
+  Object.keys(datasets || {}).sort().forEach(id => {
+    datasetShapes[id] = shape(datasets[id]);
+  });
+  return JSON.stringify({ settings, table_data: shape(tableData), datasets: datasetShapes });
+}
+
+// Window listeners are registered once and act on the current instance
+function registerWindowListeners(container) {
+  if (windowListenersRegistered) return;
+  windowListenersRegistered = true;
+
+  // Observe size changes to keep iframe height in sync
+  try {
+    const ro = new ResizeObserver(() => updateFrameHeightDebounced());
+    ro.observe(document.documentElement);
+    ro.observe(document.body);
+    ro.observe(container);
+    window._swipecards_resizeObserver = ro;
+  } catch (e) {
+    // ResizeObserver may not be available in very old browsers
+  }
+
+  // Listen to viewport changes
+  window.addEventListener('resize', () => {
+    updateFrameHeightDebounced();
+    try {
+      // Nudge AG-Grid instances to recompute viewport if present,
+      // but keep column widths as measured (no forced stretch)
+      if (swipeCards && swipeCards.liveGrids) {
+        swipeCards.liveGrids.forEach(({ grid }) => {
+          try {
+            const api = grid && (grid.api || grid);
+            if (api && api.onGridSizeChanged) {
+              api.onGridSizeChanged();
+            }
+          } catch (e) {}
+        });
+      }
+    } catch (e) {}
+  }, { passive: true });
+  window.addEventListener('orientationchange', updateFrameHeightDebounced, { passive: true });
+}
 
 /**
  * The component's render function. This will be called immediately after
@@ -1880,13 +3116,50 @@ let swipeCards = null;
  * component gets new data from Python.
  */
 function onRender(event) {
+  const args = event.detail.args;
+  perfMetrics.configure(args.metrics);
+  // Ends once the arguments are rendered (after blobs are loaded, if any)
+  const span = perfMetrics.start('onRender');
+  if (!args.blob_refs) {
+    pendingBlobRender = null;
+    renderComponent(args, event.detail.theme);
+    perfMetrics.end(span);
+    return;
+  }
+  // Client cache: resolve blob references from memory, then IndexedDB, and
+  // ask Python for the rest
+  blobCache.pin(args.blob_refs);
+  blobCache.putAll(args.blobs);
+  const missing = args.blob_refs.filter(hash => !blobCache.has(hash));
+  if (missing.length === 0) {
+    pendingBlobRender = null;
+    renderComponent(blobCache.inflateArgs(args), event.detail.theme);
+    perfMetrics.end(span);
+    return;
+  }
+  pendingBlobRender = event;
+  blobCache.load(missing).then(stillMissing => {
+    if (pendingBlobRender !== event) return; // Superseded by a newer render
+    if (stillMissing.length > 0) {
+      requestBlobs(stillMissing);
+      return;
+    }
+    pendingBlobRender = null;
+    renderComponent(blobCache.inflateArgs(args), event.detail.theme);
+    perfMetrics.end(span);
+  });
+}
+
+function renderComponent(args, theme) {
   const {
     cards = [],
     table_data = null,
+    datasets = {},
     highlight_cells = [],
     highlight_rows = [],
     highlight_columns = [],
     display_mode = 'cards',
+    ag_grid_packaged = false,
     centerTableRow = null,
     centerTableColumn = null,
     view = 'mobile',
@@ -1895,161 +3168,64 @@ function onRender(event) {
     table_font_size = 14,
     table_max_rows = null,
     table_max_columns = null,
-    last_card_message = null
-  } = event.detail.args;
+    last_card_message = null,
+    report_mode = 'immediate',
+    report_batch_size = 10,
+    report_idle_ms = 1500,
+    result_encoding = 'full',
+    result_ack = null,
+    image_prefetch = 5,
+    image_prefetch_concurrency = 3,
+    card_window = null
+  } = args;
+
+  // Theme, border, font size and color overrides; only real changes are
+  // written, batched in one animation frame
+  themeManager.update({
+    theme: theme || null,
+    colors: colors && typeof colors === 'object' ? colors : null,
+    showBorder: show_border,
+    tableFontSize: table_font_size,
+  });
 
-  // If Streamlit theme is provided, apply it directly first
-  if (event.detail && event.detail.theme) {
-    applyStreamlitTheme(event.detail.theme);
+  // Fetch the grid library in the background; cards render meanwhile
+  // (from the packaged copy first if there is one)
+  agGridPackaged = !!ag_grid_packaged;
+  if (display_mode === 'table') {
+    loadAgGrid().catch(() => {});
   }
 
-  // Apply theme detection immediately
-  detectAndApplyTheme();
-
-  // Set up theme monitoring for dynamic updates
-  setupThemeMonitoring();
-
-  // Apply card border preference
-  const borderValue = show_border ? '1px solid var(--card-border-color)' : 'none';
-  document.documentElement.style.setProperty('--card-border', borderValue);
-  // Apply table font size
-  if (table_font_size) {
-    document.documentElement.style.setProperty('--table-font-size', `${table_font_size}px`);
+  // Reruns update the live instance: swipe position, DOM and grids are kept
+  // and only what changed is re-rendered
+  const finalMessage = last_card_message ?? 'No more cards to swipe';
+  const settings = {
+    highlightCells: highlight_cells,
+    highlightRows: highlight_rows,
+    highlightColumns: highlight_columns,
+    centerTableRow: centerTableRow,
+    centerTableColumn: centerTableColumn,
+    lastCardMessage: finalMessage,
+    tableFontSize: table_font_size ?? 14,
+    tableMaxRows: table_max_rows,
+    tableMaxColumns: table_max_columns,
+    reportMode: report_mode,
+    reportBatchSize: report_batch_size,
+    reportIdleMs: report_idle_ms,
+    resultEncoding: result_encoding,
+    imagePrefetch: image_prefetch,
+    imagePrefetchConcurrency: image_prefetch_concurrency,
+  };
+  const signature = renderSignature(settings, table_data, datasets);
+  const shellSignature = JSON.stringify([display_mode, view]);
+  if (swipeCards) {
+    swipeCards.acknowledgeResults(result_ack);
   }
-  // Apply button theming via CSS variables using Streamlit theme
-  try {
-    const root = document.documentElement.style;
-    const textCol = (window._swipecardsTheme?.text || '').trim() ||
-                    getComputedStyle(document.documentElement).getPropertyValue('--text-color')?.trim();
-    
-    // Get theme colors from multiple sources
-    let primaryColor = window._swipecardsTheme?.primary;
-    let backgroundColor = window._swipecardsTheme?.background || 
-                         getComputedStyle(document.documentElement).getPropertyValue('--background-color')?.trim();
-    let secondaryBgColor = window._swipecardsTheme?.secondaryBackground || 
-                          getComputedStyle(document.documentElement).getPropertyValue('--secondary-background-color')?.trim();
-    
-    // Try to get colors from parent Streamlit app if not available
-    if (!primaryColor || !backgroundColor) {
-      try {
-        const parentDoc = window.parent.document;
-        const parentStyle = window.parent.getComputedStyle(parentDoc.documentElement);
-        
-        if (!primaryColor) {
-          primaryColor = parentStyle.getPropertyValue('--primary-color')?.trim();
-        }
-        if (!backgroundColor) {
-          backgroundColor = parentStyle.getPropertyValue('--background-color')?.trim();
-        }
-        if (!secondaryBgColor) {
-          secondaryBgColor = parentStyle.getPropertyValue('--secondary-background-color')?.trim();
-        }
-      } catch (e) {
-        console.log('Could not access parent document for theme colors');
-      }
-    }
-    
-    // Determine if we're in dark mode
-    const isDark = document.documentElement.getAttribute('data-theme') === 'dark';
-    
-    if (primaryColor) {
-      const base = hexToRgb(primaryColor) || { r: 102, g: 126, b: 234 };
-      
-      // Create theme-appropriate button colors
-      const likeBg = toRgbaString(base, 1);
-      const likeFg = bestTextOn(base);
-      
-      // For pass button, use a complementary color that works with the theme
-      const passRgb = isDark ? lightenRgb(base, 20) : darkenRgb(base, 20);
-      const passBg = toRgbaString(passRgb, 1);
-      const passFg = bestTextOn(passRgb);
-      
-      // For back button, use secondary background with contrasting text
-      const backBg = secondaryBgColor || (isDark ? '#262730' : '#ffffff');
-      const backFg = textCol || (isDark ? '#fafafa' : '#262730');
-      const borderCol = textCol || (isDark ? '#fafafa' : '#262730');
-      
-      root.setProperty('--btn-like-bg', likeBg);
-      root.setProperty('--btn-like-fg', likeFg);
-      root.setProperty('--btn-pass-bg', passBg);
-      root.setProperty('--btn-pass-fg', passFg);
-      root.setProperty('--btn-back-bg', backBg);
-      root.setProperty('--btn-back-fg', backFg);
-      root.setProperty('--btn-border', borderCol);
-    } else {
-      // Fallback: use theme-appropriate colors based on background
-      const borderCol = textCol || (isDark ? '#fafafa' : '#262730');
-      const backBg = secondaryBgColor || backgroundColor || (isDark ? '#262730' : '#F0F2F6');
-      const backFg = textCol || (isDark ? '#fafafa' : '#262730');
-      
-      // Use consistent theme-based colors for all buttons
-      const buttonBg = isDark ? '#262730' : '#F0F2F6';
-      const buttonFg = isDark ? '#fafafa' : '#262730';
-      
-      root.setProperty('--btn-like-bg', buttonBg);
-      root.setProperty('--btn-like-fg', buttonFg);
-      root.setProperty('--btn-pass-bg', buttonBg);
-      root.setProperty('--btn-pass-fg', buttonFg);
-      root.setProperty('--btn-back-bg', buttonBg);
-      root.setProperty('--btn-back-fg', buttonFg);
-      root.setProperty('--btn-border', borderCol);
-    }
-  } catch (e) {}
-
-  // Apply explicit color overrides from Python after theme and defaults
-  try {
-    if (colors && typeof colors === 'object') {
-      const root = document.documentElement.style;
-
-      // Helper to safely read nested values: a.b.c or fallback keys
-      const get = (obj, path) => {
-        try {
-          return path.split('.').reduce((o, k) => (o && o[k] !== undefined ? o[k] : undefined), obj);
-        } catch (_) { return undefined; }
-      };
-
-      // Common top-level or nested mappings for buttons
-      const likeBg = get(colors, 'buttons.like.bg') ?? get(colors, 'like.bg') ?? colors.like_bg ?? colors.likeBg;
-      const likeFg = get(colors, 'buttons.like.fg') ?? get(colors, 'like.fg') ?? colors.like_fg ?? colors.likeFg;
-      const passBg = get(colors, 'buttons.pass.bg') ?? get(colors, 'pass.bg') ?? colors.pass_bg ?? colors.passBg;
-      const passFg = get(colors, 'buttons.pass.fg') ?? get(colors, 'pass.fg') ?? colors.pass_fg ?? colors.passFg;
-      const backBg = get(colors, 'buttons.back.bg') ?? get(colors, 'back.bg') ?? colors.back_bg ?? colors.backBg;
-      const backFg = get(colors, 'buttons.back.fg') ?? get(colors, 'back.fg') ?? colors.back_fg ?? colors.backFg;
-      const btnBorder = get(colors, 'buttons.border') ?? colors.btn_border ?? colors.button_border ?? colors.border;
-
-      if (likeBg) root.setProperty('--btn-like-bg', likeBg);
-      if (likeFg) root.setProperty('--btn-like-fg', likeFg);
-      if (passBg) root.setProperty('--btn-pass-bg', passBg);
-      if (passFg) root.setProperty('--btn-pass-fg', passFg);
-      if (backBg) root.setProperty('--btn-back-bg', backBg);
-      if (backFg) root.setProperty('--btn-back-fg', backFg);
-      if (btnBorder) root.setProperty('--btn-border', btnBorder);
-
-      // General colors
-      const cardBg = colors.card_bg ?? colors.cardBg;
-      const bg = colors.background_color ?? colors.backgroundColor;
-      const secondaryBg = colors.secondary_background_color ?? colors.secondaryBackgroundColor;
-      const text = colors.text_color ?? colors.textColor;
-
-      if (bg) {
-        root.setProperty('--background-color', bg);
-        root.setProperty('--bg-color', bg);
-      }
-      if (secondaryBg) {
-        root.setProperty('--secondary-background-color', secondaryBg);
-        // Only override card bg with secondary if explicit card_bg not set
-        if (!cardBg) root.setProperty('--card-bg', secondaryBg);
-      }
-      if (cardBg) root.setProperty('--card-bg', cardBg);
-      if (text) {
-        root.setProperty('--text-color', text);
-        root.setProperty('--text-primary', text);
-      }
-    }
-  } catch (e) {
-    console.warn('Failed to apply explicit color overrides', e);
+  if (swipeCards && (cards.length > 0 || card_window) && shellSignature === lastShellSignature &&
+      swipeCards.update(cards, table_data, datasets, settings, signature, card_window)) {
+    return;
   }
-  
+  lastShellSignature = shellSignature;
+
   const root = document.getElementById('root');
   root.innerHTML = '<div class="swipe-container"></div>';
 
@@ -2071,7 +3247,9 @@ function onRender(event) {
     container.classList.add('desktop-view');
   }
   
-  if (cards.length === 0) {
+  if (cards.length === 0 && (!card_window || card_window.total === 0)) {
+    if (swipeCards) swipeCards.destroy();
+    swipeCards = null;
     container.innerHTML = `
       <div class="no-more-cards">
         <h3>📱 No Cards Available</h3>
@@ -2084,8 +3262,8 @@ function onRender(event) {
     return;
   }
   
-  // Always create a fresh instance to avoid state persistence issues
-  const finalMessage = last_card_message ?? 'No more cards to swipe';
+  // First render, new layout or a replaced deck: start a fresh instance
+  if (swipeCards) swipeCards.destroy();
   swipeCards = new SwipeCards(
     container,
     cards,
@@ -2101,79 +3279,21 @@ function onRender(event) {
       tableFontSize: table_font_size,
       tableMaxRows: table_max_rows,
       tableMaxColumns: table_max_columns,
+      datasets: datasets,
+      reportMode: report_mode,
+      reportBatchSize: report_batch_size,
+      reportIdleMs: report_idle_ms,
+      resultEncoding: result_encoding,
+      imagePrefetch: image_prefetch,
+      imagePrefetchConcurrency: image_prefetch_concurrency,
+      cardWindow: card_window,
+      renderSignature: signature,
     }
   );
   
   // Update frame height now and observe for subsequent changes
   updateFrameHeightImmediate();
-
-  // Observe size changes to keep iframe height in sync
-  try {
-    if (!window._swipecards_resizeObserver) {
-      const ro = new ResizeObserver(() => updateFrameHeightDebounced());
-      ro.observe(document.documentElement);
-      ro.observe(document.body);
-      ro.observe(container);
-      window._swipecards_resizeObserver = ro;
-    }
-  } catch (e) {
-    // ResizeObserver may not be available in very old browsers
-  }
-
-  // Listen to viewport changes
-  window.addEventListener('resize', () => {
-    updateFrameHeightDebounced();
-    try {
-      // Nudge AG-Grid instances to recompute viewport if present,
-      // but keep column widths as measured (no forced stretch)
-      if (window.swipeCards && window.swipeCards.agGridInstances) {
-        window.swipeCards.agGridInstances.forEach((grid) => {
-          try {
-            if (grid && grid.api && grid.api.onGridSizeChanged) {
-              grid.api.onGridSizeChanged();
-            }
-          } catch (e) {}
-        });
-      }
-    } catch (e) {}
-  }, { passive: true });
-  window.addEventListener('orientationchange', updateFrameHeightDebounced, { passive: true });
-}
-
-// Setup theme monitoring for dynamic theme changes
-function setupThemeMonitoring() {
-  // Monitor system color scheme changes
-  const mediaQuery = window.matchMedia('(prefers-color-scheme: dark)');
-  mediaQuery.addListener(detectAndApplyTheme);
-  
-  // Monitor parent document changes (for Streamlit theme switching)
-  try {
-    const parentDoc = window.parent.document;
-    const observer = new MutationObserver(() => {
-      setTimeout(detectAndApplyTheme, 100); // Small delay to let changes settle
-    });
-    
-    // Watch for class changes on documentElement and body
-    observer.observe(parentDoc.documentElement, {
-      attributes: true,
-      attributeFilter: ['class', 'data-theme', 'style']
-    });
-    observer.observe(parentDoc.body, {
-      attributes: true,
-      attributeFilter: ['class', 'style']
-    });
-    
-    // Watch for style changes on main app container
-    const appContainer = parentDoc.querySelector('.stApp, .main, [data-testid="stAppViewContainer"]');
-    if (appContainer) {
-      observer.observe(appContainer, {
-        attributes: true,
-        attributeFilter: ['style', 'class']
-      });
-    }
-  } catch (e) {
-    console.log('Could not set up theme monitoring:', e);
-  }
+  registerWindowListeners(container);
 }
 
 // Render the component whenever python send a "render event"
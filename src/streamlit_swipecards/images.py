@@ -0,0 +1,277 @@
+"""
+Server-side image variants for image cards.
+
+Card images given as local file paths, raw bytes or large inline data URIs
+are resized once into a display variant (``image``), a smaller ``thumbnail``
+used in the card's ``srcset`` and a tiny blurred ``placeholder``, all sent as
+compact data URIs. Variants are keyed by a hash of the image content and kept
+in memory and, if a cache directory is configured, on disk.
+
+Only still raster images are processed; JPEG sources stay JPEG and all other
+formats are re-encoded losslessly as PNG. SVG, animated images and anything
+Pillow cannot decode are passed through unchanged, as are all images when
+Pillow is not installed. Remote URLs are never fetched.
+"""
+import base64
+import hashlib
+import io
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple, Union
+
+from .blobs import text_digest
+from .cache import DatasetCache
+from .disk_cache import _write_atomic, file_digest
+
+# Widths matching the `srcset` built by the frontend (480w / 800w)
+_DISPLAY_WIDTH = 800
+_THUMBNAIL_WIDTH = 480
+_PLACEHOLDER_WIDTH = 24
+_JPEG_QUALITY = 82
+# Inline data URIs smaller than this are sent as they are
+_MIN_INLINE_BYTES = 32 * 1024
+# Raster formats processed, by data URI MIME type and file extension
+_RASTER_MIME_TYPES = {
+    "image/jpeg", "image/jpg", "image/pjpeg", "image/png", "image/webp", "image/gif", "image/bmp", "image/tiff",
+}
+_RASTER_EXTENSIONS = {".jpg", ".jpeg", ".jfif", ".png", ".webp", ".gif", ".bmp", ".tif", ".tiff"}
+# Bump when the variant sizes or encoding change
+_FORMAT_VERSION = 2
+_MAX_WORKERS = 8
+
+# Variants by content hash (and file identity -> variants for local paths)
+_variant_cache = DatasetCache(max_entries=512)
+
+
+def _pillow():
+    try:
+        from PIL import Image, ImageFilter, ImageOps
+    except ImportError:
+        return None
+    return Image, ImageFilter, ImageOps
+
+
+def _image_source(image) -> Optional[Tuple[str, Union[str, bytes]]]:
+    """
+    Classify a card's ``image`` value.
+
+    Returns:
+        tuple or None: ``("file", path)``, ``("data", uri)`` or ``("bytes", data)``,
+        or None for values that are sent unchanged (URLs, small or non-raster
+        data URIs, files that are not raster images)
+    """
+    if isinstance(image, (bytes, bytearray, memoryview)):
+        return "bytes", bytes(image)
+    if not isinstance(image, str) or not image:
+        return None
+    if image.startswith("data:"):
+        # Only the header is sliced: the payload is decoded on a cache miss
+        comma = image.find(",")
+        header = image[5:comma].lower() if comma > 0 else ""
+        if ";base64" not in header or header.split(";", 1)[0] not in _RASTER_MIME_TYPES:
+            return None
+        if (len(image) - comma - 1) * 3 // 4 < _MIN_INLINE_BYTES:
+            return None
+        return "data", image
+    if "://" in image:
+        return None
+    if os.path.splitext(image)[1].lower() in _RASTER_EXTENSIONS and os.path.isfile(image):
+        return "file", image
+    return None
+
+
+def _decode_data_uri(uri: str) -> bytes:
+    """Payload of a base64 data URI (empty if malformed, so it is passed through)."""
+    try:
+        return base64.b64decode(uri[uri.find(",") + 1:])
+    except ValueError:
+        return b""
+
+
+def _data_uri(img, fmt: str, quality: int = _JPEG_QUALITY) -> str:
+    buffer = io.BytesIO()
+    if fmt == "JPEG":
+        img.convert("RGB").save(buffer, format="JPEG", quality=quality, optimize=True)
+        mime = "image/jpeg"
+    else:
+        img.save(buffer, format="PNG", optimize=True)
+        mime = "image/png"
+    return f"data:{mime};base64,{base64.b64encode(buffer.getvalue()).decode('ascii')}"
+
+
+def _build_variants(data: bytes) -> Dict[str, str]:
+    """
+    Resize one image into its display, thumbnail and placeholder variants.
+
+    Args:
+        data: Encoded image
+
+    Returns:
+        dict: ``image``, ``thumbnail`` and ``placeholder`` data URIs, or an empty
+        dict if the image is left unchanged (not decodable, animated)
+    """
+    Image, ImageFilter, ImageOps = _pillow()
+    try:
+        source = Image.open(io.BytesIO(data))
+    except Image.UnidentifiedImageError:
+        return {}
+    with source:
+        if getattr(source, "is_animated", False):
+            return {}
+        lossy = source.format == "JPEG"
+        img = ImageOps.exif_transpose(source)
+        img.load()
+    has_alpha = img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info)
+    fmt = "JPEG" if lossy and not has_alpha else "PNG"
+    img = img.convert("RGBA" if has_alpha else "RGB")
+
+    def resized(width: int):
+        if img.width <= width:
+            return img
+        height = max(1, round(img.height * width / img.width))
+        return img.resize((width, height), Image.LANCZOS)
+
+    placeholder = resized(_PLACEHOLDER_WIDTH).filter(ImageFilter.GaussianBlur(1))
+    return {
+        "image": _data_uri(resized(_DISPLAY_WIDTH), fmt),
+        "thumbnail": _data_uri(resized(_THUMBNAIL_WIDTH), fmt),
+        "placeholder": _data_uri(placeholder, "JPEG", quality=50),
+    }
+
+
+def _variants_for_digest(digest: str, data_loader, cache_dir: Optional[str]) -> Dict[str, str]:
+    """Return the variants of an image, from memory, disk or freshly built."""
+
+    def load():
+        path = None
+        if cache_dir:
+            path = os.path.join(cache_dir, "images", f"{digest}-v{_FORMAT_VERSION}.json")
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                pass
+        variants = _build_variants(data_loader())
+        if path:
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                _write_atomic(path, lambda p: _dump_json(variants, p))
+            except OSError:
+                pass  # Caching is an optimization only
+        return variants
+
+    return _variant_cache.get_or_load(("digest", digest), load, sizer=_variants_nbytes)
+
+
+def _dump_json(value: dict, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(value, f)
+
+
+def _variants_nbytes(variants: Dict[str, str]) -> int:
+    return sum(len(v) for v in variants.values())
+
+
+def image_variants(image, cache_dir: Optional[str] = None) -> Optional[Dict[str, str]]:
+    """
+    Return the resized variants of a card image.
+
+    Args:
+        image: Local file path, bytes or base64 data URI
+        cache_dir: Directory for the persistent variant cache (None for memory only)
+
+    Returns:
+        dict or None: ``image``, ``thumbnail`` and ``placeholder`` data URIs, or None
+        if the value is not processed (remote URL, small data URI, SVG, animated or
+        undecodable image, Pillow missing)
+
+    Raises:
+        OSError: If the image cannot be read or decoded
+    """
+    if _pillow() is None:
+        return None
+    source = _image_source(image)
+    if source is None:
+        return None
+    kind, value = source
+
+    if kind == "file":
+        stat = os.stat(value)
+        identity = ("file", os.path.abspath(value), stat.st_mtime, stat.st_size)
+
+        def load_file():
+            with open(value, "rb") as f:
+                return f.read()
+
+        # Hash each file version once; reruns only stat the file
+        variants = _variant_cache.get_or_load(
+            identity,
+            lambda: _variants_for_digest(file_digest(value), load_file, cache_dir),
+            group=identity[:2],
+        )
+    elif kind == "data":
+        # The URI text is hashed once per string object; it is decoded only to build variants
+        variants = _variants_for_digest(text_digest(value), lambda: _decode_data_uri(value), cache_dir)
+    else:
+        digest = hashlib.blake2b(value, digest_size=16).hexdigest()
+        variants = _variants_for_digest(digest, lambda: value, cache_dir)
+    return variants or None
+
+
+def prepare_card_images(
+    cards: List[dict],
+    cache_dir: Optional[str] = None,
+    max_workers: Optional[int] = None,
+) -> Tuple[List[dict], List[Tuple[int, str]]]:
+    """
+    Replace local or inline card images by resized variants.
+
+    Images are processed in a thread pool; ``thumbnail`` and ``placeholder``
+    keys already set on a card are kept. Cards whose image is not processed
+    are returned as they are.
+
+    Args:
+        cards: Image cards
+        cache_dir: Directory for the persistent variant cache (None for memory only)
+        max_workers: Thread pool size (defaults to the CPU count, at most 8)
+
+    Returns:
+        tuple: New card list and ``(card_index, error)`` pairs for images that could not be read
+    """
+    if _pillow() is None:
+        return cards, []
+    pending = [
+        i for i, card in enumerate(cards)
+        if isinstance(card, dict) and _image_source(card.get("image")) is not None
+    ]
+    if not pending:
+        return cards, []
+
+    def process(index: int):
+        try:
+            return image_variants(cards[index]["image"], cache_dir), None
+        except Exception as e:
+            return None, str(e)
+
+    workers = max_workers or min(_MAX_WORKERS, os.cpu_count() or 1, len(pending))
+    if workers > 1 and len(pending) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(process, pending))
+    else:
+        results = [process(i) for i in pending]
+
+    cards = list(cards)
+    errors = []
+    for index, (variants, error) in zip(pending, results):
+        if error is not None:
+            errors.append((index, error))
+        elif variants is not None:
+            card = dict(cards[index])
+            card["image"] = variants["image"]
+            if not any(card.get(k) for k in ("lowres", "lowRes", "image_low", "thumbnail")):
+                card["thumbnail"] = variants["thumbnail"]
+            if not any(card.get(k) for k in ("placeholder", "placeholder_image")):
+                card["placeholder"] = variants["placeholder"]
+            cards[index] = card
+    return cards, errors
@@ -0,0 +1,59 @@
+"""
+Per-call performance timings of the Python wrapper (``metrics=True``).
+
+Stages are timed with ``time.perf_counter`` and summed by name, so stages run
+once per dataset (also from the loader threads) add up. Values are reported in
+milliseconds next to the frontend timings in the component value.
+"""
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Optional
+
+
+class Timings:
+    """Stage durations and counters of one ``streamlit_swipecards`` call."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time the enclosed block and add it to ``<name>_ms``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(f"{name}_ms", (time.perf_counter() - start) * 1000)
+
+    def add(self, name: str, value: float) -> None:
+        with self._lock:
+            self._values[name] = self._values.get(name, 0) + value
+
+    def set(self, name: str, value: float) -> None:
+        with self._lock:
+            self._values[name] = value
+
+    def as_dict(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                name: round(value, 3) if isinstance(value, float) else value
+                for name, value in self._values.items()
+            }
+
+
+def timed(timings: Optional[Timings], name: str):
+    """
+    Time a block if metrics are enabled.
+
+    Args:
+        timings: Collector of the current call, or None when metrics are off
+        name: Stage name (reported as ``<name>_ms``)
+
+    Returns:
+        Context manager timing the block, or doing nothing without ``timings``
+    """
+    if timings is None:
+        return nullcontext()
+    return timings.stage(name)
@@ -0,0 +1,110 @@
+"""
+Sliding card windows for decks too large to materialize.
+
+A card source may be a sequence, an iterator (e.g. a generator) or a page
+callback ``page(start, count) -> list``. A ``CardPager`` kept in the session
+state serves the cards of one window at a time, so memory and serialization
+per rerun depend on the window size only, not on the deck size.
+"""
+import uuid
+from collections.abc import Sequence
+from typing import Callable, List, Optional, Tuple
+
+
+def is_card_stream(cards) -> bool:
+    """
+    Tell whether ``cards`` is a lazy source (iterator or page callback).
+
+    Args:
+        cards: Value passed as ``cards``
+
+    Returns:
+        bool: True for callables and iterables that are not sequences or dicts
+    """
+    if cards is None or isinstance(cards, (Sequence, dict, str, bytes)):
+        return False
+    return callable(cards) or hasattr(cards, "__iter__")
+
+
+def source_kind(cards) -> str:
+    """Return ``"page"``, ``"iterator"`` or ``"sequence"`` for a card source."""
+    if callable(cards):
+        return "page"
+    return "iterator" if is_card_stream(cards) else "sequence"
+
+
+class CardPager:
+    """
+    Serves windows of a card source by global card index.
+
+    Sequences and page callbacks are asked again on every run. Iterators can
+    only be consumed once: the iterator given first is kept and its cards are
+    buffered from one window behind the requested start onwards, so going back
+    is limited to that range.
+    """
+
+    def __init__(self, source):
+        self.stream = uuid.uuid4().hex[:8]  # Identifies this deck in the frontend
+        self.kind = source_kind(source)
+        self.iterator = None
+        self.page: Optional[Callable[[int, int], list]] = None
+        self.sequence = None
+        self.buffer: List = []
+        self.buffer_start = 0
+        self.total: Optional[int] = None  # Known once the source is exhausted
+        self.set_source(source)
+
+    def set_source(self, source) -> None:
+        """Use the source given on this run (of the same kind); a consumed iterator is kept."""
+        if self.kind == "page":
+            self.page = source
+        elif self.kind == "iterator":
+            if self.iterator is None:
+                self.iterator = iter(source)
+        else:
+            self.sequence = source if source is not None else []
+            self.total = len(self.sequence)
+
+    def window(self, start: int, count: int) -> Tuple[int, list]:
+        """
+        Return the cards ``[start, start + count)``.
+
+        Args:
+            start: Global index of the first card
+            count: Number of cards
+
+        Returns:
+            tuple: Global index of the first returned card (may be larger than
+            ``start`` for iterators that moved on) and the cards
+        """
+        start = max(0, int(start))
+        if self.total is not None:
+            start = min(start, self.total)
+        if self.sequence is not None:
+            return start, list(self.sequence[start:start + count])
+        if self.page is not None:
+            cards = list(self.page(start, count) or [])
+            self.total = start + len(cards) if len(cards) < count else None
+            return start, cards[:count]
+        if self.iterator is None:
+            return start, []
+        return self._iterator_window(start, count)
+
+    def _iterator_window(self, start: int, count: int) -> Tuple[int, list]:
+        end = start + count
+        while self.total is None and self.buffer_start + len(self.buffer) < end:
+            try:
+                self.buffer.append(next(self.iterator))
+            except StopIteration:
+                self.total = self.buffer_start + len(self.buffer)
+        # Keep one window behind the start for going back
+        drop = min(len(self.buffer), max(0, start - count - self.buffer_start))
+        if drop:
+            del self.buffer[:drop]
+            self.buffer_start += drop
+        start = max(start, self.buffer_start)
+        return start, self.buffer[start - self.buffer_start:end - self.buffer_start]
+
+    @property
+    def exhausted(self) -> bool:
+        return self.total is not None
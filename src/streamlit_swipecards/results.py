@@ -0,0 +1,80 @@
+"""
+Folding of delta-encoded swipe results.
+
+With ``result_encoding="delta"`` the component only returns the actions since
+the last acknowledged sequence number instead of the whole swipe history:
+
+    {
+        "stream": "k3j9x",          # id of the frontend deck instance
+        "seq": 42,                  # sequence number of the newest action
+        "events": [{"seq": 41, "action": "right", "cardIndex": 40},
+                   {"seq": 42, "action": "back", "cardIndex": 40}],
+        "lastAction": {...}, "totalSwiped": 40, "remainingCards": 60,
+    }
+
+``fold_swipe_deltas`` applies such a value to a log with the same fields as
+the full result, so each rerun only costs the new actions.
+"""
+from typing import Optional
+
+
+def new_swipe_log(stream: Optional[str] = None) -> dict:
+    """
+    Create an empty swipe log.
+
+    Args:
+        stream: Frontend deck instance the log belongs to
+
+    Returns:
+        dict: Log with the fields of a full component result plus ``stream`` and ``seq``
+    """
+    return {
+        "stream": stream,
+        "seq": 0,
+        "swipedCards": [],
+        "lastAction": None,
+        "totalSwiped": 0,
+        "remainingCards": None,
+    }
+
+
+def fold_swipe_deltas(log: Optional[dict], value: Optional[dict]) -> Optional[dict]:
+    """
+    Apply the events of a delta-encoded component value to a swipe log.
+
+    Events already folded (``seq`` not above the log's) are skipped, so the
+    same value can be folded repeatedly. A ``back`` event undoes the most
+    recent swipe. A value from a different deck instance starts a new log.
+    The log is updated in place.
+
+    Args:
+        log: Log returned by a previous call, or None
+        value: Delta-encoded component value, or None
+
+    Returns:
+        dict or None: Updated log (None if neither argument carries data)
+    """
+    if not isinstance(value, dict) or "events" not in value:
+        return log
+    if log is None or log.get("stream") != value.get("stream"):
+        log = new_swipe_log(value.get("stream"))
+
+    swiped = log["swipedCards"]
+    for event in value.get("events") or ():
+        if event["seq"] <= log["seq"]:
+            continue
+        if event["action"] == "back":
+            if swiped:
+                swiped.pop()
+        else:
+            swiped.append({"index": event["cardIndex"], "action": event["action"]})
+        log["seq"] = event["seq"]
+
+    log["lastAction"] = value.get("lastAction")
+    log["totalSwiped"] = len(swiped)
+    log["remainingCards"] = value.get("remainingCards")
+    if "tableRequests" in value:
+        log["tableRequests"] = value["tableRequests"]
+    else:
+        log.pop("tableRequests", None)
+    return log
@@ -0,0 +1,435 @@
+"""
+Row-addressable data sources behind ``dataset_path``.
+
+A ``DataSource`` offers the read-only ``ColumnarTable`` interface without
+loading the dataset: rows are read in chunks when first needed and only a few
+chunks are kept, so a card's row and its neighbourhood are fetched by index
+(or by primary key with ``locate``) and memory does not grow with the size
+of the dataset.
+
+Built-in backends:
+
+- ``sqlite:///reviews.db?table=t`` (relative path) or
+  ``sqlite:////data/reviews.db?table=t`` (absolute path), optionally with
+  ``&key=<column>`` for primary key lookups. Rows are in ``rowid`` order
+  (primary key order for ``WITHOUT ROWID`` tables).
+- ``*.parquet`` files, or ``parquet:///data/reviews.parquet?key=<column>``.
+  Rows are read in slices of a row group; key lookups skip row groups by
+  their min/max statistics. Requires pyarrow.
+
+Further schemes are added with ``register_source``. Every source is backed by
+a local file whose modification time versions it.
+"""
+import math
+import os
+import sqlite3
+import sys
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, quote, unquote, urlparse
+
+from .conversion import ColumnarTable
+
+# Rows per chunk read from a source
+_CHUNK_ROWS = 256
+# Memory of the formatted chunks kept per source
+_MAX_CACHED_BYTES = 16 * 1024 * 1024
+# Decoded Parquet row groups up to this size are kept for reading further
+# slices; larger ones are streamed again for every slice
+_MAX_GROUP_BYTES = 64 * 1024 * 1024
+
+
+def _rows_nbytes(rows: List[list], sample: int = 32) -> int:
+    """Estimate the memory held by a chunk of row lists of strings."""
+    size = sys.getsizeof(rows)
+    if not rows:
+        return size
+    picked = rows[::max(1, len(rows) // sample)]
+    per_row = sum(sys.getsizeof(row) + sum(map(sys.getsizeof, row)) for row in picked) / len(picked)
+    return int(size + per_row * len(rows))
+
+
+def _cell_text(value: Any) -> str:
+    """Format one value like a cell read from CSV (missing values as ``""``)."""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, float):
+        return repr(value)
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value).hex()
+    return str(value)
+
+
+class DataSource(ColumnarTable):
+    """
+    ``ColumnarTable`` reading rows on demand from an external store.
+
+    Subclasses split the rows into chunks of at most ``_CHUNK_ROWS`` rows
+    (``chunk_starts``) and implement ``read_chunk``; the base class maps row
+    ranges onto chunks and keeps the most recently used ones, up to
+    ``_MAX_CACHED_BYTES``. Values are returned as strings.
+
+    Args:
+        columns: Column names
+        n_rows: Number of rows
+        chunk_starts: First row of every chunk, ascending and starting at 0
+        path: File backing the source
+    """
+
+    __slots__ = ("path", "chunk_starts", "_chunks", "_cached_bytes", "_lock")
+
+    def __init__(self, columns: List[str], n_rows: int, chunk_starts: Sequence[int], path: str):
+        super().__init__(columns, [], n_rows)
+        self.path = path
+        self.chunk_starts = list(chunk_starts)
+        self._chunks: "OrderedDict[int, Tuple[List[list], int]]" = OrderedDict()
+        self._cached_bytes = 0
+        self._lock = threading.Lock()
+
+    def read_chunk(self, chunk: int) -> List[list]:
+        """Read the rows of one chunk as lists of Python values."""
+        raise NotImplementedError
+
+    def locate(self, key: Any) -> Optional[int]:
+        """
+        Find the index of the row with primary key ``key``.
+
+        Args:
+            key: Value of the source's key column
+
+        Returns:
+            int or None: Row index, or None if no row has this key
+
+        Raises:
+            ValueError: If the source has no key column
+        """
+        raise ValueError(f"Data source {self.path!r} has no key column; add '?key=<column>' to its URI.")
+
+    def _chunk_rows(self, chunk: int) -> List[list]:
+        with self._lock:
+            cached = self._chunks.get(chunk)
+            if cached is not None:
+                self._chunks.move_to_end(chunk)
+                return cached[0]
+        rows = [[_cell_text(value) for value in row] for row in self.read_chunk(chunk)]
+        size = _rows_nbytes(rows)
+        with self._lock:
+            if chunk not in self._chunks:
+                self._chunks[chunk] = (rows, size)
+                self._cached_bytes += size
+            # Keep at least the chunk just read
+            while self._cached_bytes > _MAX_CACHED_BYTES and len(self._chunks) > 1:
+                self._cached_bytes -= self._chunks.popitem(last=False)[1][1]
+        return rows
+
+    def column(self, index: int) -> list:
+        return self.column_slice(index, 0, self.n_rows)
+
+    def column_slice(self, index: int, start: int, end: int) -> list:
+        return [row[index] for row in self.rows(start, end)]
+
+    def row(self, index: int) -> list:
+        return self.rows(index, index + 1)[0]
+
+    def record(self, index: int) -> Dict[Any, Any]:
+        return dict(zip(self.columns, self.row(index)))
+
+    def rows(self, start: int = 0, end: Optional[int] = None) -> List[list]:
+        end = self.n_rows if end is None else min(end, self.n_rows)
+        start = max(0, start)
+        if start >= end:
+            return []
+        result = []
+        chunk = bisect_right(self.chunk_starts, start) - 1
+        while chunk < len(self.chunk_starts) and self.chunk_starts[chunk] < end:
+            offset = self.chunk_starts[chunk]
+            rows = self._chunk_rows(chunk)
+            result.extend(list(row) for row in rows[max(0, start - offset):end - offset])
+            chunk += 1
+        return result
+
+    def nbytes(self) -> int:
+        """Memory held by the cached chunks (bounded by ``_MAX_CACHED_BYTES``)."""
+        with self._lock:
+            return self._cached_bytes
+
+    def vectors(self) -> List[dict]:
+        # Typing a column would read the whole source: send plain values
+        return [{"type": "values"} for _ in self.columns]
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+class SQLiteSource(DataSource):
+    """
+    Table of a SQLite database, in ``rowid`` order.
+
+    Tables with dense rowids (no deleted rows) are addressed by rowid range,
+    others with ``LIMIT``/``OFFSET``; ``WITHOUT ROWID`` tables are read in
+    primary key order. Connections are read-only and opened per thread.
+
+    Args:
+        path: Database file
+        table: Table name
+        key: Column used by ``locate``
+    """
+
+    __slots__ = ("table", "key", "_order", "_first_rowid", "_dense", "_local")
+
+    def __init__(self, path: str, table: str, key: Optional[str] = None):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Dataset file not found: {path}")
+        self.path = path  # Needed for queries before the base class is set up
+        self.table = table
+        self.key = key
+        self._local = threading.local()
+        table_info = self._query(f"PRAGMA table_info({_quote(table)})")
+        columns = [info[1] for info in table_info]
+        if not columns:
+            raise ValueError(f"Table {table!r} not found in {path}")
+        if key is not None and key not in columns:
+            raise ValueError(f"Key column {key!r} not found in table {table!r}")
+        if self._has_rowid():
+            self._order = "rowid"
+            n_rows, first, last = self._query(f"SELECT COUNT(*), MIN(rowid), MAX(rowid) FROM {_quote(table)}")[0]
+            self._first_rowid = first or 0
+            self._dense = n_rows == 0 or last - first + 1 == n_rows
+        else:
+            # WITHOUT ROWID tables (and views) are ordered by their primary key
+            primary_key = [info[1] for info in sorted(table_info, key=lambda info: info[5]) if info[5]]
+            if not primary_key:
+                raise ValueError(f"Table {table!r} has neither a rowid nor a primary key and is not supported")
+            self._order = ", ".join(map(_quote, primary_key))
+            n_rows = self._query(f"SELECT COUNT(*) FROM {_quote(table)}")[0][0]
+            self._first_rowid = 0
+            self._dense = False
+        super().__init__(columns, int(n_rows), range(0, max(int(n_rows), 1), _CHUNK_ROWS), path)
+
+    def _query(self, sql: str, params: tuple = ()) -> list:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            uri = "file:" + quote(os.path.abspath(self.path)) + "?mode=ro"
+            connection = self._local.connection = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        return connection.execute(sql, params).fetchall()
+
+    def _has_rowid(self) -> bool:
+        try:
+            found = self._query(f"SELECT rowid FROM {_quote(self.table)} LIMIT 1")
+        except sqlite3.OperationalError:
+            return False
+        # Views select a NULL rowid
+        return not found or found[0][0] is not None
+
+    def read_chunk(self, chunk: int) -> List[list]:
+        start = self.chunk_starts[chunk]
+        select = f"SELECT {', '.join(map(_quote, self.columns))} FROM {_quote(self.table)}"
+        if self._dense:
+            first = self._first_rowid + start
+            return self._query(
+                f"{select} WHERE rowid BETWEEN ? AND ? ORDER BY rowid", (first, first + _CHUNK_ROWS - 1)
+            )
+        return self._query(f"{select} ORDER BY {self._order} LIMIT ? OFFSET ?", (_CHUNK_ROWS, start))
+
+    def locate(self, key: Any) -> Optional[int]:
+        if self.key is None:
+            return super().locate(key)
+        table = _quote(self.table)
+        found = self._query(f"SELECT {self._order} FROM {table} WHERE {_quote(self.key)} = ? LIMIT 1", (key,))
+        if not found:
+            return None
+        if self._dense:
+            return found[0][0] - self._first_rowid
+        # Rows before it in table order (row value comparison for composite keys)
+        placeholders = ", ".join("?" for _ in found[0])
+        return self._query(
+            f"SELECT COUNT(*) FROM {table} WHERE ({self._order}) < ({placeholders})", tuple(found[0])
+        )[0][0]
+
+
+class ParquetSource(DataSource):
+    """
+    Parquet file read in ``_CHUNK_ROWS`` slices of its row groups (requires pyarrow).
+
+    The last decoded row group is kept as an Arrow table while it is no
+    larger than ``_MAX_GROUP_BYTES``, so neighbouring slices do not decode
+    it again; slices of larger groups are streamed in batches.
+
+    Args:
+        path: Parquet file
+        key: Column used by ``locate``
+    """
+
+    __slots__ = ("key", "_file", "_file_lock", "_chunk_groups", "_group_starts", "_group")
+
+    def __init__(self, path: str, key: Optional[str] = None):
+        import pyarrow.parquet as pq
+
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Dataset file not found: {path}")
+        self._file = pq.ParquetFile(path)
+        self._file_lock = threading.Lock()
+        metadata = self._file.metadata
+        columns = [str(name) for name in self._file.schema_arrow.names]
+        if key is not None and key not in columns:
+            raise ValueError(f"Key column {key!r} not found in {path}")
+        self.key = key
+        self._group = None  # (row group, decoded Arrow table)
+        self._group_starts, self._chunk_groups = [], []
+        starts, offset = [], 0
+        for group in range(metadata.num_row_groups):
+            self._group_starts.append(offset)
+            group_rows = metadata.row_group(group).num_rows
+            for start in range(offset, offset + group_rows, _CHUNK_ROWS):
+                starts.append(start)
+                self._chunk_groups.append(group)
+            offset += group_rows
+        super().__init__(columns, int(metadata.num_rows), starts or [0], path)
+
+    def _group_slice(self, group: int, offset: int, length: int):
+        """Rows ``[offset, offset + length)`` of a row group as an Arrow table."""
+        import pyarrow as pa
+
+        with self._file_lock:
+            if self._group is not None and self._group[0] == group:
+                return self._group[1].slice(offset, length)
+            size = self._file.metadata.row_group(group).total_byte_size
+            if size <= _MAX_GROUP_BYTES:
+                table = self._file.read_row_group(group)
+                self._group = (group, table)
+                return table.slice(offset, length)
+            # Stream the group and keep only the batches overlapping the slice
+            batches, position = [], 0
+            for batch in self._file.iter_batches(batch_size=_CHUNK_ROWS, row_groups=[group]):
+                if position + batch.num_rows > offset:
+                    batches.append(batch.slice(max(0, offset - position)))
+                position += batch.num_rows
+                if position >= offset + length:
+                    break
+            if not batches:
+                return pa.Table.from_batches([], schema=self._file.schema_arrow)
+            return pa.Table.from_batches(batches).slice(0, length)
+
+    def read_chunk(self, chunk: int) -> List[list]:
+        if chunk >= len(self._chunk_groups):
+            return []
+        group = self._chunk_groups[chunk]
+        offset = self.chunk_starts[chunk] - self._group_starts[group]
+        table = self._group_slice(group, offset, _CHUNK_ROWS)
+        columns = [column.to_pylist() for column in table.columns]
+        return list(zip(*columns)) if columns else [() for _ in range(table.num_rows)]
+
+    def nbytes(self) -> int:
+        """Memory held by the cached chunks and the kept row group."""
+        group = self._group
+        return super().nbytes() + (int(group[1].nbytes) if group is not None else 0)
+
+    def _may_contain(self, group: int, position: int, key: Any) -> bool:
+        """Whether the row group's statistics allow ``key`` (True if unknown)."""
+        stats = self._file.metadata.row_group(group).column(position).statistics
+        if stats is None or not stats.has_min_max:
+            return True
+        try:
+            return stats.min <= key <= stats.max
+        except TypeError:
+            return True
+
+    def locate(self, key: Any) -> Optional[int]:
+        if self.key is None:
+            return super().locate(key)
+        position = self._file.metadata.schema.to_arrow_schema().get_field_index(self.key)
+        for group, start in enumerate(self._group_starts):
+            if not self._may_contain(group, position, key):
+                continue
+            with self._file_lock:
+                values = self._file.read_row_group(group, columns=[self.key]).column(0).to_pylist()
+            if key in values:
+                return start + values.index(key)
+        return None
+
+
+def _query_value(query: Dict[str, List[str]], name: str) -> Optional[str]:
+    values = query.get(name)
+    return values[-1] if values else None
+
+
+def _uri_path(uri: str) -> str:
+    """File of a ``scheme:///relative`` or ``scheme:////absolute`` URI."""
+    path = unquote(urlparse(uri).path)
+    return path[1:] if path.startswith("/") else path
+
+
+def _open_sqlite(uri: str) -> DataSource:
+    query = parse_qs(urlparse(uri).query)
+    table = _query_value(query, "table")
+    if not table:
+        raise ValueError(f"SQLite data source needs a table: {uri!r} (use '?table=<name>')")
+    return SQLiteSource(_uri_path(uri), table, _query_value(query, "key"))
+
+
+def _open_parquet(uri: str) -> DataSource:
+    if "://" not in uri:
+        return ParquetSource(uri)
+    return ParquetSource(_uri_path(uri), _query_value(parse_qs(urlparse(uri).query), "key"))
+
+
+_SOURCES: Dict[str, Callable[[str], DataSource]] = {
+    "sqlite": _open_sqlite,
+    "parquet": _open_parquet,
+}
+
+
+def register_source(scheme: str, opener: Callable[[str], DataSource]) -> None:
+    """
+    Make ``dataset_path`` values ``<scheme>:///<file>?...`` open a custom data source.
+
+    Args:
+        scheme: URI scheme
+        opener: Function building a ``DataSource`` from the full URI; the
+            file in the URI path versions the source (see ``source_file``)
+    """
+    _SOURCES[scheme.lower()] = opener
+
+
+def _scheme(path: str) -> Optional[str]:
+    if "://" in path:
+        return path.split("://", 1)[0].lower()
+    if path.lower().endswith(".parquet"):
+        return "parquet"
+    return None
+
+
+def is_data_source(path: Any) -> bool:
+    """Tell whether a ``dataset_path`` refers to a data source rather than a CSV/Excel file."""
+    return isinstance(path, str) and _scheme(path) is not None
+
+
+def source_file(path: str) -> str:
+    """File whose modification time versions the dataset at ``path``."""
+    return _uri_path(path) if "://" in path else path
+
+
+def open_source(path: str) -> DataSource:
+    """
+    Open the data source a ``dataset_path`` refers to.
+
+    Args:
+        path: Source URI or Parquet file path
+
+    Returns:
+        DataSource: Source reading rows on demand
+
+    Raises:
+        ValueError: If the scheme is unknown or the URI incomplete
+        FileNotFoundError: If the backing file does not exist
+    """
+    scheme = _scheme(path)
+    opener = _SOURCES.get(scheme)
+    if opener is None:
+        raise ValueError(f"Unsupported data source {path!r}. Registered schemes: {sorted(_SOURCES)}")
+    return opener(path)